@@ -0,0 +1,96 @@
+# bench_audio.py
+"""Measure what ``AudioPreprocessor`` saves on /speech uploads.
+
+A synthetic call recording (44.1 kHz stereo 16-bit WAV: tones between
+stretches of low-level noise) is uploaded to the stub server as-is and
+through the preprocessor. The stub's ``upload_rate`` stands in for the
+uplink, so upload time scales with the bytes sent. Reported per variant:
+bytes uploaded, audio seconds, preprocessing CPU time and call latency.
+
+Run from the project root (needs numpy):
+
+    python -m benchmarks.bench_audio --seconds 30 --upload-rate 250000
+"""
+import argparse
+import io
+import time
+import wave
+from typing import Dict, List
+
+import numpy as np
+
+from benchmarks.bench_sdk import _percentile
+from benchmarks.stub_server import StubConfig, start_stub_server
+from sdk.audio import AudioPreprocessor
+from sdk.witai_sdk import WitAI
+
+
+def recording(seconds: float, rate: int = 44100, seed: int = 1) -> bytes:
+    """A stereo WAV with speech-like bursts and 20% leading/trailing silence."""
+    rng = np.random.default_rng(seed)
+    samples = int(seconds * rate)
+    t = np.arange(samples) / rate
+    signal = rng.normal(0, 10 ** (-65 / 20), samples)  # Noise floor
+    voiced = (t > seconds * 0.2) & (t < seconds * 0.8)
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 3 * t)  # Syllable-rate modulation
+    signal += voiced * envelope * 0.3 * np.sin(2 * np.pi * 220 * t * (1 + 0.1 * np.sin(t)))
+    stereo = np.stack([signal, signal * 0.9], axis=1)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as f:
+        f.setnchannels(2)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(np.clip(stereo * 32767, -32768, 32767).astype("<i2").tobytes())
+    return buffer.getvalue()
+
+
+def run(wit: WitAI, clip: bytes, calls: int, preprocess: bool) -> Dict:
+    preprocessor = AudioPreprocessor() if preprocess else None
+    latencies: List[float] = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        wit.transcribe_audio(clip, "audio/wav", preprocess=preprocessor)
+        latencies.append(time.perf_counter() - start)
+    result = {"p50_ms": _percentile(latencies, 0.5) * 1000,
+              "p99_ms": _percentile(latencies, 0.99) * 1000,
+              "bytes_per_call": len(clip), "audio_seconds": None, "processing_ms": 0.0}
+    if preprocessor is not None:
+        stats = preprocessor.stats
+        result.update(bytes_per_call=stats["bytes_out"] // calls,
+                      audio_seconds=stats["seconds_out"] / calls,
+                      processing_ms=stats["processing_seconds"] / calls * 1000)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=30.0, help="length of the clip")
+    parser.add_argument("--calls", type=int, default=5)
+    parser.add_argument("--upload-rate", type=float, default=250000.0,
+                        help="simulated uplink in bytes per second (0 for unlimited)")
+    args = parser.parse_args()
+
+    clip = recording(args.seconds)
+    server, base_url = start_stub_server(config=StubConfig(upload_rate=args.upload_rate))
+    try:
+        with WitAI("stub", base_url=base_url) as wit:
+            results = {"original": run(wit, clip, args.calls, False),
+                       "preprocessed": run(wit, clip, args.calls, True)}
+    finally:
+        server.shutdown()
+
+    print(f"{'variant':<14}{'bytes':>12}{'audio s':>9}{'cpu ms':>8}"
+          f"{'p50 ms':>10}{'p99 ms':>10}")
+    for name, r in results.items():
+        audio = r["audio_seconds"] if r["audio_seconds"] is not None else args.seconds
+        print(f"{name:<14}{r['bytes_per_call']:>12}{audio:>9.1f}{r['processing_ms']:>8.1f}"
+              f"{r['p50_ms']:>10.1f}{r['p99_ms']:>10.1f}")
+    before, after = results["original"], results["preprocessed"]
+    saved = 1 - after["bytes_per_call"] / before["bytes_per_call"]
+    print(f"Saved {saved:.1%} of upload bytes; "
+          f"p50 latency {before['p50_ms']:.0f} ms -> {after['p50_ms']:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+# bench_sdk.py
+"""Measure WitAI throughput, latency and memory against the local stub server.
+
+Each scenario runs ``--requests`` calls and reports throughput, p50/p99
+latency (per call, from the client's metrics hooks), errors, and peak Python
+memory (from a second, traced run). Results are written as JSON so runs can
+be compared; ``--baseline`` fails the run when throughput drops or p99 rises
+by more than ``--tolerance``.
+
+Run from the project root:
+
+    python -m benchmarks.bench_sdk --requests 2000 --output bench.json
+    python -m benchmarks.bench_sdk --baseline bench.json --latency 0.002 --throttle-rate 0.05
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict
+from typing import Callable, Dict, List
+
+from benchmarks.stub_server import StubConfig, start_stub_server
+from sdk.hedging import HedgePolicy
+from sdk.metrics import RequestEvent
+from sdk.retry import RetryPolicy
+from sdk.witai_async import AsyncWitAI
+from sdk.witai_sdk import WitAI
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _client_options(args: argparse.Namespace, events: List[RequestEvent]) -> Dict:
+    return {"base_url": args.base_url, "hooks": [events.append],
+            "pool_maxsize": args.concurrency,
+            "hedge": HedgePolicy() if args.hedge else None,
+            "retry_policy": RetryPolicy(max_attempts=args.retries, backoff_base=0.01)}
+
+
+# Scenarios take the parsed arguments and a list the client's hook appends to.
+def sync_message(args, events) -> None:
+    with WitAI("stub", **_client_options(args, events)) as wit:
+        for i in range(args.requests):
+            try:
+                wit.get_message_meaning(f"hello {i}")
+            except Exception:
+                pass  # Counted from the hook events
+
+
+def sync_batch(args, events) -> None:
+    with WitAI("stub", **_client_options(args, events)) as wit:
+        wit.get_message_meanings((f"hello {i}" for i in range(args.requests)),
+                                 concurrency=args.concurrency)
+
+
+def async_message(args, events) -> None:
+    async def run():
+        async with AsyncWitAI("stub", **_client_options(args, events)) as wit:
+            for i in range(args.requests):
+                try:
+                    await wit.get_message_meaning(f"hello {i}")
+                except Exception:
+                    pass
+    asyncio.run(run())
+
+
+def async_batch(args, events) -> None:
+    async def run():
+        async with AsyncWitAI("stub", **_client_options(args, events)) as wit:
+            await wit.get_message_meanings((f"hello {i}" for i in range(args.requests)),
+                                           concurrency=args.concurrency)
+    asyncio.run(run())
+
+
+def sync_speech_stream(args, events) -> None:
+    audio = bytes(32000)  # One second of 16 kHz, 16-bit mono
+    with WitAI("stub", **_client_options(args, events)) as wit:
+        for _ in range(args.requests // 10 or 1):
+            try:
+                for _ in wit.stream_speech(audio, "audio/raw"):
+                    pass
+            except Exception:
+                pass
+
+
+def sync_synthesize_stream(args, events) -> None:
+    with WitAI("stub", **_client_options(args, events)) as wit:
+        for i in range(args.requests // 10 or 1):
+            try:
+                for _ in wit.stream_synthesized_speech(f"Prompt number {i}", "wit$Rebecca"):
+                    pass
+            except Exception:
+                pass
+
+
+SCENARIOS: Dict[str, Callable[[argparse.Namespace, List[RequestEvent]], None]] = {
+    "sync_message": sync_message,
+    "sync_batch": sync_batch,
+    "async_message": async_message,
+    "async_batch": async_batch,
+    "sync_speech_stream": sync_speech_stream,
+    "sync_synthesize_stream": sync_synthesize_stream,
+}
+
+
+def run_scenario(name: str, args: argparse.Namespace) -> Dict:
+    scenario = SCENARIOS[name]
+    events: List[RequestEvent] = []
+    start = time.perf_counter()
+    scenario(args, events)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    scenario(args, [])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies = [event.total for event in events]
+    return {"calls": len(events),
+            "errors": sum(event.error is not None for event in events),
+            "retries": sum(event.retries for event in events),
+            "seconds": elapsed,
+            "throughput": len(events) / elapsed if elapsed else 0.0,
+            "p50_ms": _percentile(latencies, 0.50) * 1000,
+            "p99_ms": _percentile(latencies, 0.99) * 1000,
+            "peak_memory_bytes": peak}
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict],
+            tolerance: float) -> List[str]:
+    """Regressions of throughput or p99 beyond ``tolerance`` against a baseline run."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        if result["throughput"] < before["throughput"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {result['throughput']:.1f} req/s "
+                               f"< baseline {before['throughput']:.1f}")
+        if result["p99_ms"] > before["p99_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p99 {result['p99_ms']:.2f} ms "
+                               f"> baseline {before['p99_ms']:.2f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--retries", type=int, default=3,
+                        help="max attempts per call (injected failures are retried)")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS),
+                        default=list(SCENARIOS))
+    parser.add_argument("--latency", type=float, default=0.0, help="stub latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--hedge", action="store_true",
+                        help="hedge slow /message calls with the default HedgePolicy")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args()
+
+    config = StubConfig(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                        throttle_rate=args.throttle_rate, seed=args.seed)
+    server, args.base_url = start_stub_server(config=config)
+    try:
+        results = {name: run_scenario(name, args) for name in args.scenarios}
+    finally:
+        server.shutdown()
+
+    print(f"{'scenario':<24}{'calls':>7}{'errors':>8}{'req/s':>10}"
+          f"{'p50 ms':>9}{'p99 ms':>9}{'peak KiB':>10}")
+    for name, r in results.items():
+        print(f"{name:<24}{r['calls']:>7}{r['errors']:>8}{r['throughput']:>10.1f}"
+              f"{r['p50_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['peak_memory_bytes'] / 1024:>10.0f}")
+
+    if args.output:
+        report = {"timestamp": time.time(), "python": platform.python_version(),
+                  "platform": platform.platform(), "requests": args.requests,
+                  "concurrency": args.concurrency, "stub": asdict(config),
+                  "results": results}
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f)["results"], args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
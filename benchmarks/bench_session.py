@@ -0,0 +1,56 @@
+# bench_session.py
+"""Compare per-call connections against the pooled WitAI session.
+
+Run from the project root:
+
+    python -m benchmarks.bench_session --requests 2000
+"""
+import argparse
+import time
+
+import requests
+
+from benchmarks.stub_server import start_stub_server
+from sdk.witai_sdk import WitAI
+
+
+def bench_unpooled(base_url: str, n: int) -> float:
+    """Old behaviour: module-level requests.get opens a connection per call."""
+    headers = {"Authorization": "Bearer stub", "Content-Type": "application/json"}
+    start = time.perf_counter()
+    for i in range(n):
+        response = requests.get(f"{base_url}/message", headers=headers,
+                                params={"v": "20240304", "q": f"hello {i}"})
+        response.raise_for_status()
+        response.json()
+    return n / (time.perf_counter() - start)
+
+
+def bench_pooled(base_url: str, n: int) -> float:
+    """WitAI reuses keep-alive connections from its session pool."""
+    with WitAI("stub", base_url=base_url) as wit:
+        start = time.perf_counter()
+        for i in range(n):
+            wit.get_message_meaning(f"hello {i}")
+        return n / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server()
+    try:
+        unpooled = bench_unpooled(base_url, args.requests)
+        pooled = bench_pooled(base_url, args.requests)
+    finally:
+        server.shutdown()
+
+    print(f"unpooled requests.get : {unpooled:8.1f} req/s")
+    print(f"pooled WitAI session  : {pooled:8.1f} req/s")
+    print(f"speedup               : {pooled / unpooled:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+# stub_server.py
+"""Offline stand-in for api.wit.ai, for benchmarks and local experiments.
+
+Answers /message, /language, /speech (streaming partial transcriptions),
+/synthesize (streaming raw audio), /intents, /entities (with keywords),
+/apps and /utterances from in-memory state. ``StubConfig`` adds latency,
+random 5xx errors and 429s with ``Retry-After`` so retries and rate limiting
+can be exercised without using quota.
+"""
+import json
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+
+@dataclass
+class StubConfig:
+    """Fault and latency injection for the stub server.
+
+    Every request waits ``latency`` seconds plus up to ``jitter`` more, then
+    fails with a 429 (carrying ``Retry-After: retry_after``) with probability
+    ``throttle_rate``, or with a 503 with probability ``error_rate``.
+    Streamed responses wait ``chunk_interval`` between chunks; synthesized
+    audio is ``audio_bytes_per_char`` bytes of 16-bit PCM per input character.
+    ``upload_rate`` (bytes per second, 0 for unlimited) simulates a slow
+    uplink by delaying each request in proportion to its body size.
+    """
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: float = 0.0
+    chunk_interval: float = 0.0
+    audio_bytes_per_char: int = 2000
+    upload_rate: float = 0.0
+    seed: Optional[int] = None
+
+
+@dataclass
+class StubState:
+    """In-memory app data served by the management endpoints."""
+    intents: Dict[str, Dict] = field(default_factory=dict)
+    entities: Dict[str, Dict] = field(default_factory=dict)
+    apps: Dict[str, Dict] = field(default_factory=dict)
+    utterances: Dict[str, Dict] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    next_id: int = 1
+
+    def new_id(self) -> str:
+        self.next_id += 1
+        return str(self.next_id)
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops SYNs under concurrent benchmarks, which
+    # shows up as one-second connect stalls (the SYN retransmit timeout).
+    request_queue_size = 128
+
+    def __init__(self, address: Tuple[str, int], config: StubConfig):
+        super().__init__(address, WitStubHandler)
+        self.config = config
+        self.state = StubState()
+        self.random = random.Random(config.seed)
+        self.random_lock = threading.Lock()
+        self.stats: Dict[str, int] = {"requests": 0, "throttled": 0, "errors": 0}
+
+    def handle_error(self, request, client_address) -> None:
+        # Clients hang up on purpose (cancelled hedges, timeouts); only report real bugs.
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+# Top-level path segments with a handler method of the same name.
+ENDPOINTS = frozenset({"message", "language", "speech", "synthesize", "intents",
+                       "entities", "apps", "utterances"})
+
+
+def _understanding(text: str) -> Dict:
+    return {"text": text,
+            "intents": [{"id": "1", "name": "stub_intent", "confidence": 0.99}],
+            "entities": {},
+            "traits": {}}
+
+
+class WitStubHandler(BaseHTTPRequestHandler):
+    """Keep-alive handler answering like api.wit.ai."""
+    protocol_version = "HTTP/1.1"
+    # Avoid Nagle/delayed-ACK stalls on reused keep-alive connections.
+    disable_nagle_algorithm = True
+    server: StubServer
+
+    def log_message(self, format, *args):
+        pass
+
+    # Plumbing
+    def _read_body(self) -> bytes:
+        """Read a Content-Length or chunked request body."""
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                if size == 0:
+                    while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                        pass
+                    return b"".join(chunks)
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+        length = int(self.headers.get("Content-Length", 0))
+        return self.rfile.read(length) if length else b""
+
+    def _send_json(self, status: int, payload, headers: Optional[Dict] = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _start_chunked(self, content_type: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _write_chunk(self, data: bytes) -> None:
+        if self.server.config.chunk_interval:
+            time.sleep(self.server.config.chunk_interval)
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def _end_chunked(self) -> None:
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _inject_faults(self) -> bool:
+        """Apply latency and maybe answer with an injected 429/503; True if answered."""
+        server = self.server
+        config = server.config
+        with server.random_lock:
+            server.stats["requests"] += 1
+            delay = config.latency + server.random.random() * config.jitter
+            roll = server.random.random()
+        if delay:
+            time.sleep(delay)
+        if roll < config.throttle_rate:
+            with server.random_lock:
+                server.stats["throttled"] += 1
+            self._send_json(429, {"error": "Rate limit exceeded", "code": "rate-limit"},
+                            {"Retry-After": str(config.retry_after)})
+            return True
+        if roll < config.throttle_rate + config.error_rate:
+            with server.random_lock:
+                server.stats["errors"] += 1
+            self._send_json(503, {"error": "Service unavailable", "code": "server-error"})
+            return True
+        return False
+
+    def _dispatch(self, method: str) -> None:
+        url = urlparse(self.path)
+        body = self._read_body()
+        if self.server.config.upload_rate:
+            time.sleep(len(body) / self.server.config.upload_rate)
+        if self._inject_faults():
+            return
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        parts = [unquote(part) for part in url.path.strip("/").split("/")]
+        handler = getattr(self, f"_{parts[0]}") if parts[0] in ENDPOINTS else None
+        try:
+            payload = json.loads(body) if body and self.headers.get(
+                "Content-Type", "").startswith("application/json") else body
+            if handler is None or not handler(method, parts[1:], query, payload):
+                self._send_json(404, {"error": f"Unknown endpoint {method} {url.path}",
+                                      "code": "not-found"})
+        except KeyError as e:
+            self._send_json(404, {"error": f"{e.args[0]} not found", "code": "not-found"})
+        except ValueError as e:
+            self._send_json(400, {"error": str(e), "code": "bad-request"})
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    # Each endpoint handler returns False when the route does not match.
+    def _message(self, method: str, rest: List[str], query: Dict, body: Any) -> bool:
+        if method != "GET" or rest:
+            return False
+        self._send_json(200, _understanding(query.get("q", "")))
+        return True
+
+    def _language(self, method: str, rest: List[str], query: Dict, body: Any) -> bool:
+        if method != "GET" or rest:
+            return False
+        locales = [{"locale": "en_XX", "confidence": 0.97},
+                   {"locale": "fr_XX", "confidence": 0.02}]
+        self._send_json(200, {"detected_locales": locales[:int(query.get("n", 1))]})
+        return True
+
+    def _speech(self, method: str, rest: List[str], query: Dict, body: Any) -> bool:
+        """Stream a partial transcription per word, then the final ones."""
+        if method != "POST" or rest:
+            return False
+        words = f"stub transcription of {len(body)} bytes".split()
+        self._start_chunked("application/json")
+        for i in range(1, len(words)):
+            self._write_chunk(json.dumps({"type": "PARTIAL_TRANSCRIPTION", "is_final": False,
+                                          "text": " ".join(words[:i])}).encode() + b"\r\n")
+        text = " ".join(words)
+        self._write_chunk(json.dumps({"type": "FINAL_TRANSCRIPTION", "is_final": True,
+                                      "text": text}).encode() + b"\r\n")
+        self._write_chunk(json.dumps({"type": "FINAL_UNDERSTANDING", "is_final": True,
+                                      **_understanding(text)}).encode() + b"\r\n")
+        self._end_chunked()
+        return True
+
+    def _synthesize(self, method: str, rest: List[str], query: Dict, body: Any) -> bool:
+        """Stream silence sized to the text, in 4 KiB chunks."""
+        if method != "POST" or rest:
+            return False
+        if not isinstance(body, dict) or "q" not in body or "voice" not in body:
+            raise ValueError("synthesize needs q and voice")
+        remaining = len(body["q"]) * self.server.config.audio_bytes_per_char
+        self._start_chunked(self.headers.get("Accept", "audio/raw"))
+        chunk = bytes(4096)
+        while remaining > 0:
+            self._write_chunk(chunk[:remaining])
+            remaining -= len(chunk)
+        self._end_chunked()
+        return True
+
+    def _intents(self, method: str, rest: List[str], query: Dict, body: Any) -> bool:
+        state = self.server.state
+        with state.lock:
+            if not rest and method == "GET":
+                result = list(state.intents.values())
+            elif not rest and method == "POST":
+                if body["name"] in state.intents:
+                    raise ValueError(f"Intent {body['name']} already exists")
+                result = state.intents[body["name"]] = {"id": state.new_id(),
+                                                        "name": body["name"]}
+            elif len(rest) == 1 and method == "GET":
+                result = {**state.intents[rest[0]], "entities": []}
+            elif len(rest) == 1 and method == "DELETE":
+                del state.intents[rest[0]]
+                result = {"deleted": rest[0]}
+            else:
+                return False
+        self._send_json(200, result)
+        return True
+
+    def _entities(self, method: str, rest: List[str], query: Dict, body: Any) -> bool:
+        state = self.server.state
+        with state.lock:
+            if not rest and method == "GET":
+                result = [{"id": e["id"], "name": e["name"]} for e in state.entities.values()]
+            elif not rest and method == "POST":
+                if body["name"] in state.entities:
+                    raise ValueError(f"Entity {body['name']} already exists")
+                result = state.entities[body["name"]] = {
+                    "id": state.new_id(), "name": body["name"],
+                    "roles": [{"id": state.new_id(), "name": role} for role in body["roles"]],
+                    "lookups": body.get("lookups", ["free-text"]),
+                    "keywords": body.get("keywords", [])}
+            elif len(rest) == 1 and method == "GET":
+                result = state.entities[rest[0]]
+            elif len(rest) == 1 and method == "PUT":
+                entity = state.entities.pop(rest[0])
+                entity.update(name=body["name"],
+                              roles=[{"id": state.new_id(), "name": r} for r in body["roles"]])
+                for name in ("lookups", "keywords"):
+                    if name in body:
+                        entity[name] = body[name]
+                result = state.entities[body["name"]] = entity
+            elif len(rest) == 1 and method == "DELETE":
+                del state.entities[rest[0]]
+                result = {"deleted": rest[0]}
+            elif rest[1:] == ["keywords"] and method == "POST":
+                result = state.entities[rest[0]]
+                result["keywords"].append(body)
+            elif len(rest) == 3 and rest[1] == "keywords" and method == "DELETE":
+                result = state.entities[rest[0]]
+                result["keywords"] = [k for k in result["keywords"] if k["keyword"] != rest[2]]
+            else:
+                return False
+        self._send_json(200, result)
+        return True
+
+    def _apps(self, method: str, rest: List[str], query: Dict, body: Any) -> bool:
+        state = self.server.state
+        with state.lock:
+            if not rest and method == "GET":
+                offset = int(query.get("offset", 0))
+                result = list(state.apps.values())[offset:offset + int(query["limit"])]
+            elif not rest and method == "POST":
+                app_id = state.new_id()
+                state.apps[app_id] = {"id": app_id, **body}
+                result = {"app_id": app_id, "access_token": f"stub-{app_id}"}
+            elif len(rest) == 1 and method == "GET":
+                result = state.apps[rest[0]]
+            elif len(rest) == 1 and method == "PUT":
+                result = state.apps[rest[0]]
+                result.update(body)
+            elif len(rest) == 1 and method == "DELETE":
+                del state.apps[rest[0]]
+                result = {"success": True}
+            else:
+                return False
+        self._send_json(200, result)
+        return True
+
+    def _utterances(self, method: str, rest: List[str], query: Dict, body: Any) -> bool:
+        if rest:
+            return False
+        state = self.server.state
+        with state.lock:
+            if method == "GET":
+                offset = int(query.get("offset", 0))
+                result = list(state.utterances.values())[offset:offset + int(query["limit"])]
+            elif method == "POST":
+                for utterance in body:
+                    # Stored as the API returns it, with the intent as an object
+                    intent = utterance.get("intent")
+                    if isinstance(intent, str):
+                        utterance = {**utterance, "intent": {"id": "1", "name": intent}}
+                    state.utterances[utterance["text"]] = utterance
+                result = {"sent": True, "n": len(body)}
+            elif method == "DELETE":
+                for utterance in body:
+                    state.utterances.pop(utterance["text"], None)
+                result = {"sent": True, "n": len(body)}
+            else:
+                return False
+        self._send_json(200, result)
+        return True
+
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0,
+                      config: Optional[StubConfig] = None) -> Tuple[StubServer, str]:
+    """Start the stub server in a daemon thread and return it with its base URL."""
+    server = StubServer((host, port), config if config is not None else StubConfig())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
@@ -1,10 +1,15 @@
 # fine_tune_witai.py
-import json
+import argparse
 import os
-import time
 import requests
 from dotenv import load_dotenv
 
+from sdk.dataset import TrainingDataset
+from sdk.ratelimit import RateLimiter
+from sdk.retry import RetryPolicy
+from sdk.schema import SchemaCache
+from sdk.sync import AppState, sync_app
+from sdk.training import TrainingUploader
 from sdk.witai_sdk import WitAI
 
 # Load environment variables from .env file
@@ -13,73 +18,109 @@ load_dotenv()
 # Server Access Token from environment variable
 ACCESS_TOKEN = os.getenv("WITAI_ACCESS_TOKEN")
 
-# Initialize WitAI client
-wit = WitAI(ACCESS_TOKEN)
+# Completed upload batches; present only while a rebuild is unfinished
+JOURNAL_PATH = ".witai-upload.journal"
+
+parser = argparse.ArgumentParser(description="Train a Wit.ai app from a dataset.")
+parser.add_argument("--dataset", default="dataset/dataset-v1.json")
+parser.add_argument("--dry-run", action="store_true",
+                    help="print the changes a sync would make without applying them")
+parser.add_argument("--rebuild", action="store_true",
+                    help="delete everything and re-upload instead of syncing changes")
+args = parser.parse_args()
+
+# Initialize WitAI client; the shared per-token limiter paces every call and
+# transient failures (5xx, 429, connection resets) are retried with backoff
+wit = WitAI(ACCESS_TOKEN, rate_limiter=RateLimiter.for_token(ACCESS_TOKEN),
+            retry_policy=RetryPolicy(max_attempts=5))
+
+# Intents and entities already in the app, kept current as we create and delete
+schema = SchemaCache(wit, refresh_interval=None)
+
+# Stream the dataset (JSON array or JSONL); samples become utterances lazily
+dataset = TrainingDataset(args.dataset)
+
 
 # Function to clean up existing data
 def cleanup():
     print("Deleting all utterances...")
     try:
         result = wit.delete_all_utterances()
-        print(f"Deleted utterances: {result['n']}")
+        print(f"Deleted utterances: {len(result.succeeded)} ({len(result.failed)} failed)")
     except requests.exceptions.HTTPError as e:
         print(f"Error deleting utterances: {e.response.status_code} - {e.response.text}")
 
     print("Deleting all intents...")
     try:
-        intents = wit.get_intents()
-        for intent in intents:
-            wit.delete_intent(intent['name'])
-            print(f"Deleted: {intent['name']}")
-            time.sleep(1)  # Respect rate limits
+        result = wit.delete_all_intents()
+        print(f"Deleted intents: {len(result.succeeded)}")
+        for name, error in result.failed:
+            print(f"Error deleting {name}: {error}")
     except requests.exceptions.HTTPError as e:
-        print(f"Error deleting intents: {e.response.status_code} - {e.response.text}")
-
-# Read dataset
-with open('dataset/dataset-v1.json', 'r') as f:
-    samples = json.load(f)
-
-# Get unique intents (lowercase)
-intents = list(set(sample['entities'][0]['value'].lower() for sample in samples))
-
-# Convert samples to utterances format
-utterances = [
-    {
-        'text': sample['text'],
-        'intent': sample['entities'][0]['value'].lower(),
-        'entities': [],
-        'traits': []
-    }
-    for sample in samples
-]
-
-# Clean up before fine-tuning
-cleanup()
-
-# Create intents
-print('Creating intents...')
-for intent in intents:
+        print(f"Error listing intents: {e.response.status_code} - {e.response.text}")
+
+
+# Create each intent the first time it appears, before its utterances upload
+def create_intent(intent):
+    if schema.has_intent(intent):
+        print(f"Exists: {intent}")
+        return
     try:
         wit.create_intent(intent)
         print(f"Created: {intent}")
     except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 400 and "already exists" in e.response.text:
-            print(f"Exists: {intent}")
-        else:
-            print(f"Error creating {intent}: {e.response.status_code} - {e.response.text}")
-    time.sleep(1)  # Respect rate limits
-
-# Upload utterances in batches
-print(f"Training with {len(utterances)} utterances...")
-batch_size = 10
-for i in range(0, len(utterances), batch_size):
-    batch = utterances[i:i + batch_size]
-    try:
-        wit.upload_utterances(batch)
-        print(f"Uploaded batch {i // batch_size + 1} ({len(batch)} utterances)")
-        time.sleep(2)  # Reduced delay
-    except requests.exceptions.HTTPError as e:
-        print(f"Batch {i // batch_size + 1} failed: {e.response.status_code} - {e.response.text}")
+        print(f"Error creating {intent}: {e.response.status_code} - {e.response.text}")
+
+
+def report_batch(index, size, error):
+    if error is None:
+        print(f"Uploaded batch {index + 1} ({size} utterances)")
+    else:
+        print(f"Batch {index + 1} failed after retries: {error}")
+
+
+def rebuild():
+    # Clean up before fine-tuning, unless resuming an interrupted upload
+    if os.path.exists(JOURNAL_PATH):
+        print("Resuming interrupted upload...")
+    else:
+        cleanup()
+    schema.load()
+
+    # Upload utterances in parallel batches while the dataset is still being read
+    print("Training...")
+    uploader = TrainingUploader(wit, concurrency=4, journal_path=JOURNAL_PATH,
+                                on_batch=report_batch)
+    report = uploader.run(dataset.iter_utterances(on_new_intent=create_intent))
+
+    print(f"Read {dataset.count} utterances for {len(dataset.intents)} intents")
+    print(f"Uploaded {report.uploaded}, skipped {report.skipped} already uploaded, "
+          f"retries: {wit.retry_policy.stats['retries']}")
+    if not report.ok:
+        print(f"Training finished with failed batches: {[f.index + 1 for f in report.failures]}")
+        print("Re-run to retry only the failed batches.")
         exit(1)
+    os.remove(JOURNAL_PATH)
+
+
+def sync():
+    # Push only the intents and utterances that differ from the app
+    print("Syncing app with dataset...")
+    desired = AppState.from_utterances(dataset)
+    plan, report = sync_app(wit, desired, dry_run=args.dry_run)
+    if report is None:
+        return
+    print(f"Applied {report.applied} changes, retries: {wit.retry_policy.stats['retries']}")
+    if not report.ok:
+        for action, target, error in report.failures:
+            print(f"Failed {action} {target}: {error}")
+        print("Re-run to apply the remaining changes.")
+        exit(1)
+
 
-print("Training completed!")
\ No newline at end of file
+if args.rebuild:
+    rebuild()
+else:
+    sync()
+if not args.dry_run:
+    print("Training completed!")
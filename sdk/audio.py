@@ -0,0 +1,402 @@
+# audio.py
+import asyncio
+import struct
+import sys
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+RAW_CONTENT_TYPE = "audio/raw;encoding=signed-integer;bits=16;rate={rate};endian=little"
+WAV_CONTENT_TYPES = frozenset({"audio/wav", "audio/wave", "audio/x-wav"})
+
+# WAVE format tags
+_PCM, _FLOAT, _EXTENSIBLE = 1, 3, 0xFFFE
+
+
+def iter_chunks(source: Any, chunk_size: int = 65536) -> Iterator[bytes]:
+    """Byte chunks of a bytes-like object, binary file object or chunk iterator."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source).cast("B")
+        for offset in range(0, len(view), chunk_size):
+            yield view[offset:offset + chunk_size]
+    elif hasattr(source, "read"):
+        for chunk in iter(lambda: source.read(chunk_size), b""):
+            yield chunk
+    else:
+        yield from source
+
+
+def _feed_next(pipeline: "_Pipeline", chunks: Iterator[bytes]) -> Optional[bytes]:
+    """Read the next chunk and run it through ``pipeline``; None at the end."""
+    chunk = next(chunks, None)
+    return None if chunk is None else pipeline.feed(chunk)
+
+
+class _Format:
+    __slots__ = ("rate", "channels", "bits", "encoding", "big_endian")
+
+    def __init__(self, rate: int, channels: int = 1, bits: int = 16,
+                 encoding: str = "signed-integer", big_endian: bool = False):
+        if encoding not in ("signed-integer", "unsigned-integer", "floating-point"):
+            raise ValueError(f"unsupported PCM encoding: {encoding}")
+        if bits not in (8, 16, 24, 32) or (encoding == "floating-point" and bits != 32):
+            raise ValueError(f"unsupported PCM sample size: {bits} bits {encoding}")
+        self.rate = rate
+        self.channels = channels
+        self.bits = bits
+        self.encoding = encoding
+        self.big_endian = big_endian
+
+    @property
+    def frame_bytes(self) -> int:
+        return self.channels * self.bits // 8
+
+    @classmethod
+    def from_content_type(cls, content_type: str) -> "_Format":
+        """Parse a Wit.ai raw audio Content-Type such as ``RAW_CONTENT_TYPE``."""
+        params = {}
+        for part in content_type.split(";")[1:]:
+            name, _, value = part.partition("=")
+            params[name.strip().lower()] = value.strip()
+        if "rate" not in params:
+            raise ValueError(f"raw audio needs a rate in its Content-Type: {content_type}")
+        return cls(int(params["rate"]), 1, int(params.get("bits", 16)),
+                   params.get("encoding", "signed-integer"), params.get("endian") == "big")
+
+    @classmethod
+    def from_wav(cls, fmt: bytes) -> "_Format":
+        tag, channels, rate, _, _, bits = struct.unpack("<HHIIHH", fmt[:16])
+        if tag == _EXTENSIBLE and len(fmt) >= 26:
+            tag = struct.unpack("<H", fmt[24:26])[0]  # First two bytes of the sub-format GUID
+        if tag not in (_PCM, _FLOAT):
+            raise ValueError(f"only PCM and float WAV files can be preprocessed (format {tag})")
+        encoding = ("floating-point" if tag == _FLOAT
+                    else "unsigned-integer" if bits == 8 else "signed-integer")
+        return cls(rate, channels, bits, encoding)
+
+
+class _WavReader:
+    """Strip the RIFF header off a WAV byte stream and return its PCM data."""
+
+    def __init__(self):
+        self.format: Optional[_Format] = None
+        self._buffer = bytearray()
+        self._riff = False
+        self._remaining: Optional[int] = None  # Bytes left in the data chunk
+
+    def feed(self, chunk: bytes) -> bytes:
+        if self._remaining is not None:
+            data = chunk[:self._remaining]
+            self._remaining -= len(data)
+            return bytes(data)
+        self._buffer += chunk
+        buffer = self._buffer
+        if not self._riff:
+            if len(buffer) < 12:
+                return b""
+            if buffer[:4] != b"RIFF" or buffer[8:12] != b"WAVE":
+                raise ValueError("not a RIFF/WAVE stream")
+            del buffer[:12]
+            self._riff = True
+        while len(buffer) >= 8:
+            name, size = bytes(buffer[:4]), struct.unpack("<I", buffer[4:8])[0]
+            if name == b"data":
+                if self.format is None:
+                    raise ValueError("WAV data chunk before its fmt chunk")
+                # Streamed WAVs often leave the size at 0 or 0xFFFFFFFF.
+                self._remaining = size if 0 < size < 0xFFFFFFFF else sys.maxsize
+                data = bytes(buffer[8:])
+                del buffer[:]
+                return self.feed(data)
+            padded = size + (size & 1)
+            if len(buffer) < 8 + padded:
+                return b""
+            if name == b"fmt ":
+                self.format = _Format.from_wav(bytes(buffer[8:8 + size]))
+            del buffer[:8 + padded]
+        return b""
+
+
+class _Resampler:
+    """Streaming rate converter: windowed-sinc low-pass (when downsampling)
+    followed by linear interpolation, with state kept across blocks."""
+
+    def __init__(self, np: Any, rate_in: int, rate_out: int, taps: int = 95):
+        self._np = np
+        self.step = rate_in / rate_out
+        self._filter = None
+        if rate_out < rate_in:
+            cutoff = 0.4 * rate_out / rate_in  # Cycles per input sample, below the new Nyquist
+            n = np.arange(taps) - (taps - 1) / 2
+            h = 2 * cutoff * np.sinc(2 * cutoff * n) * np.blackman(taps)
+            self._filter = (h / h.sum()).astype(np.float32)
+            self._history = np.zeros(taps - 1, dtype=np.float32)
+        self._pending = np.zeros(0, dtype=np.float32)  # Filtered samples not yet passed
+        self._position = 0.0  # Of the next output sample within _pending
+
+    def process(self, samples: Any) -> Any:
+        np = self._np
+        if self._filter is not None:
+            padded = np.concatenate((self._history, samples))
+            self._history = padded[len(padded) - len(self._history):]
+            samples = np.convolve(padded, self._filter, mode="valid").astype(np.float32)
+        pending = np.concatenate((self._pending, samples))
+        count = int(np.ceil((len(pending) - 1 - self._position) / self.step))
+        if count <= 0:
+            self._pending = pending
+            return np.zeros(0, dtype=np.float32)
+        positions = self._position + self.step * np.arange(count)
+        index = positions.astype(np.int64)
+        fraction = (positions - index).astype(np.float32)
+        out = pending[index] * (1 - fraction) + pending[index + 1] * fraction
+        end = self._position + self.step * count
+        consumed = min(int(end), len(pending))  # The next output may lie past this block
+        self._pending = pending[consumed:]
+        self._position = end - consumed
+        return out
+
+
+class _SilenceTrimmer:
+    """Drop leading and trailing 10 ms frames quieter than a threshold,
+    keeping ``padding`` seconds of context next to speech. Silence after
+    speech is held back until more speech arrives or the stream ends."""
+
+    def __init__(self, np: Any, rate: int, threshold_db: float, padding: float):
+        self._np = np
+        self.frame = max(1, rate // 100)
+        self.level = (10 ** (threshold_db / 20)) ** 2  # Mean square of a frame at the threshold
+        self.pad = int(round(padding * 100))
+        self.started = False
+        self.trimmed = 0  # Samples dropped
+        self._rest = np.zeros(0, dtype=np.float32)  # Less than a frame
+        self._held: List[Any] = []  # Silent frames since the last voiced one
+
+    def _held_frames(self) -> Any:
+        np = self._np
+        if not self._held:
+            return np.zeros((0, self.frame), dtype=np.float32)
+        held = np.concatenate(self._held)
+        self._held = []
+        return held
+
+    def process(self, samples: Any) -> Any:
+        np = self._np
+        samples = np.concatenate((self._rest, samples))
+        count = len(samples) // self.frame
+        self._rest = samples[count * self.frame:]
+        frames = samples[:count * self.frame].reshape(count, self.frame)
+        voiced = np.flatnonzero(np.mean(frames * frames, axis=1) > self.level)
+        out = []
+        if not self.started:
+            if not len(voiced):
+                self._held.append(frames)
+                held = self._held_frames()
+                keep = held[max(0, len(held) - self.pad):]
+                self.trimmed += (len(held) - len(keep)) * self.frame
+                self._held = [keep]
+                return np.zeros(0, dtype=np.float32)
+            lead = np.concatenate((self._held_frames(), frames[:voiced[0]]))
+            keep = min(len(lead), self.pad)
+            self.trimmed += (len(lead) - keep) * self.frame
+            out.append(lead[len(lead) - keep:])
+            frames, voiced = frames[voiced[0]:], voiced - voiced[0]
+            self.started = True
+        if len(voiced):
+            out.append(self._held_frames())
+            out.append(frames[:voiced[-1] + 1])
+            frames = frames[voiced[-1] + 1:]
+        self._held.append(frames)
+        return np.concatenate(out).ravel() if out else np.zeros(0, dtype=np.float32)
+
+    def close(self) -> Any:
+        held = self._held_frames()
+        keep = held[:self.pad] if self.started else held[:0]
+        self.trimmed += (len(held) - len(keep)) * self.frame + len(self._rest)
+        return keep.ravel()
+
+
+class _Pipeline:
+    """One clip: parse, downmix, resample, trim and quantise, chunk by chunk."""
+
+    def __init__(self, preprocessor: "AudioPreprocessor", content_type: str):
+        np = preprocessor._np
+        self._np = np
+        self._preprocessor = preprocessor
+        media_type = content_type.split(";")[0].strip().lower()
+        if media_type in WAV_CONTENT_TYPES:
+            self._wav: Optional[_WavReader] = _WavReader()
+            self.format: Optional[_Format] = None
+        elif media_type == "audio/raw":
+            self._wav = None
+            self.format = _Format.from_content_type(content_type)
+        else:
+            raise ValueError(f"only WAV and raw PCM can be preprocessed, not {content_type}")
+        self._carry = b""  # Partial sample frame
+        self._started = False
+        self._resampler: Optional[_Resampler] = None
+        self._trimmer: Optional[_SilenceTrimmer] = None
+        self.bytes_in = self.bytes_out = self.samples_in = 0
+        self.seconds = 0.0  # Time spent processing
+
+    def _start(self) -> None:
+        self._started = True
+        rate_in, rate_out = self.format.rate, self._preprocessor.sample_rate
+        if rate_in != rate_out:
+            self._resampler = _Resampler(self._np, rate_in, rate_out)
+        if self._preprocessor.trim_silence:
+            self._trimmer = _SilenceTrimmer(self._np, rate_out,
+                                            self._preprocessor.silence_threshold,
+                                            self._preprocessor.padding)
+
+    def _decode(self, data: bytes) -> Any:
+        """PCM bytes to mono float32 samples in [-1, 1)."""
+        np, fmt = self._np, self.format
+        data = self._carry + data
+        usable = len(data) - len(data) % fmt.frame_bytes
+        data, self._carry = data[:usable], data[usable:]
+        order = ">" if fmt.big_endian else "<"
+        if fmt.encoding == "floating-point":
+            samples = np.frombuffer(data, f"{order}f4").astype(np.float32)
+        elif fmt.bits == 8:
+            unsigned = fmt.encoding == "unsigned-integer"
+            raw = np.frombuffer(data, np.uint8 if unsigned else np.int8)
+            samples = raw.astype(np.float32) - (128 if unsigned else 0)
+            samples /= 128
+        elif fmt.bits == 24:
+            raw = np.frombuffer(data, np.uint8).reshape(-1, 3).astype(np.int32)
+            if fmt.big_endian:
+                raw = raw[:, ::-1]
+            value = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+            samples = ((value << 8) >> 8).astype(np.float32) / 2 ** 23  # Sign-extend
+        else:
+            samples = np.frombuffer(data, f"{order}i{fmt.bits // 8}").astype(np.float32)
+            samples /= 2 ** (fmt.bits - 1)
+        if fmt.channels > 1:
+            samples = samples.reshape(-1, fmt.channels).mean(axis=1, dtype=np.float32)
+        return samples
+
+    def _encode(self, samples: Any) -> bytes:
+        np = self._np
+        pcm = np.clip(np.rint(samples * 32768), -32768, 32767).astype("<i2").tobytes()
+        self.bytes_out += len(pcm)
+        return pcm
+
+    def feed(self, chunk: bytes) -> bytes:
+        start = time.perf_counter()
+        self.bytes_in += len(chunk)
+        data = bytes(chunk)
+        if self._wav is not None:
+            data = self._wav.feed(data)
+            if self.format is None:
+                self.format = self._wav.format
+        if not data:
+            self.seconds += time.perf_counter() - start
+            return b""
+        if not self._started:
+            self._start()
+        samples = self._decode(data)
+        self.samples_in += len(samples)
+        if self._resampler is not None:
+            samples = self._resampler.process(samples)
+        if self._trimmer is not None:
+            samples = self._trimmer.process(samples)
+        pcm = self._encode(samples) if len(samples) else b""
+        self.seconds += time.perf_counter() - start
+        return pcm
+
+    def close(self) -> bytes:
+        start = time.perf_counter()
+        if self.format is None:
+            raise ValueError("audio stream ended before any samples")
+        pcm = b""
+        if self._trimmer is not None:
+            pcm = self._encode(self._trimmer.close())
+        self.seconds += time.perf_counter() - start
+        self._preprocessor._record(self)
+        return pcm
+
+
+class AudioPreprocessor:
+    """Shrink WAV or raw PCM audio before it is uploaded to /speech.
+
+    Audio is downmixed to mono, resampled to ``sample_rate`` (16 kHz by
+    default, what speech recognition uses) and converted to 16-bit raw PCM,
+    sent with the matching ``content_type``. With ``trim_silence``, leading
+    and trailing stretches quieter than ``silence_threshold`` dBFS are
+    dropped, keeping ``padding`` seconds next to speech. Clips are
+    processed chunk by chunk with NumPy (installed separately) as they are
+    uploaded, so they are never held in memory whole.
+
+    Pass it as ``preprocess`` to ``transcribe_audio``, ``get_speech_meaning``
+    or ``stream_speech``. ``stats`` accumulates bytes in and out, seconds
+    of audio in and out, and processing time over all clips.
+    """
+
+    def __init__(self, sample_rate: int = 16000, trim_silence: bool = True,
+                 silence_threshold: float = -50.0, padding: float = 0.3):
+        try:
+            import numpy
+        except ImportError as e:
+            raise ImportError("AudioPreprocessor requires the numpy package") from e
+        self._np = numpy
+        self.sample_rate = sample_rate
+        self.trim_silence = trim_silence
+        self.silence_threshold = silence_threshold
+        self.padding = padding
+        self.content_type = RAW_CONTENT_TYPE.format(rate=sample_rate)
+        self.stats: Dict[str, float] = {"clips": 0, "bytes_in": 0, "bytes_out": 0,
+                                        "seconds_in": 0.0, "seconds_out": 0.0,
+                                        "processing_seconds": 0.0}
+        self._lock = threading.Lock()
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.stats["bytes_in"] - self.stats["bytes_out"]
+
+    def _record(self, pipeline: _Pipeline) -> None:
+        with self._lock:
+            stats = self.stats
+            stats["clips"] += 1
+            stats["bytes_in"] += pipeline.bytes_in
+            stats["bytes_out"] += pipeline.bytes_out
+            stats["seconds_in"] += pipeline.samples_in / pipeline.format.rate
+            stats["seconds_out"] += pipeline.bytes_out / 2 / self.sample_rate
+            stats["processing_seconds"] += pipeline.seconds
+
+    def process(self, source: Any, content_type: str,
+                chunk_size: int = 65536) -> Iterator[bytes]:
+        """Yield preprocessed PCM for a bytes-like object, file object or chunk iterator."""
+        pipeline = _Pipeline(self, content_type)
+        for chunk in iter_chunks(source, chunk_size):
+            pcm = pipeline.feed(chunk)
+            if pcm:
+                yield pcm
+        pcm = pipeline.close()
+        if pcm:
+            yield pcm
+
+    async def process_async(self, source: Any, content_type: str,
+                            chunk_size: int = 65536) -> AsyncIterator[bytes]:
+        """``process`` for an async chunk iterator (or any source ``process`` takes).
+
+        Reads from sync sources and the NumPy work run in the default
+        executor, so other tasks keep running while a clip is processed.
+        """
+        loop = asyncio.get_running_loop()
+        pipeline = _Pipeline(self, content_type)
+        if hasattr(source, "__aiter__"):
+            async for chunk in source:
+                pcm = await loop.run_in_executor(None, pipeline.feed, chunk)
+                if pcm:
+                    yield pcm
+        else:
+            chunks = iter_chunks(source, chunk_size)
+            while True:
+                pcm = await loop.run_in_executor(None, _feed_next, pipeline, chunks)
+                if pcm is None:
+                    break
+                if pcm:
+                    yield pcm
+        pcm = await loop.run_in_executor(None, pipeline.close)
+        if pcm:
+            yield pcm
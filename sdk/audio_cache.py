@@ -0,0 +1,116 @@
+# audio_cache.py
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Union
+
+AudioBuffer = Union[bytes, mmap.mmap]
+
+
+def audio_cache_key(text: str, voice: str, style: Optional[str], speed: Optional[int],
+                    pitch: Optional[int], accept_format: str, api_version: str) -> str:
+    """Content address of a synthesized clip."""
+    payload = json.dumps([text, voice, style, speed, pitch, accept_format, api_version])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """Size-bounded, content-addressed on-disk cache of synthesized audio.
+
+    Clips are written atomically under ``directory`` and served as read-only
+    memory maps, so hits cost no copy into the Python heap. The least
+    recently used clips are removed once the total exceeds ``max_bytes``;
+    recency survives restarts through file modification times.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0}
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()
+        self._total = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.audio")
+
+    def _load(self) -> None:
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".audio"):
+                    info = os.stat(os.path.join(root, name))
+                    entries.append((info.st_mtime, name[:-len(".audio")], info.st_size))
+        for _, key, size in sorted(entries):
+            self._sizes[key] = size
+            self._total += size
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total
+
+    def get(self, key: str) -> Optional[AudioBuffer]:
+        """Return the cached clip as a read-only memory map, or None."""
+        with self._lock:
+            if key not in self._sizes:
+                self.stats["misses"] += 1
+                return None
+            self._sizes.move_to_end(key)
+            self.stats["hits"] += 1
+        path = self._path(key)
+        try:
+            os.utime(path)
+            with open(path, "rb") as f:
+                if self._sizes.get(key) == 0:
+                    return b""
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            # Removed by another process sharing the directory.
+            self._forget(key)
+            return None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._sizes
+
+    @contextmanager
+    def writer(self, key: str) -> Iterator:
+        """Write a clip incrementally; it becomes visible only if the block succeeds."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                yield f
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._add(key, os.path.getsize(path))
+
+    def set(self, key: str, audio: bytes) -> None:
+        with self.writer(key) as f:
+            f.write(audio)
+
+    def _add(self, key: str, size: int) -> None:
+        with self._lock:
+            self._total += size - self._sizes.pop(key, 0)
+            self._sizes[key] = size
+            while self._total > self.max_bytes and len(self._sizes) > 1:
+                old_key, old_size = self._sizes.popitem(last=False)
+                self._total -= old_size
+                self.stats["evictions"] += 1
+                try:
+                    os.unlink(self._path(old_key))
+                except OSError:
+                    pass  # Already gone, or still mapped on platforms that forbid it
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            self._total -= self._sizes.pop(key, 0)
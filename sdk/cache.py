@@ -0,0 +1,188 @@
+# cache.py
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# Parameters whose JSON value is normalised so key order does not matter.
+_JSON_PARAMS = ("context", "entities")
+
+
+def normalize_query(text: str) -> str:
+    """Case-fold and collapse whitespace so trivially different queries share a key."""
+    return " ".join(text.split()).casefold()
+
+
+def response_cache_key(base_url: str, token: str, path: str, params: Dict) -> str:
+    """Build the cache key for a /message or /language call.
+
+    Covers the endpoint, the app (via a token hash), the normalised query and
+    every other parameter, including ``v`` (the API version).
+    """
+    parts = {}
+    for name, value in params.items():
+        if name == "q":
+            value = normalize_query(value)
+        elif name in _JSON_PARAMS:
+            value = json.dumps(json.loads(value), sort_keys=True)
+        parts[name] = value
+    token_hash = hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+    payload = json.dumps([base_url, token_hash, path, parts], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CacheBackend(ABC):
+    """Interface for response caches; values are raw response bodies.
+
+    ``stats`` counts hits, misses, evictions and invalidations.
+    """
+
+    def __init__(self):
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0,
+                                      "evictions": 0, "invalidations": 0}
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """The cached value for ``key``, or None if absent or expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes) -> None:
+        """Store ``value`` under ``key``."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every entry."""
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
+
+
+class LRUCache(CacheBackend):
+    """Thread-safe in-process LRU cache with a TTL and an entry bound."""
+
+    def __init__(self, maxsize: int = 10000, ttl: Optional[float] = 300.0):
+        super().__init__()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > time.monotonic()):
+                self._data.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[0]
+            if entry is not None:
+                del self._data[key]
+            self.stats["misses"] += 1
+            return None
+
+    def set(self, key: str, value: bytes) -> None:
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.stats["invalidations"] += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCache(CacheBackend):
+    """On-disk cache that several processes can share through one SQLite file.
+
+    Uses WAL mode so readers do not block the writer. Expired rows are
+    dropped lazily; once ``maxsize`` rows are exceeded, the least recently
+    used ones are evicted; the row count is only checked every
+    ``evict_every`` writes to keep ``set`` cheap. A hit only records its
+    access time when the stored one is over ``touch_interval`` seconds old,
+    so most hits are plain reads that do not contend for the write lock.
+    """
+
+    def __init__(self, path: str, maxsize: int = 100000, ttl: Optional[float] = 3600.0,
+                 evict_every: int = 100, touch_interval: float = 60.0):
+        super().__init__()
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.evict_every = evict_every
+        self.touch_interval = touch_interval
+        self._writes = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()  # Guards stats and _writes
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS responses ("
+                         "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                         "expires REAL, accessed REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed "
+                         "ON responses (accessed)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 connections cannot be shared between threads.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            # Under WAL, NORMAL syncs at checkpoints rather than on every
+            # commit and stays consistent; a crash only loses recent entries.
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT value, expires, accessed FROM responses WHERE key = ?",
+                               (key,)).fetchone()
+            if row is not None and (row[1] is None or row[1] > now):
+                if now - row[2] >= self.touch_interval:
+                    conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                with self._lock:
+                    self.stats["hits"] += 1
+                return bytes(row[0])
+            if row is not None:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def set(self, key: str, value: bytes) -> None:
+        now = time.time()
+        expires = now + self.ttl if self.ttl is not None else None
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                         (key, value, expires, now))
+            with self._lock:
+                self._writes += 1
+                if self._writes % self.evict_every:
+                    return
+            excess = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.maxsize
+            if excess > 0:
+                conn.execute("DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+                             "ORDER BY accessed LIMIT ?)", (excess,))
+                with self._lock:
+                    self.stats["evictions"] += excess
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+        with self._lock:
+            self.stats["invalidations"] += 1
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
@@ -0,0 +1,137 @@
+# dataset.py
+import json
+from typing import Any, Callable, Dict, Iterator, Optional, Set, TextIO, Union
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+
+def _open_text(source: Union[str, TextIO]):
+    if isinstance(source, str):
+        return open(source, "r", encoding="utf-8")
+    return source
+
+
+def iter_json_array(source: Union[str, TextIO], chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array without loading the file.
+
+    Only the element being decoded is held in memory, so multi-GB arrays
+    are read in bounded memory.
+    """
+    f = _open_text(source)
+    buffer = ""
+    eof = False
+
+    def read_more() -> bool:
+        nonlocal buffer, eof
+        chunk = f.read(chunk_size)
+        buffer += chunk
+        eof = not chunk
+        return not eof
+
+    try:
+        while not buffer.strip():
+            if not read_more():
+                raise ValueError("expected a JSON array")
+        buffer = buffer.lstrip()
+        if not buffer.startswith("["):
+            raise ValueError("expected a JSON array")
+        buffer = buffer[1:]
+        after_value = False  # A "," or "]" must come next
+        after_comma = False  # Another element must come next
+        while True:
+            buffer = buffer.lstrip(_WHITESPACE)
+            if not buffer:
+                if not read_more():
+                    raise ValueError("unterminated JSON array")
+                continue
+            if after_value:
+                if buffer[0] == "]":
+                    return
+                if buffer[0] != ",":
+                    raise ValueError(f"unexpected data in JSON array: {buffer[:20]!r}")
+                buffer = buffer[1:]
+                after_value, after_comma = False, True
+                continue
+            if buffer[0] == "]" and not after_comma:
+                return
+            if buffer[0] in ",]":
+                raise ValueError(f"expected a value in JSON array: {buffer[:20]!r}")
+            try:
+                value, end = _decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if not read_more():
+                    raise
+                continue
+            rest = buffer[end:].lstrip(_WHITESPACE)
+            if (not rest or rest[0] not in ",]") and read_more():
+                continue  # A number or literal may continue in the next chunk.
+            yield value
+            buffer = buffer[end:]
+            after_value, after_comma = True, False
+    finally:
+        if f is not source:
+            f.close()
+
+
+def iter_jsonl(source: Union[str, TextIO]) -> Iterator[Any]:
+    """Yield one value per non-empty line of a JSON Lines file."""
+    f = _open_text(source)
+    try:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+    finally:
+        if f is not source:
+            f.close()
+
+
+def iter_samples(path: str) -> Iterator[Any]:
+    """Yield samples from a JSON array or JSON Lines file, detected from its content."""
+    with open(path, "r", encoding="utf-8") as f:
+        head = f.read(1)
+        while head and head.isspace():
+            head = f.read(1)
+        f.seek(0)
+        yield from (iter_json_array(f) if head == "[" else iter_jsonl(f))
+
+
+def sample_to_utterance(sample: Dict, lowercase_intent: bool = True) -> Dict:
+    """Convert a ``{"text", "entities": [{"entity": "intent", "value"}]}`` sample
+    into the utterance format accepted by ``WitAI.upload_utterances``."""
+    entities = sample.get("entities") or []
+    intent = next((e["value"] for e in entities if e.get("entity") == "intent"),
+                  entities[0]["value"] if entities else None)
+    if intent is not None and lowercase_intent:
+        intent = intent.lower()
+    return {"text": sample["text"], "intent": intent, "entities": [], "traits": []}
+
+
+class TrainingDataset:
+    """Lazily read a training corpus and convert its samples into utterances.
+
+    Distinct intents are collected in ``intents`` during the same pass.
+    ``on_new_intent`` is called the first time an intent appears, before
+    any utterance using it is yielded, so the intent can be created before
+    the utterances that need it are uploaded.
+    """
+
+    def __init__(self, path: str, lowercase_intents: bool = True):
+        self.path = path
+        self.lowercase_intents = lowercase_intents
+        self.intents: Set[str] = set()
+        self.count = 0
+
+    def iter_utterances(self, on_new_intent: Optional[Callable[[str], None]] = None
+                        ) -> Iterator[Dict]:
+        for sample in iter_samples(self.path):
+            utterance = sample_to_utterance(sample, self.lowercase_intents)
+            intent = utterance["intent"]
+            if intent is not None and intent not in self.intents:
+                self.intents.add(intent)
+                if on_new_intent is not None:
+                    on_new_intent(intent)
+            self.count += 1
+            yield utterance
+
+    __iter__ = iter_utterances
@@ -0,0 +1,54 @@
+# deadline.py
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple, Union
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a call runs past its total deadline."""
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """Time limits for a call, in seconds; ``None`` means unbounded.
+
+    ``connect`` bounds opening a connection and ``read`` each wait for
+    response data, on every attempt. ``total`` bounds the whole call,
+    including rate-limiter waits, retries and backoff: each attempt's
+    connect and read limits are cut to the time left, no retry is started
+    that could not finish in time, and ``DeadlineExceeded`` is raised once it
+    has passed. Streaming calls only use ``connect`` and ``read``.
+    """
+    connect: Optional[float] = None
+    read: Optional[float] = None
+    total: Optional[float] = None
+
+    def expires(self) -> Optional[float]:
+        """The ``time.monotonic()`` value by which a call starting now must finish."""
+        return time.monotonic() + self.total if self.total is not None else None
+
+    def attempt(self, remaining: Optional[float] = None) -> Tuple[Optional[float],
+                                                                  Optional[float]]:
+        """(connect, read) limits for one attempt with ``remaining`` seconds left."""
+        if remaining is None:
+            return self.connect, self.read
+        return (remaining if self.connect is None else min(self.connect, remaining),
+                remaining if self.read is None else min(self.read, remaining))
+
+
+# A single float applies to both connect and read; a tuple is (connect, read).
+Timeout = Union[None, float, Tuple[float, float], Deadline]
+
+# Used when a client is given no timeout, so a stuck connection cannot hang
+# a caller forever. The read limit is per wait for data, not per response.
+DEFAULT_TIMEOUT = Deadline(connect=10.0, read=60.0)
+
+
+def as_deadline(timeout: Timeout) -> Deadline:
+    if isinstance(timeout, Deadline):
+        return timeout
+    if timeout is None:
+        return Deadline()
+    if isinstance(timeout, tuple):
+        return Deadline(*timeout)
+    return Deadline(timeout, timeout)
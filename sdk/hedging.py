@@ -0,0 +1,70 @@
+# hedging.py
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from .retry import RetryBudget
+
+
+class HedgePolicy:
+    """When to send a second copy of a slow /message or /language call.
+
+    The client records how long each of these calls took in a window of the
+    last ``window`` latencies. Once it holds ``min_samples``, a call still
+    unanswered after the window's ``percentile`` (but at least ``min_delay``)
+    is sent again and whichever copy answers first is used. Hedges are
+    capped at roughly ``max_rate`` of calls, with bursts of up to ``burst``,
+    so a slow backend does not get twice the load. Share one policy between
+    clients to give them a common window and cap.
+    """
+
+    def __init__(self, percentile: float = 0.95, window: int = 1000,
+                 min_samples: int = 50, min_delay: float = 0.0,
+                 max_rate: float = 0.05, burst: float = 10.0):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.budget = RetryBudget(ratio=max_rate, min_per_second=0.0, max_tokens=burst)
+        self.stats: Dict[str, int] = {"calls": 0, "hedged": 0, "hedge_wins": 0,
+                                      "budget_exhausted": 0}
+        self._delay: Optional[float] = None
+        self._stale = 0  # Latencies recorded since _delay was computed
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self.latencies.append(seconds)
+            self._stale += 1
+
+    def delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None while the window is too small."""
+        with self._lock:
+            if len(self.latencies) < self.min_samples:
+                return None
+            # Re-sorting the window on every call would cost more than the
+            # estimate drifts, so refresh it every few dozen samples.
+            if self._delay is None or self._stale >= 32:
+                ordered = sorted(self.latencies)
+                index = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+                self._delay = max(self.min_delay, ordered[index])
+                self._stale = 0
+            return self._delay
+
+    def start(self) -> Optional[float]:
+        """Record a new call and return its hedge delay (see ``delay``)."""
+        with self._lock:
+            self.stats["calls"] += 1
+        self.budget.deposit()
+        return self.delay()
+
+    def allow(self) -> bool:
+        """Take a hedge from the budget; False when the rate cap is reached."""
+        allowed = self.budget.withdraw()
+        with self._lock:
+            self.stats["hedged" if allowed else "budget_exhausted"] += 1
+        return allowed
+
+    def won(self) -> None:
+        with self._lock:
+            self.stats["hedge_wins"] += 1
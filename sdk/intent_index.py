@@ -0,0 +1,186 @@
+# intent_index.py
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from .cache import normalize_query
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """Character trigrams of a normalised, punctuation-free text, padded at word edges."""
+    padded = f" {' '.join(_PUNCTUATION.sub(' ', text).split())} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _wit_entities(utterance: Dict) -> Dict[str, List[Dict]]:
+    """Training entity spans in the shape /message returns them."""
+    entities: Dict[str, List[Dict]] = {}
+    for span in utterance.get("entities") or []:
+        name, _, role = span["entity"].partition(":")
+        entities.setdefault(span["entity"], []).append({
+            "name": name, "role": role or name, "start": span.get("start"),
+            "end": span.get("end"), "body": span.get("body"), "value": span.get("body"),
+            "confidence": 1.0, "entities": {}})
+    return entities
+
+
+def _wit_traits(utterance: Dict) -> Dict[str, List[Dict]]:
+    traits: Dict[str, List[Dict]] = {}
+    for trait in utterance.get("traits") or []:
+        traits.setdefault(trait["trait"], []).append({"value": trait["value"],
+                                                      "confidence": 1.0})
+    return traits
+
+
+class _Entry:
+    __slots__ = ("text", "intent", "entities", "traits", "grams")
+
+    def __init__(self, utterance: Dict):
+        self.text = utterance["text"]
+        self.intent = utterance.get("intent")
+        self.entities = _wit_entities(utterance)
+        self.traits = _wit_traits(utterance)
+        self.grams = trigrams(normalize_query(self.text))
+
+
+class IntentIndex:
+    """Local index of training utterances answering /message without a round trip.
+
+    A query is matched by normalised text (case and whitespace folded), or
+    else by trigram similarity (Dice coefficient) to the closest training
+    utterance. A match scoring at least ``threshold`` is returned in the
+    shape of a /message response with ``"local": True``, unless a
+    different intent scores within ``margin`` of it. Entity spans are only
+    reported when the query is character-for-character a training text, so
+    fuzzy and case-folded matches are limited to utterances without entities.
+
+    Keep it current with ``add``/``remove`` (a client given the index does
+    this on upload and delete). ``stats`` and ``hit_rate`` report how often
+    lookups were answered locally.
+    """
+
+    def __init__(self, threshold: float = 0.9, margin: float = 0.05):
+        self.threshold = threshold
+        self.margin = margin
+        self.stats: Dict[str, int] = {"lookups": 0, "exact": 0, "fuzzy": 0, "misses": 0}
+        self._entries: Dict[str, _Entry] = {}  # By normalised text
+        self._postings: Dict[str, Set[str]] = {}  # Trigram -> normalised texts
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.stats["lookups"]
+        return (self.stats["exact"] + self.stats["fuzzy"]) / lookups if lookups else 0.0
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            for gram in entry.grams:
+                texts = self._postings[gram]
+                texts.discard(key)
+                if not texts:
+                    del self._postings[gram]
+
+    def add(self, utterances: Iterable[Dict]) -> int:
+        """Index (or re-label) utterances in ``upload_utterances`` format."""
+        count = 0
+        with self._lock:
+            for utterance in utterances:
+                if not utterance.get("intent"):
+                    continue
+                key = normalize_query(utterance["text"])
+                self._discard(key)
+                entry = self._entries[key] = _Entry(utterance)
+                for gram in entry.grams:
+                    self._postings.setdefault(gram, set()).add(key)
+                count += 1
+        return count
+
+    def remove(self, texts: Iterable[str]) -> None:
+        with self._lock:
+            for text in texts:
+                self._discard(normalize_query(text))
+
+    def remove_intent(self, intent: str) -> None:
+        with self._lock:
+            for key in [key for key, e in self._entries.items() if e.intent == intent]:
+                self._discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._postings.clear()
+
+    def _candidates(self, grams: FrozenSet[str]) -> List[Tuple[_Entry, int]]:
+        """Entries that may score at least ``threshold - margin`` against
+        ``grams`` (no other entry can decide a lookup), each with an upper
+        bound on the trigrams it shares. Called under the lock."""
+        floor = self.threshold - self.margin
+        if floor <= 0:
+            return [(entry, len(grams)) for entry in self._entries.values()]
+        # A Dice score of ``floor`` needs ``need`` shared trigrams, so any such
+        # entry shares one of the ``len(grams) - need + 1`` rarest ones. Common
+        # trigrams like " th", whose postings span most of the index, are skipped.
+        need = max(1, math.ceil(floor * len(grams) / (2 - floor) - 1e-9))
+        rarest = sorted(grams, key=lambda gram: len(self._postings.get(gram, ())))
+        shared = Counter()
+        for gram in rarest[:len(grams) - need + 1]:
+            shared.update(self._postings.get(gram, ()))
+        return [(self._entries[key], count + need - 1) for key, count in shared.items()]
+
+    def _closest(self, grams: FrozenSet[str],
+                 candidates: List[Tuple[_Entry, int]]) -> Optional[Tuple[_Entry, float]]:
+        floor = self.threshold - self.margin
+        best: Optional[Tuple[_Entry, float]] = None
+        rival = 0.0  # Best score of an intent other than the best one's
+        for entry, bound in candidates:
+            total = len(grams) + len(entry.grams)
+            if 2 * min(bound, len(entry.grams)) < floor * total:
+                continue  # Cannot reach the floor, so cannot be best or rival
+            score = 2 * len(grams & entry.grams) / total
+            if best is None or score > best[1]:
+                if best is not None and best[0].intent != entry.intent:
+                    rival = max(rival, best[1])
+                best = (entry, score)
+            elif entry.intent != best[0].intent:
+                rival = max(rival, score)
+        if best is None or best[1] - rival < self.margin:
+            return None
+        return best
+
+    def lookup(self, text: str) -> Optional[Dict]:
+        """Return a /message-shaped result for ``text``, or None to ask the API."""
+        key = normalize_query(text)
+        with self._lock:
+            self.stats["lookups"] += 1
+            entry = self._entries.get(key)
+            exact = entry is not None and (entry.text == text or not entry.entities)
+            if exact:
+                self.stats["exact"] += 1
+            else:
+                grams = trigrams(key)
+                candidates = self._candidates(grams)
+        if exact:
+            confidence = 1.0
+        else:
+            # Entries are never modified once indexed, so scoring the
+            # candidates needs no lock.
+            match = self._closest(grams, candidates)
+            hit = match is not None and match[1] >= self.threshold and not match[0].entities
+            with self._lock:
+                self.stats["fuzzy" if hit else "misses"] += 1
+            if not hit:
+                return None
+            entry, confidence = match
+        return {"text": text,
+                "intents": [{"id": "", "name": entry.intent, "confidence": confidence}],
+                "entities": entry.entities if entry.text == text else {},
+                "traits": entry.traits,
+                "local": True}
@@ -0,0 +1,284 @@
+# metrics.py
+import bisect
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Latency bucket bounds in seconds: the Prometheus client defaults, extended
+# below 5 ms so cache hits and local stubs are resolved too.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.075,
+                   0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+# Latency phases reported on every event, in the order they happen.
+PHASES = ("dns", "connect", "ttfb", "total")
+
+
+def endpoint_name(path: str) -> str:
+    """Collapse a request path into a low-cardinality endpoint template.
+
+    Resource names sit at every second segment, so ``/entities/city/keywords/paris``
+    becomes ``/entities/{}/keywords/{}``.
+    """
+    segments = path.strip("/").split("/")
+    return "/" + "/".join("{}" if i % 2 else s for i, s in enumerate(segments))
+
+
+@dataclass
+class RequestEvent:
+    """What happened during one SDK call, handed to every registered hook.
+
+    Latencies are in seconds and ``None`` when not measured: ``dns`` and
+    ``connect`` are only set when a new connection was opened (the sync
+    client folds DNS into ``connect``), ``ttfb`` runs from sending the
+    request to receiving the response headers, and ``total`` covers the
+    whole call including rate-limiter waits and retries. ``cache`` is
+    ``"hit"``, ``"miss"`` or ``None`` for uncacheable requests, and
+    ``coalesced`` is True when the response was shared with a concurrent
+    identical call, and ``hedged`` when a second copy was sent because the
+    first was slow (see ``hedging``).
+    """
+    method: str
+    endpoint: str
+    family: str
+    status: Optional[int] = None
+    error: Optional[BaseException] = None
+    dns: Optional[float] = None
+    connect: Optional[float] = None
+    ttfb: Optional[float] = None
+    total: float = 0.0
+    request_bytes: Optional[int] = None
+    response_bytes: Optional[int] = None
+    retries: int = 0
+    cache: Optional[str] = None
+    coalesced: bool = False
+    hedged: bool = False
+    start_time: float = field(default_factory=time.time)
+    started: float = field(default_factory=time.perf_counter)
+
+
+def status_label(event: RequestEvent) -> str:
+    """HTTP status, or ``error``/``cached``/``coalesced`` for calls without one."""
+    if event.status is not None:
+        return str(event.status)
+    if event.error is not None:
+        return "error"
+    return "cached" if event.cache == "hit" else "coalesced"
+
+
+# A hook is any callable taking a RequestEvent. Hooks run synchronously on
+# the calling thread (or event loop) after each call, so keep them cheap.
+Hook = Callable[[RequestEvent], None]
+
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus-style cumulative quantiles."""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by interpolating within its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+class MetricsCollector:
+    """In-process hook that aggregates events into per-endpoint histograms.
+
+    Register it with ``client.add_hook(collector)``. ``summary()`` returns
+    counts and latency quantiles per ``"METHOD /endpoint"``, ``stats`` holds
+    global counters, and ``render_prometheus()`` produces the text
+    exposition format for a scrape endpoint without extra dependencies.
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.stats: Dict[str, int] = {"requests": 0, "errors": 0, "retries": 0,
+                                      "cache_hits": 0, "cache_misses": 0,
+                                      "coalesced": 0, "hedged": 0, "request_bytes": 0,
+                                      "response_bytes": 0}
+        self.statuses: Dict[Tuple[str, str, str], int] = {}
+        self.latency: Dict[Tuple[str, str], Dict[str, Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent) -> None:
+        route = (event.method, event.endpoint)
+        status = status_label(event)
+        with self._lock:
+            stats = self.stats
+            stats["requests"] += 1
+            stats["retries"] += event.retries
+            if event.error is not None:
+                stats["errors"] += 1
+            if event.cache == "hit":
+                stats["cache_hits"] += 1
+            elif event.cache == "miss":
+                stats["cache_misses"] += 1
+            if event.coalesced:
+                stats["coalesced"] += 1
+            if event.hedged:
+                stats["hedged"] += 1
+            stats["request_bytes"] += event.request_bytes or 0
+            stats["response_bytes"] += event.response_bytes or 0
+            key = route + (status,)
+            self.statuses[key] = self.statuses.get(key, 0) + 1
+            histograms = self.latency.get(route)
+            if histograms is None:
+                histograms = self.latency[route] = {phase: Histogram(self.buckets)
+                                                    for phase in PHASES}
+            for phase in PHASES:
+                value = getattr(event, phase)
+                if value is not None:
+                    histograms[phase].observe(value)
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, Optional[float]]]]:
+        """Per-endpoint count, mean, p50, p90 and p99 for each latency phase."""
+        with self._lock:
+            return {f"{method} {endpoint}": {
+                        phase: {"count": h.count,
+                                "mean": h.sum / h.count if h.count else None,
+                                "p50": h.quantile(0.5), "p90": h.quantile(0.9),
+                                "p99": h.quantile(0.99)}
+                        for phase, h in histograms.items()}
+                    for (method, endpoint), histograms in self.latency.items()}
+
+    def render_prometheus(self, namespace: str = "witai") -> str:
+        """Render the collected metrics in the Prometheus text format."""
+        lines = [f"# TYPE {namespace}_requests_total counter"]
+        with self._lock:
+            for (method, endpoint, status), count in sorted(self.statuses.items()):
+                lines.append(f'{namespace}_requests_total{{method="{method}",'
+                             f'endpoint="{endpoint}",status="{status}"}} {count}')
+            name = f"{namespace}_request_duration_seconds"
+            lines.append(f"# TYPE {name} histogram")
+            for (method, endpoint), histograms in sorted(self.latency.items()):
+                for phase, h in histograms.items():
+                    labels = f'method="{method}",endpoint="{endpoint}",phase="{phase}"'
+                    cumulative = 0
+                    for bound, count in zip(self.buckets + (float("inf"),), h.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+                    lines.append(f"{name}_sum{{{labels}}} {h.sum}")
+                    lines.append(f"{name}_count{{{labels}}} {h.count}")
+            for counter in ("retries", "cache_hits", "cache_misses", "coalesced", "hedged",
+                            "request_bytes", "response_bytes"):
+                lines.append(f"# TYPE {namespace}_{counter}_total counter")
+                lines.append(f"{namespace}_{counter}_total {self.stats[counter]}")
+        return "\n".join(lines) + "\n"
+
+
+class PrometheusHook:
+    """Export events through ``prometheus_client`` (installed separately).
+
+    Metrics are registered on ``registry`` (the default registry if omitted)
+    under ``namespace``: request counts by status, latency histograms by
+    phase, retries, cache, coalescing and hedging outcomes, and bytes transferred.
+    """
+
+    def __init__(self, registry: Any = None, namespace: str = "witai",
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        try:
+            import prometheus_client
+        except ImportError as e:
+            raise ImportError("PrometheusHook requires the prometheus_client package") from e
+        options = {"namespace": namespace,
+                   "registry": registry if registry is not None else prometheus_client.REGISTRY}
+        route = ["method", "endpoint"]
+        self.requests = prometheus_client.Counter(
+            "requests", "Wit.ai requests by status", route + ["status"], **options)
+        self.latency = prometheus_client.Histogram(
+            "request_duration_seconds", "Wit.ai request latency by phase",
+            route + ["phase"], buckets=tuple(buckets), **options)
+        self.retries = prometheus_client.Counter(
+            "retries", "Wit.ai request retries", route, **options)
+        self.outcomes = prometheus_client.Counter(
+            "outcomes", "Cache hits/misses, coalesced and hedged calls", route + ["outcome"],
+            **options)
+        self.bytes = prometheus_client.Counter(
+            "transferred_bytes", "Request and response body bytes", route + ["direction"],
+            **options)
+
+    def __call__(self, event: RequestEvent) -> None:
+        route = (event.method, event.endpoint)
+        status = status_label(event)
+        self.requests.labels(*route, status).inc()
+        for phase in PHASES:
+            value = getattr(event, phase)
+            if value is not None:
+                self.latency.labels(*route, phase).observe(value)
+        if event.retries:
+            self.retries.labels(*route).inc(event.retries)
+        if event.cache is not None:
+            self.outcomes.labels(*route, f"cache_{event.cache}").inc()
+        if event.coalesced:
+            self.outcomes.labels(*route, "coalesced").inc()
+        if event.hedged:
+            self.outcomes.labels(*route, "hedged").inc()
+        if event.request_bytes:
+            self.bytes.labels(*route, "sent").inc(event.request_bytes)
+        if event.response_bytes:
+            self.bytes.labels(*route, "received").inc(event.response_bytes)
+
+
+class OpenTelemetryHook:
+    """Record each call as an OpenTelemetry client span (``opentelemetry-api``
+    installed separately).
+
+    Spans are created when the call finishes, with its real start and end
+    times, as children of whatever span is current in the caller. Phase
+    latencies are attached as ``witai.*_ms`` attributes.
+    """
+
+    def __init__(self, tracer: Any = None):
+        try:
+            from opentelemetry import trace
+        except ImportError as e:
+            raise ImportError("OpenTelemetryHook requires the opentelemetry-api package") from e
+        self._trace = trace
+        self.tracer = tracer if tracer is not None else trace.get_tracer("witai-sdk")
+
+    def __call__(self, event: RequestEvent) -> None:
+        trace = self._trace
+        attributes = {"http.request.method": event.method, "http.route": event.endpoint,
+                      "witai.family": event.family, "witai.retries": event.retries,
+                      "witai.coalesced": event.coalesced, "witai.hedged": event.hedged}
+        if event.status is not None:
+            attributes["http.response.status_code"] = event.status
+        if event.cache is not None:
+            attributes["witai.cache"] = event.cache
+        if event.request_bytes is not None:
+            attributes["http.request.body.size"] = event.request_bytes
+        if event.response_bytes is not None:
+            attributes["http.response.body.size"] = event.response_bytes
+        for phase in PHASES:
+            value = getattr(event, phase)
+            if value is not None:
+                attributes[f"witai.{phase}_ms"] = value * 1000
+        start = int(event.start_time * 1e9)
+        span = self.tracer.start_span(f"{event.method} {event.endpoint}",
+                                      kind=trace.SpanKind.CLIENT, start_time=start,
+                                      attributes=attributes)
+        if event.error is not None:
+            span.record_exception(event.error)
+            span.set_status(trace.Status(trace.StatusCode.ERROR, type(event.error).__name__))
+        span.end(end_time=start + int(event.total * 1e9))
@@ -0,0 +1,124 @@
+# models.py
+"""Compact, typed views of /message, /language and intent responses.
+
+Pass ``typed=True`` to the corresponding client methods to get these instead
+of nested dicts. Each class is slotted and keeps only the fields shown, so
+the decoded JSON tree can be freed as soon as the object is built.
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+
+@dataclass
+class Intent:
+    __slots__ = ("id", "name", "confidence")
+    id: str
+    name: str
+    confidence: float
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "Intent":
+        return cls(data.get("id", ""), data["name"], data.get("confidence", 0.0))
+
+
+@dataclass
+class EntityMatch:
+    __slots__ = ("id", "name", "role", "body", "value", "start", "end", "confidence")
+    id: str
+    name: str
+    role: str
+    body: str
+    value: object
+    start: int
+    end: int
+    confidence: float
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "EntityMatch":
+        return cls(data.get("id", ""), data.get("name", ""), data.get("role", ""),
+                   data.get("body", ""), data.get("value"), data.get("start", 0),
+                   data.get("end", 0), data.get("confidence", 0.0))
+
+
+@dataclass
+class TraitValue:
+    __slots__ = ("id", "value", "confidence")
+    id: str
+    value: object
+    confidence: float
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "TraitValue":
+        return cls(data.get("id", ""), data.get("value"), data.get("confidence", 0.0))
+
+
+@dataclass
+class MessageResult:
+    """Meaning of a sentence; ``entities`` and ``traits`` are keyed like the API's.
+    ``local`` is True when it was answered by an ``IntentIndex``."""
+    __slots__ = ("text", "intents", "entities", "traits", "local")
+    text: str
+    intents: Tuple[Intent, ...]
+    entities: Dict[str, Tuple[EntityMatch, ...]]
+    traits: Dict[str, Tuple[TraitValue, ...]]
+    local: bool
+
+    @property
+    def intent(self) -> Optional[Intent]:
+        """The most confident intent, if any."""
+        return self.intents[0] if self.intents else None
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "MessageResult":
+        return cls(data.get("text", ""),
+                   tuple(Intent.from_json(i) for i in data.get("intents") or ()),
+                   {key: tuple(EntityMatch.from_json(e) for e in matches)
+                    for key, matches in (data.get("entities") or {}).items()},
+                   {key: tuple(TraitValue.from_json(t) for t in values)
+                    for key, values in (data.get("traits") or {}).items()},
+                   data.get("local", False))
+
+
+@dataclass
+class Locale:
+    __slots__ = ("locale", "confidence")
+    locale: str
+    confidence: float
+
+
+@dataclass
+class LanguageResult:
+    __slots__ = ("locales",)
+    locales: Tuple[Locale, ...]
+
+    @property
+    def locale(self) -> Optional[str]:
+        """The most likely locale, if any."""
+        return self.locales[0].locale if self.locales else None
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "LanguageResult":
+        return cls(tuple(Locale(l["locale"], l.get("confidence", 0.0))
+                         for l in data.get("detected_locales") or ()))
+
+
+@dataclass
+class IntentInfo:
+    """An intent of the app, with the names of the entities it uses."""
+    __slots__ = ("id", "name", "entities")
+    id: str
+    name: str
+    entities: Tuple[str, ...]
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "IntentInfo":
+        return cls(data.get("id", ""), data["name"],
+                   tuple(e["name"] for e in data.get("entities") or ()))
+
+
+class IntentList:
+    """Decodes a GET /intents response into a list of ``IntentInfo``."""
+
+    @staticmethod
+    def from_json(data) -> list:
+        return [IntentInfo.from_json(intent) for intent in data]
@@ -0,0 +1,234 @@
+# pool.py
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .deadline import DeadlineExceeded
+from .ratelimit import RateLimiter
+from .witai_async import AsyncWitAI
+from .witai_sdk import WitAI, _WitAIBase
+
+STRATEGIES = ("round_robin", "least_loaded")
+
+
+@dataclass
+class PoolMember:
+    """One token (app) in a pool; ``base_url`` can point at a proxy or a stub."""
+    token: str
+    base_url: str = "https://api.wit.ai"
+    name: Optional[str] = None
+
+
+class _MemberState:
+    __slots__ = ("member", "client", "in_flight", "failures", "down_until", "stats")
+
+    def __init__(self, member: PoolMember, client: _WitAIBase):
+        self.member = member
+        self.client = client
+        self.in_flight = 0
+        self.failures = 0  # Consecutive 429/5xx/transport failures
+        self.down_until = 0.0
+        self.stats: Dict[str, int] = {"requests": 0, "failures": 0, "ejections": 0}
+
+
+def _status(error: BaseException) -> Optional[int]:
+    response = getattr(error, "response", None)
+    if response is not None:
+        return getattr(response, "status_code", None)
+    return getattr(error, "status", None)  # aiohttp.ClientResponseError
+
+
+class _PoolBase:
+    """Member selection and health tracking shared by the sync and async pools.
+
+    A member whose calls fail ``failure_threshold`` times in a row with 429,
+    5xx or a transport error is taken out of rotation for ``cooldown``
+    seconds. When it comes back, a single further failure ejects it again
+    until a call succeeds. If every member is out, the one that comes back
+    soonest is used rather than failing outright.
+    """
+
+    def __init__(self, members: Iterable[Union[str, PoolMember]], strategy: str,
+                 failure_threshold: int, cooldown: float,
+                 limits: Optional[Dict[str, Tuple[float, int]]], client_class: type,
+                 client_options: Dict[str, Any]):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"strategy must be one of {STRATEGIES}")
+        members = [PoolMember(m) if isinstance(m, str) else m for m in members]
+        if not members:
+            raise ValueError("a pool needs at least one member")
+        self.strategy = strategy
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._members = [
+            _MemberState(member, client_class(
+                member.token, base_url=member.base_url,
+                rate_limiter=RateLimiter.for_token(member.token, limits), **client_options))
+            for member in members]
+        self._next = 0
+        self._lock = threading.Lock()
+
+    @property
+    def clients(self) -> List[_WitAIBase]:
+        return [state.client for state in self._members]
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-member request, failure and ejection counts, load and health."""
+        now = time.monotonic()
+        with self._lock:
+            return {state.member.name or f"member{i}": {
+                        **state.stats, "in_flight": state.in_flight,
+                        "healthy": state.down_until <= now}
+                    for i, state in enumerate(self._members)}
+
+    def _acquire(self, tried: List[_MemberState]) -> _MemberState:
+        with self._lock:
+            now = time.monotonic()
+            count = len(self._members)
+            order = [self._members[(self._next + i) % count] for i in range(count)]
+            order = [state for state in order if state not in tried]
+            candidates = [state for state in order if state.down_until <= now]
+            if not candidates:
+                candidates = [min(order, key=lambda state: state.down_until)]
+            if self.strategy == "least_loaded":
+                chosen = min(candidates, key=lambda state: state.in_flight)
+            else:
+                chosen = candidates[0]
+            self._next = (self._members.index(chosen) + 1) % count
+            chosen.in_flight += 1
+            chosen.stats["requests"] += 1
+            return chosen
+
+    def _release(self, state: _MemberState, error: Optional[BaseException],
+                 failover: bool) -> None:
+        with self._lock:
+            state.in_flight -= 1
+            if error is None:
+                state.failures = 0
+            elif failover:
+                state.failures += 1
+                state.stats["failures"] += 1
+                now = time.monotonic()
+                if state.failures >= self.failure_threshold and state.down_until <= now:
+                    state.down_until = now + self.cooldown
+                    state.stats["ejections"] += 1
+
+    @staticmethod
+    def _fails_over(state: _MemberState, error: BaseException) -> bool:
+        """Whether an error reflects the member's health (429, 5xx, transport)."""
+        if isinstance(error, DeadlineExceeded):
+            return False  # The caller's time is spent; another member cannot help
+        status = _status(error)
+        if status is not None:
+            return status == 429 or status >= 500
+        return isinstance(error, state.client._transient_errors)
+
+
+class WitAIPool(_PoolBase):
+    """Spread /message and /language traffic over several tokens or apps.
+
+    ``members`` are tokens or ``PoolMember``s. Routing is ``round_robin`` or
+    ``least_loaded`` (fewest calls in flight, including ones waiting on the
+    rate limiter). Each member gets its own ``WitAI`` and per-token
+    ``RateLimiter`` (``limits`` as in ``RateLimiter``); other keyword
+    arguments such as ``retry_policy``, ``timeout`` or ``cache`` are passed to
+    every client. A call failing with 429, 5xx or a transport error is
+    retried on the next member.
+    """
+
+    def __init__(self, members: Iterable[Union[str, PoolMember]],
+                 strategy: str = "round_robin", failure_threshold: int = 3,
+                 cooldown: float = 30.0,
+                 limits: Optional[Dict[str, Tuple[float, int]]] = None, **client_options):
+        super().__init__(members, strategy, failure_threshold, cooldown, limits, WitAI,
+                         client_options)
+
+    def _call(self, method: str, *args, **kwargs) -> Any:
+        tried: List[_MemberState] = []
+        while True:
+            state = self._acquire(tried)
+            try:
+                result = getattr(state.client, method)(*args, **kwargs)
+            except Exception as e:
+                failover = self._fails_over(state, e)
+                self._release(state, e, failover)
+                tried.append(state)
+                if not failover or len(tried) == len(self._members):
+                    raise
+                continue
+            self._release(state, None, False)
+            return result
+
+    def get_message_meaning(self, query: str, **kwargs) -> Any:
+        """Return the meaning of a sentence from the next member's app."""
+        return self._call("get_message_meaning", query, **kwargs)
+
+    def detect_language(self, text: str, **kwargs) -> Any:
+        """Retrieve the language of a text message through the next member."""
+        return self._call("detect_language", text, **kwargs)
+
+    # The batch helpers only rely on get_message_meaning, so share WitAI's.
+    _batch_item = WitAI._batch_item
+    iter_message_meanings = WitAI.iter_message_meanings
+    get_message_meanings = WitAI.get_message_meanings
+
+    def close(self) -> None:
+        for client in self.clients:
+            client.close()
+
+    def __enter__(self) -> "WitAIPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class AsyncWitAIPool(_PoolBase):
+    """asyncio counterpart of ``WitAIPool`` built on ``AsyncWitAI`` clients."""
+
+    def __init__(self, members: Iterable[Union[str, PoolMember]],
+                 strategy: str = "round_robin", failure_threshold: int = 3,
+                 cooldown: float = 30.0,
+                 limits: Optional[Dict[str, Tuple[float, int]]] = None, **client_options):
+        super().__init__(members, strategy, failure_threshold, cooldown, limits, AsyncWitAI,
+                         client_options)
+
+    async def _call(self, method: str, *args, **kwargs) -> Any:
+        tried: List[_MemberState] = []
+        while True:
+            state = self._acquire(tried)
+            try:
+                result = await getattr(state.client, method)(*args, **kwargs)
+            except Exception as e:
+                failover = self._fails_over(state, e)
+                self._release(state, e, failover)
+                tried.append(state)
+                if not failover or len(tried) == len(self._members):
+                    raise
+                continue
+            self._release(state, None, False)
+            return result
+
+    async def get_message_meaning(self, query: str, **kwargs) -> Any:
+        """Return the meaning of a sentence from the next member's app."""
+        return await self._call("get_message_meaning", query, **kwargs)
+
+    async def detect_language(self, text: str, **kwargs) -> Any:
+        """Retrieve the language of a text message through the next member."""
+        return await self._call("detect_language", text, **kwargs)
+
+    _batch_item = AsyncWitAI._batch_item
+    iter_message_meanings = AsyncWitAI.iter_message_meanings
+    get_message_meanings = AsyncWitAI.get_message_meanings
+
+    async def close(self) -> None:
+        for client in self.clients:
+            await client.close()
+
+    async def __aenter__(self) -> "AsyncWitAIPool":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
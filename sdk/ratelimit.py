@@ -0,0 +1,157 @@
+# ratelimit.py
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+# Requests per second and burst size per endpoint family. Wit.ai enforces its
+# limits per token, so these are deliberately conservative; tune per app.
+DEFAULT_LIMITS: Dict[str, Tuple[float, int]] = {
+    "message": (4.0, 4),      # /message, /language
+    "speech": (1.0, 2),       # /speech, /synthesize
+    "management": (1.0, 1),   # intents, entities, keywords, apps, utterances
+}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the delay in seconds from a Retry-After header, if any."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Thread-safe token bucket whose rate backs off on 429 responses.
+
+    Callers reserve a token and sleep for the returned delay outside the lock,
+    so the same bucket can be shared by threads and asyncio tasks. A 429
+    pauses every caller until its ``Retry-After`` has passed and halves the
+    rate (down to ``min_rate``), at most once per pause, so a wave of 429s
+    from concurrent calls counts as one. The rate recovers additively on
+    successful calls, never exceeding the configured ``rate``.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, min_rate: Optional[float] = None):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate if min_rate is not None else rate / 16
+        self.throttled = 0
+        self._tokens = float(burst)
+        self._updated = time.monotonic()  # In the future while paused
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        # No tokens accrue during a pause.
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            wait = max(0.0, self._updated - now)
+            return wait if self._tokens >= 0 else wait - self._tokens / self.rate
+
+    def pause_left(self) -> float:
+        """Seconds until the current 429 pause ends (0 when not paused)."""
+        with self._lock:
+            return max(0.0, self._updated - time.monotonic())
+
+    def acquire(self) -> None:
+        delay = self.reserve()
+        # A 429 may arrive while waiting; hold on until its pause is over too.
+        while delay > 0:
+            time.sleep(delay)
+            delay = self.pause_left()
+
+    async def acquire_async(self) -> None:
+        delay = self.reserve()
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = self.pause_left()
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """Slow down after a 429 and hold every caller until ``retry_after`` has passed."""
+        with self._lock:
+            self.throttled += 1
+            now = time.monotonic()
+            self._refill(now)
+            if now >= self._updated:
+                # First 429 since the last pause ended: back off once.
+                self.rate = max(self.min_rate, self.rate / 2)
+            pause = retry_after if retry_after is not None else 1 / self.rate
+            if now + pause > self._updated:
+                # One call may go as soon as the pause ends, the rest follow
+                # at the reduced rate; earlier reservations re-check the pause.
+                self._updated = now + pause
+                self._tokens = 1.0
+
+    def on_success(self) -> None:
+        if self.rate < self.max_rate:
+            with self._lock:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+class RateLimiter:
+    """Per-token set of token buckets, one per endpoint family.
+
+    Use ``RateLimiter.for_token(token)`` so that every client in the process
+    using the same token shares one set of buckets.
+    """
+    _shared: Dict[str, "RateLimiter"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, int]]] = None):
+        limits = limits if limits is not None else DEFAULT_LIMITS
+        self.limits = dict(limits)
+        self.buckets = {family: TokenBucket(rate, burst)
+                        for family, (rate, burst) in limits.items()}
+
+    @classmethod
+    def for_token(cls, token: str,
+                  limits: Optional[Dict[str, Tuple[float, int]]] = None) -> "RateLimiter":
+        """Return the process-wide limiter for ``token``, creating it on first use.
+
+        Raises ``ValueError`` if ``limits`` differ from those the existing
+        limiter for ``token`` was created with.
+        """
+        with cls._shared_lock:
+            limiter = cls._shared.get(token)
+            if limiter is None:
+                limiter = cls._shared[token] = cls(limits)
+            elif limits is not None and dict(limits) != limiter.limits:
+                raise ValueError(f"a rate limiter with limits {limiter.limits} already "
+                                 "exists for this token")
+            return limiter
+
+    def acquire(self, family: str) -> None:
+        bucket = self.buckets.get(family)
+        if bucket is not None:
+            bucket.acquire()
+
+    async def acquire_async(self, family: str) -> None:
+        bucket = self.buckets.get(family)
+        if bucket is not None:
+            await bucket.acquire_async()
+
+    def on_throttle(self, family: str, retry_after: Optional[float] = None) -> None:
+        bucket = self.buckets.get(family)
+        if bucket is not None:
+            bucket.on_throttle(retry_after)
+
+    def on_success(self, family: str) -> None:
+        bucket = self.buckets.get(family)
+        if bucket is not None:
+            bucket.on_success()
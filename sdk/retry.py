@@ -0,0 +1,105 @@
+# retry.py
+import random
+import threading
+import time
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple, Type
+
+# Statuses worth retrying at all, and the subset that means the request was
+# rejected before being processed, which makes even a POST safe to repeat.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+UNPROCESSED_STATUSES = frozenset({429, 503})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT"})
+
+
+class RetryBudget:
+    """Caps retries to a fraction of traffic so retries cannot amplify an outage.
+
+    Every first attempt deposits ``ratio`` tokens and every retry withdraws
+    one; ``min_per_second`` tokens trickle in so low-traffic clients can still
+    retry. Share one budget between clients to make it global.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 1.0,
+                 max_tokens: float = 100.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, amount: float) -> None:
+        now = time.monotonic()
+        amount += (now - self._updated) * self.min_per_second
+        self._tokens = min(self.max_tokens, self._tokens + amount)
+        self._updated = now
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._refill(self.ratio)
+
+    def withdraw(self) -> bool:
+        """Take one retry token; returns False when the budget is exhausted."""
+        with self._lock:
+            self._refill(0.0)
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class RetryPolicy:
+    """Which failures to retry and how long to back off between attempts.
+
+    Delays grow as ``backoff_base * 2 ** (attempt - 1)`` up to ``backoff_max``
+    with full jitter; a ``Retry-After`` header takes precedence. Non-idempotent
+    requests are only retried when the server did not process them (see
+    ``UNPROCESSED_STATUSES``) or the connection was never established.
+    ``retry_exceptions`` overrides the transport errors the client treats as
+    transient. Counters in ``stats`` report what happened.
+    """
+
+    def __init__(self, max_attempts: int = 3, backoff_base: float = 0.5,
+                 backoff_max: float = 30.0, jitter: bool = True,
+                 retry_statuses: Iterable[int] = RETRY_STATUSES,
+                 retry_exceptions: Optional[Tuple[Type[BaseException], ...]] = None,
+                 budget: Optional[RetryBudget] = None):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.retry_statuses: FrozenSet[int] = frozenset(retry_statuses)
+        self.retry_exceptions = retry_exceptions
+        self.budget = budget if budget is not None else RetryBudget()
+        self.stats: Dict[str, int] = {"requests": 0, "retries": 0,
+                                      "budget_exhausted": 0, "gave_up": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def start(self) -> None:
+        """Record a new logical request."""
+        self._count("requests")
+        self.budget.deposit()
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def delay(self, attempt: int, retryable: bool,
+              retry_after: Optional[float] = None) -> Optional[float]:
+        """Return the wait before the next attempt, or None to give up."""
+        if not retryable:
+            return None
+        if attempt >= self.max_attempts:
+            self._count("gave_up")
+            return None
+        if not self.budget.withdraw():
+            self._count("budget_exhausted")
+            return None
+        self._count("retries")
+        return self.backoff(attempt, retry_after)
@@ -1,11 +1,11 @@
 # sample.py
 import os
-import time
 
 import requests
 from dotenv import load_dotenv
 
-from witai_sdk import WitAI
+from sdk.ratelimit import RateLimiter
+from sdk.witai_sdk import WitAI
 
 # Load environment variables from .env file
 load_dotenv()
@@ -13,8 +13,8 @@ load_dotenv()
 # Replace with your actual server access token from environment variable
 TOKEN = os.getenv("WITAI_ACCESS_TOKEN")
 
-# Initialize WitAI client
-wit = WitAI(TOKEN)
+# Initialize WitAI client; the shared per-token limiter paces every call
+wit = WitAI(TOKEN, rate_limiter=RateLimiter.for_token(TOKEN))
 
 
 def main():
@@ -46,7 +46,7 @@ def main():
     print("\n4. Synthesizing speech:")
     try:
         audio_data = wit.synthesize_speech("Hello, this is a test!", "wit$Rebecca")
-        with open("../output.raw", "wb") as f:
+        with open("output.raw", "wb") as f:
             f.write(audio_data)
         print("Audio saved to 'output.raw'")
     except requests.exceptions.RequestException as e:
@@ -80,7 +80,6 @@ def main():
     #     try:
     #         wit.delete_intent(intent['name'])
     #         print(f"Deleted intent: {intent['name']}")
-    #         time.sleep(0.5)  # Delay to respect rate limits
     #     except requests.exceptions.HTTPError as e:
     #         print(f"Failed to delete intent {intent['name']}: {e}")
     # print("Finished deleting all intents.")
@@ -149,7 +148,6 @@ def main():
     # wit.create_intent("test_intent")  # Ensure intent exists
     # uploaded = wit.upload_utterances(sample_utterances)
     # print(uploaded)
-    # time.sleep(2)  # Wait for processing
     #
     # print("\n24. Deleting all utterances:")
     # deleted_utterances = wit.delete_all_utterances()
@@ -0,0 +1,308 @@
+# schema.py
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .cache import normalize_query
+
+
+def _keyword_texts(info: Dict) -> Iterable[Tuple[str, str]]:
+    """(normalised keyword or synonym, canonical keyword) pairs of an entity."""
+    for keyword in info.get("keywords") or []:
+        for text in [keyword["keyword"], *(keyword.get("synonyms") or [])]:
+            yield normalize_query(text), keyword["keyword"]
+
+
+class _SchemaBase:
+    """In-process copy of an app's intents, entities, roles and keywords.
+
+    ``load()`` lists intents and entities and fetches every entity with
+    ``get_entity_info`` concurrently (``concurrency`` at a time). Lookups
+    are then dict reads with no HTTP call. Writes made through the client
+    (creating or deleting intents and entities, updating entities, adding or
+    deleting keywords) are applied as soon as they succeed. An entity whose
+    new state the response does not show is re-fetched in the background.
+    Every ``refresh_interval`` seconds (if set) the whole schema is
+    reloaded, to pick up changes made elsewhere. Background failures keep
+    the previous copy and are counted in ``stats``, with the error in
+    ``last_error``.
+    """
+
+    def __init__(self, client: Any, refresh_interval: Optional[float], concurrency: int):
+        self.client = client
+        self.refresh_interval = refresh_interval
+        self.concurrency = concurrency
+        self.intents: Dict[str, Dict] = {}
+        self.entities: Dict[str, Dict] = {}
+        self.loaded = False
+        self.last_error: Optional[BaseException] = None
+        self.stats: Dict[str, int] = {"loads": 0, "entity_fetches": 0, "local_updates": 0,
+                                      "errors": 0}
+        self._keywords: Dict[str, Dict[str, str]] = {}  # Text -> {entity: keyword}
+        self._stale: Set[str] = set()  # Entities to re-fetch
+        self._replay: Optional[List[Tuple[str, str, Any]]] = None  # Writes during a load
+        self._closed = False
+        self._lock = threading.Lock()
+        client.schema = self
+
+    # Lookups
+    def has_intent(self, name: str) -> bool:
+        return name in self.intents
+
+    def has_entity(self, name: str) -> bool:
+        return name in self.entities
+
+    def roles(self, entity: str) -> List[str]:
+        """Role names of an entity (empty if unknown)."""
+        info = self.entities.get(entity)
+        if info is None:
+            return []
+        return [r["name"] if isinstance(r, dict) else r for r in info.get("roles") or []]
+
+    def keyword_entities(self, text: str) -> Dict[str, str]:
+        """Entities having ``text`` as a keyword or synonym (case and whitespace
+        folded), mapped to the canonical keyword."""
+        return dict(self._keywords.get(normalize_query(text), {}))
+
+    # Maintenance
+    def _index(self, info: Dict) -> None:
+        name = info["name"]
+        self.entities[name] = info
+        for text, keyword in _keyword_texts(info):
+            self._keywords.setdefault(text, {})[name] = keyword
+
+    def _unindex(self, name: str) -> None:
+        info = self.entities.pop(name, None)
+        for text, _ in _keyword_texts(info or {}):
+            matches = self._keywords.get(text)
+            if matches is not None:
+                matches.pop(name, None)
+                if not matches:
+                    del self._keywords[text]
+
+    def _install(self, intents: Iterable[Dict], entities: Iterable[Dict]) -> None:
+        """Replace the schema with a fresh load, then re-apply writes made meanwhile."""
+        # Build the new copy aside and swap it in, so lookups never see it half-built.
+        entities = {info["name"]: info for info in entities}
+        keywords: Dict[str, Dict[str, str]] = {}
+        for name, info in entities.items():
+            for text, keyword in _keyword_texts(info):
+                keywords.setdefault(text, {})[name] = keyword
+        with self._lock:
+            self.intents = {intent["name"]: intent for intent in intents}
+            self.entities, self._keywords = entities, keywords
+            for write in self._replay or ():
+                self._apply(*write)
+            self.loaded = True
+            self.stats["loads"] += 1
+
+    @contextmanager
+    def _loading(self) -> Iterator[None]:
+        """Record writes made while a load is in flight, to replay on top of it."""
+        with self._lock:
+            self._replay = []
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._replay = None
+
+    def _apply(self, method: str, path: str, body: Any) -> None:
+        parts = path.strip("/").split("/")
+        name = parts[1] if len(parts) > 1 else None
+        if parts[0] == "intents":
+            if method == "POST":
+                self.intents[body["name"]] = body
+            elif method == "DELETE":
+                self.intents.pop(name, None)
+        elif parts[0] == "entities":
+            if method == "DELETE" and len(parts) == 2:
+                self._unindex(name)
+            elif isinstance(body, dict) and "roles" in body:
+                # Wit.ai answers other entity writes with the updated entity.
+                if name is not None:
+                    self._unindex(name)  # It may have been renamed
+                self._unindex(body["name"])
+                self._index(body)
+            elif name is not None:
+                self._stale.add(name)
+        self.stats["local_updates"] += 1
+
+    def changed(self, method: str, path: str, body: Any) -> bool:
+        """Apply a successful write; called by the client. Returns True when
+        an entity must be re-fetched."""
+        with self._lock:
+            if self._replay is not None:
+                self._replay.append((method, path, body))
+            self._apply(method, path, body)
+            return bool(self._stale)
+
+    def _take_stale(self) -> List[str]:
+        with self._lock:
+            names, self._stale = sorted(self._stale), set()
+            return names
+
+    def _refreshed(self, name: str, info: Optional[Dict]) -> None:
+        with self._lock:
+            self._unindex(name)
+            if info is not None:
+                self._index(info)
+            self.stats["entity_fetches"] += 1
+
+    def _failed(self, error: BaseException) -> None:
+        with self._lock:
+            self.stats["errors"] += 1
+            self.last_error = error
+
+
+class SchemaCache(_SchemaBase):
+    """Cached schema of the app behind a ``WitAI`` client; see ``_SchemaBase``.
+
+    Call ``load()`` once before the first lookup; it also starts the
+    background refresh thread. ``close()`` stops the thread.
+    """
+
+    def __init__(self, client: Any, refresh_interval: Optional[float] = 300.0,
+                 concurrency: int = 8):
+        super().__init__(client, refresh_interval, concurrency)
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def load(self) -> "SchemaCache":
+        """Fetch the whole schema, replacing the cached copy."""
+        with self._loading(), ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            intents = pool.submit(self.client.get_intents)
+            names = [entity["name"] for entity in self.client.get_entities()]
+            entities = list(pool.map(self.client.get_entity_info, names))
+            self._install(intents.result(), entities)
+        if self._thread is None and not self._closed:
+            self._thread = threading.Thread(target=self._run, name="witai-schema",
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+    def refresh_stale(self) -> None:
+        """Re-fetch the entities whose changes could not be applied locally."""
+        for name in self._take_stale():
+            try:
+                info = self.client.get_entity_info(name)
+            except Exception as e:
+                if getattr(getattr(e, "response", None), "status_code", None) != 404:
+                    raise
+                info = None
+            self._refreshed(name, info)
+
+    def changed(self, method: str, path: str, body: Any) -> bool:
+        stale = super().changed(method, path, body)
+        if stale:
+            self._wake.set()
+        return stale
+
+    def _run(self) -> None:
+        while True:
+            woken = self._wake.wait(self.refresh_interval)
+            if self._closed:
+                return
+            self._wake.clear()
+            try:
+                if woken:
+                    self.refresh_stale()
+                else:
+                    self.load()
+            except Exception as e:
+                self._failed(e)
+
+    def close(self) -> None:
+        self._closed = True
+        self._wake.set()
+
+    def __enter__(self) -> "SchemaCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class AsyncSchemaCache(_SchemaBase):
+    """asyncio counterpart of ``SchemaCache`` for an ``AsyncWitAI`` client.
+
+    ``await load()`` starts the background refresh task on the running loop;
+    ``await close()`` cancels it.
+    """
+
+    def __init__(self, client: Any, refresh_interval: Optional[float] = 300.0,
+                 concurrency: int = 8):
+        super().__init__(client, refresh_interval, concurrency)
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def load(self) -> "AsyncSchemaCache":
+        """Fetch the whole schema, replacing the cached copy."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def entity_info(name):
+            async with semaphore:
+                return await self.client.get_entity_info(name)
+
+        with self._loading():
+            intents = asyncio.ensure_future(self.client.get_intents())
+            try:
+                names = [entity["name"] for entity in await self.client.get_entities()]
+                entities = await asyncio.gather(*(entity_info(name) for name in names))
+                self._install(await intents, entities)
+            finally:
+                intents.cancel()
+        if self._task is None and not self._closed:
+            self._wake = asyncio.Event()
+            self._task = asyncio.ensure_future(self._run())
+        return self
+
+    async def refresh_stale(self) -> None:
+        """Re-fetch the entities whose changes could not be applied locally."""
+        for name in self._take_stale():
+            try:
+                info = await self.client.get_entity_info(name)
+            except Exception as e:
+                if getattr(e, "status", None) != 404:
+                    raise
+                info = None
+            self._refreshed(name, info)
+
+    def changed(self, method: str, path: str, body: Any) -> bool:
+        stale = super().changed(method, path, body)
+        if stale and self._wake is not None:
+            self._wake.set()
+        return stale
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.refresh_interval)
+                woken = True
+            except asyncio.TimeoutError:
+                woken = False
+            self._wake.clear()
+            try:
+                if woken:
+                    await self.refresh_stale()
+                else:
+                    await self.load()
+            except Exception as e:
+                self._failed(e)
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def __aenter__(self) -> "AsyncSchemaCache":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
@@ -0,0 +1,63 @@
+# serializers.py
+import json
+from typing import Any, Type, TypeVar, Union
+
+T = TypeVar("T")
+
+
+class Serializer:
+    """JSON encoding and decoding used for request bodies, query parameters
+    and responses. This base implementation uses the standard library."""
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+    def decode(self, data: Union[bytes, str], model: Type[T]) -> T:
+        """Decode a response body straight into a typed result (see ``models``)."""
+        return model.from_json(self.loads(data))
+
+
+class OrjsonSerializer(Serializer):
+    """Serializer backed by ``orjson`` (installed separately)."""
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._dumps(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._loads(data)
+
+
+class MsgspecSerializer(Serializer):
+    """Serializer backed by ``msgspec`` (installed separately)."""
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._decoder.decode(data)
+
+
+def default_serializer() -> Serializer:
+    """The fastest available serializer: orjson, then msgspec, then ``json``."""
+    for serializer in (OrjsonSerializer, MsgspecSerializer):
+        try:
+            return serializer()
+        except ImportError:
+            continue
+    return Serializer()
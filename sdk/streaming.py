@@ -0,0 +1,122 @@
+# streaming.py
+import json
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+_OPEN = (ord("{"), ord("["))
+_CLOSE = (ord("}"), ord("]"))
+_QUOTE = ord('"')
+_BACKSLASH = ord("\\")
+_WHITESPACE = frozenset(b" \t\r\n")
+
+
+class JSONStreamParser:
+    """Incrementally split a byte stream of concatenated JSON values.
+
+    /speech answers with a sequence of JSON objects (partial and final
+    transcriptions, then the understanding) rather than one document. Feed
+    response chunks as they arrive and complete objects are returned as soon
+    as their closing brace is seen. Only structural ASCII bytes are inspected,
+    so multi-byte UTF-8 split across chunks is handled correctly.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._pos = 0  # Next byte to scan
+        self._start = None  # Start of the value being scanned
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Add a chunk and return every value it completed."""
+        self._buffer += chunk
+        values = []
+        buffer = self._buffer
+        pos = self._pos
+        while pos < len(buffer):
+            byte = buffer[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif byte == _BACKSLASH:
+                    self._escape = True
+                elif byte == _QUOTE:
+                    self._in_string = False
+            elif self._depth == 0 and byte not in _OPEN:
+                # Only whitespace may separate values.
+                if byte not in _WHITESPACE:
+                    raise ValueError(f"unexpected data between JSON values: "
+                                     f"{bytes(buffer[pos:pos + 20])!r}")
+            elif byte == _QUOTE:
+                self._in_string = True
+            elif byte in _OPEN:
+                if self._depth == 0:
+                    self._start = pos
+                self._depth += 1
+            elif byte in _CLOSE:
+                self._depth -= 1
+                if self._depth == 0:
+                    values.append(json.loads(bytes(buffer[self._start:pos + 1])))
+                    self._start = None
+            pos += 1
+        # Drop consumed bytes so memory stays bounded by the current value.
+        keep = self._start if self._start is not None else pos
+        del buffer[:keep]
+        self._pos = pos - keep
+        if self._start is not None:
+            self._start = 0
+        return values
+
+    def close(self) -> None:
+        """Check that the stream did not end in the middle of a value."""
+        if self._depth or self._buffer.strip():
+            raise ValueError("incomplete JSON value at end of stream")
+
+
+def parse_json_stream(body: bytes) -> List[Any]:
+    """Split a complete body of concatenated JSON values."""
+    parser = JSONStreamParser()
+    values = parser.feed(body)
+    parser.close()
+    return values
+
+
+def is_final(event: Dict) -> bool:
+    """Whether a /speech event is final (transcription or understanding)."""
+    if "is_final" in event:
+        return bool(event["is_final"])
+    return str(event.get("type", "")).startswith("FINAL")
+
+
+def iter_json_stream(chunks: Iterator[bytes]) -> Iterator[Any]:
+    parser = JSONStreamParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    parser.close()
+
+
+@dataclass
+class SynthesisStats:
+    """Size and timing of one streamed /synthesize call, in bytes and seconds."""
+    bytes: int = 0
+    ttfb: Optional[float] = None  # From sending the request to the first audio byte
+    total: Optional[float] = None  # From sending the request to the last audio byte
+
+
+@contextmanager
+def open_sink(sink: Any) -> Iterator[Callable[[bytes], Any]]:
+    """Return a write function for a path, socket, file-like object or callable."""
+    if isinstance(sink, (str, os.PathLike)):
+        with open(sink, "wb") as f:
+            yield f.write
+    elif hasattr(sink, "sendall"):
+        yield sink.sendall
+    elif hasattr(sink, "write"):
+        yield sink.write
+    elif callable(sink):
+        yield sink
+    else:
+        raise TypeError(f"unsupported audio sink: {type(sink).__name__}")
@@ -0,0 +1,224 @@
+# sync.py
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .training import TrainingUploader
+from .witai_sdk import WitAI
+
+
+def _utterance_signature(utterance: Dict) -> Tuple:
+    """Comparable form of an utterance, whether uploaded or returned by the API."""
+    intent = utterance.get("intent")
+    if isinstance(intent, dict):
+        intent = intent.get("name")
+    entities = tuple(sorted((e.get("entity"), e.get("start"), e.get("end"), e.get("body"))
+                            for e in utterance.get("entities") or []))
+    traits = tuple(sorted((t.get("trait"), str(t.get("value")))
+                          for t in utterance.get("traits") or []))
+    return intent, entities, traits
+
+
+def _role_names(entity: Dict) -> List[str]:
+    return [r["name"] if isinstance(r, dict) else r for r in entity.get("roles") or []]
+
+
+def _entity_differs(desired: Dict, current: Dict) -> bool:
+    """Whether any field set in the desired entity differs from ``get_entity_info``."""
+    def keywords(entity):
+        return sorted((k["keyword"], sorted(k.get("synonyms") or []))
+                      for k in entity.get("keywords") or [])
+
+    return (("roles" in desired and sorted(_role_names(desired)) != sorted(_role_names(current)))
+            or ("lookups" in desired
+                and sorted(desired["lookups"]) != sorted(current.get("lookups") or []))
+            or ("keywords" in desired and keywords(desired) != keywords(current)))
+
+
+def _entity_update(desired: Dict, current: Dict) -> Dict:
+    """The desired entity with the fields it leaves out kept from ``current``,
+    since ``update_entity`` replaces the whole entity."""
+    entity = {"name": desired["name"], "roles": _role_names(current)}
+    for key in ("lookups", "keywords"):
+        if current.get(key):
+            entity[key] = current[key]
+    entity.update(desired)
+    return entity
+
+
+@dataclass
+class AppState:
+    """Intents, entities and utterances of an app, keyed by name or text.
+
+    Entities are ``create_entity``-style dicts (name, roles, lookups,
+    keywords); utterances are ``upload_utterances``-style dicts.
+    """
+    intents: Set[str] = field(default_factory=set)
+    entities: Dict[str, Dict] = field(default_factory=dict)
+    utterances: Dict[str, Dict] = field(default_factory=dict)
+
+    @classmethod
+    def from_utterances(cls, utterances: Iterable[Dict],
+                        entities: Iterable[Dict] = ()) -> "AppState":
+        """Desired state from a training set; intents are taken from the utterances."""
+        state = cls(entities={entity["name"]: entity for entity in entities})
+        for utterance in utterances:
+            state.utterances[utterance["text"]] = utterance
+            if utterance.get("intent"):
+                state.intents.add(utterance["intent"])
+        return state
+
+
+def fetch_state(wit: WitAI, entity_names: Iterable[str] = (), page_size: int = 1000,
+                concurrency: int = 4) -> AppState:
+    """Read the app's current state.
+
+    Only the entities in ``entity_names`` are expanded with
+    ``get_entity_info`` (concurrently); the rest are listed by name only,
+    which is all a diff needs to delete them.
+    """
+    state = AppState(intents={intent["name"] for intent in wit.get_intents()})
+    existing = {entity["name"] for entity in wit.get_entities()}
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        wanted = sorted(existing.intersection(entity_names))
+        for name, info in zip(wanted, pool.map(wit.get_entity_info, wanted)):
+            state.entities[name] = info
+    for name in existing.difference(state.entities):
+        state.entities[name] = {"name": name}
+    for utterance in wit.iter_utterances(page_size):
+        state.utterances[utterance["text"]] = utterance
+    return state
+
+
+@dataclass
+class SyncPlan:
+    create_intents: List[str] = field(default_factory=list)
+    delete_intents: List[str] = field(default_factory=list)
+    create_entities: List[Dict] = field(default_factory=list)
+    update_entities: List[Dict] = field(default_factory=list)
+    delete_entities: List[str] = field(default_factory=list)
+    upload_utterances: List[Dict] = field(default_factory=list)  # New or changed
+    delete_utterances: List[str] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        return not any(vars(self).values())
+
+    def describe(self) -> List[str]:
+        """Human-readable lines for a dry run."""
+        lines = [f"+ intent {name}" for name in self.create_intents]
+        lines += [f"+ entity {entity['name']}" for entity in self.create_entities]
+        lines += [f"~ entity {entity['name']}" for entity in self.update_entities]
+        lines += [f"+ utterance {u['text']!r} -> {u.get('intent')}"
+                  for u in self.upload_utterances]
+        lines += [f"- utterance {text!r}" for text in self.delete_utterances]
+        lines += [f"- entity {name}" for name in self.delete_entities]
+        lines += [f"- intent {name}" for name in self.delete_intents]
+        return lines or ["App is already in sync."]
+
+
+def plan_sync(current: AppState, desired: AppState, prune: bool = True,
+              prune_entities: bool = False) -> SyncPlan:
+    """Compute the minimal set of changes turning ``current`` into ``desired``.
+
+    With ``prune=False`` nothing is deleted. Entities missing from
+    ``desired`` are only deleted with ``prune_entities=True``, as a training
+    set usually lists none of them; built-in ``wit$`` entities never are.
+    """
+    plan = SyncPlan()
+    plan.create_intents = sorted(desired.intents - current.intents)
+    for name, entity in sorted(desired.entities.items()):
+        if name not in current.entities:
+            plan.create_entities.append(entity)
+        elif _entity_differs(entity, current.entities[name]):
+            plan.update_entities.append(_entity_update(entity, current.entities[name]))
+    for text, utterance in desired.utterances.items():
+        existing = current.utterances.get(text)
+        if existing is None or _utterance_signature(utterance) != _utterance_signature(existing):
+            plan.upload_utterances.append(utterance)
+    if prune:
+        plan.delete_utterances = sorted(set(current.utterances) - set(desired.utterances))
+        if prune_entities:
+            plan.delete_entities = sorted(name for name in current.entities
+                                          if name not in desired.entities
+                                          and not name.startswith("wit$"))
+        plan.delete_intents = sorted(current.intents - desired.intents)
+    return plan
+
+
+@dataclass
+class SyncReport:
+    applied: int = 0  # Intents, entities and utterances changed
+    failures: List[Tuple[str, str, BaseException]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+
+def apply_sync(wit: WitAI, plan: SyncPlan, concurrency: int = 4) -> SyncReport:
+    """Apply a plan concurrently, in dependency order.
+
+    Intents and entities are created or updated first, then utterances are
+    uploaded and deleted, and finally unused entities and intents are removed.
+    Failures are collected per item; a phase runs even if earlier items failed.
+    """
+    report = SyncReport()
+
+    def run_phase(action: str, fn: Callable, items: List, label: Callable,
+                  weight: Callable = lambda item: 1) -> None:
+        def run(item):
+            try:
+                fn(item)
+                return None
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for item, error in zip(items, pool.map(run, items)):
+                if error is None:
+                    report.applied += weight(item)
+                else:
+                    report.failures.append((action, label(item), error))
+
+    run_phase("create_intent", wit.create_intent, plan.create_intents, str)
+    run_phase("create_entity", lambda e: wit.create_entity(
+        e["name"], e.get("roles", []), e.get("lookups"), e.get("keywords")),
+        plan.create_entities, lambda e: e["name"])
+    run_phase("update_entity", lambda e: wit.update_entity(
+        e["name"], e["name"], e.get("roles", []), e.get("lookups"), e.get("keywords")),
+        plan.update_entities, lambda e: e["name"])
+
+    upload = TrainingUploader(wit, concurrency=concurrency).run(plan.upload_utterances)
+    report.applied += upload.uploaded
+    for failure in upload.failures:
+        report.failures.append(("upload_utterances", f"batch {failure.index}", failure.error))
+
+    for action, bulk in (("delete_utterance", lambda: wit.delete_utterances_bulk(
+                              plan.delete_utterances, concurrency=concurrency)),
+                         ("delete_entity", lambda: wit.delete_entities(
+                              plan.delete_entities, concurrency)),
+                         ("delete_intent", lambda: wit.delete_intents(
+                              plan.delete_intents, concurrency))):
+        result = bulk()
+        report.applied += len(result.succeeded)
+        report.failures.extend((action, name, error) for name, error in result.failed)
+    return report
+
+
+def sync_app(wit: WitAI, desired: AppState, dry_run: bool = False, prune: bool = True,
+             prune_entities: bool = False, concurrency: int = 4,
+             out: Optional[Callable[[str], None]] = print
+             ) -> Tuple[SyncPlan, Optional[SyncReport]]:
+    """Fetch, diff and (unless ``dry_run``) apply; the plan is written to ``out``.
+
+    See ``plan_sync`` for ``prune`` and ``prune_entities``.
+    """
+    current = fetch_state(wit, desired.entities, concurrency=concurrency)
+    plan = plan_sync(current, desired, prune, prune_entities)
+    if out is not None:
+        for line in plan.describe():
+            out(line)
+    if dry_run or plan.empty:
+        return plan, None
+    return plan, apply_sync(wit, plan, concurrency)
@@ -0,0 +1,134 @@
+# training.py
+import hashlib
+import itertools
+import json
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .witai_sdk import MAX_UTTERANCES_PER_REQUEST, WitAI
+
+
+def batch_id(batch: List[Dict]) -> str:
+    """Stable identity of a batch, so a resumed run recognises finished work."""
+    payload = json.dumps(batch, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def iter_batches(utterances: Iterable[Dict], batch_size: int) -> Iterator[List[Dict]]:
+    iterator = iter(utterances)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+class UploadJournal:
+    """Append-only record of uploaded batches, one JSON line per batch."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.completed: Set[str] = set()
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        self.completed.add(json.loads(line)["batch"])
+
+    def __contains__(self, batch: str) -> bool:
+        return batch in self.completed
+
+    def record(self, batch: str, size: int) -> None:
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(json.dumps({"batch": batch, "n": size}) + "\n")
+            self.completed.add(batch)
+
+
+@dataclass
+class BatchFailure:
+    index: int
+    size: int
+    error: BaseException
+
+
+@dataclass
+class UploadReport:
+    batches: int = 0
+    uploaded: int = 0  # Utterances uploaded in this run
+    skipped: int = 0  # Utterances in batches already recorded in the journal
+    failures: List[BatchFailure] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+
+class TrainingUploader:
+    """Upload a training set in parallel batches, resuming from a journal.
+
+    Batches of up to ``batch_size`` utterances are uploaded with at most
+    ``concurrency`` requests in flight. Pacing and retries come from the
+    client's ``rate_limiter`` and ``retry_policy``. Successful batches are
+    recorded in the ``journal_path`` file so an interrupted run skips them
+    when restarted. A failed batch is reported and the run continues.
+    ``utterances`` is consumed lazily, so uploading can start while the
+    dataset is still being read.
+    """
+
+    def __init__(self, wit: WitAI, batch_size: int = MAX_UTTERANCES_PER_REQUEST,
+                 concurrency: int = 4, journal_path: Optional[str] = None,
+                 on_batch: Optional[Callable[[int, int, Optional[BaseException]], None]] = None):
+        if not 0 < batch_size <= MAX_UTTERANCES_PER_REQUEST:
+            raise ValueError(f"batch_size must be between 1 and {MAX_UTTERANCES_PER_REQUEST}")
+        self.wit = wit
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.journal = UploadJournal(journal_path) if journal_path else None
+        self.on_batch = on_batch
+
+    def _upload(self, index: int, batch: List[Dict],
+                identity: str) -> Tuple[int, Optional[BatchFailure]]:
+        try:
+            self.wit.upload_utterances(batch)
+        except Exception as e:
+            failure = BatchFailure(index, len(batch), e)
+        else:
+            failure = None
+            if self.journal is not None:
+                self.journal.record(identity, len(batch))
+        if self.on_batch is not None:
+            self.on_batch(index, len(batch), failure.error if failure else None)
+        return len(batch), failure
+
+    def run(self, utterances: Iterable[Dict]) -> UploadReport:
+        report = UploadReport()
+
+        def collect(done) -> None:
+            for future in done:
+                size, failure = future.result()
+                if failure is not None:
+                    report.failures.append(failure)
+                else:
+                    report.uploaded += size
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            pending = set()
+            for index, batch in enumerate(iter_batches(utterances, self.batch_size)):
+                report.batches += 1
+                identity = batch_id(batch)
+                if self.journal is not None and identity in self.journal:
+                    report.skipped += len(batch)
+                    continue
+                if len(pending) >= self.concurrency:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                pending.add(pool.submit(self._upload, index, batch, identity))
+            collect(wait(pending).done)
+        report.failures.sort(key=lambda failure: failure.index)
+        return report
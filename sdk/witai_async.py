@@ -0,0 +1,696 @@
+# witai_async.py
+import asyncio
+import inspect
+import time
+from contextlib import contextmanager
+from typing import (Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List,
+                    Optional, Tuple, Union)
+
+import aiohttp
+
+from .audio import AudioPreprocessor
+from .audio_cache import AudioBuffer, AudioCache
+from .cache import CacheBackend
+from .deadline import DEFAULT_TIMEOUT, Deadline, Timeout
+from .hedging import HedgePolicy
+from .intent_index import IntentIndex
+from .metrics import Hook, RequestEvent
+from .models import IntentInfo, IntentList, LanguageResult, MessageResult
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .serializers import Serializer
+from .singleflight import AsyncSingleFlight
+from .streaming import JSONStreamParser, SynthesisStats, open_sink
+from .witai_sdk import (MAX_UTTERANCES_PER_REQUEST, AudioSource, BatchResult, BulkResult,
+                        WitRequest, _WitAIBase, _chunks, _content_length,
+                        _open_audio)
+
+
+async def _aiter_chunks(chunks: Iterable[bytes]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+def _client_timeout(deadline: Deadline,
+                    remaining: Optional[float] = None) -> aiohttp.ClientTimeout:
+    """Translate a ``Deadline`` into an aiohttp timeout for one attempt."""
+    connect, read = deadline.attempt(remaining)
+    return aiohttp.ClientTimeout(total=remaining, sock_connect=connect, sock_read=read)
+
+
+def _trace_config() -> aiohttp.TraceConfig:
+    """Record DNS and connect time on the ``RequestEvent`` passed as
+    ``trace_request_ctx``; connect time excludes DNS."""
+    config = aiohttp.TraceConfig()
+
+    async def dns_start(session, ctx, params):
+        ctx.dns_start = time.perf_counter()
+
+    async def dns_end(session, ctx, params):
+        if ctx.trace_request_ctx is not None:
+            ctx.trace_request_ctx.dns = time.perf_counter() - ctx.dns_start
+
+    async def connect_start(session, ctx, params):
+        ctx.connect_start = time.perf_counter()
+
+    async def connect_end(session, ctx, params):
+        event = ctx.trace_request_ctx
+        if event is not None:
+            event.connect = time.perf_counter() - ctx.connect_start - (event.dns or 0.0)
+
+    config.on_dns_resolvehost_start.append(dns_start)
+    config.on_dns_resolvehost_end.append(dns_end)
+    config.on_connection_create_start.append(connect_start)
+    config.on_connection_create_end.append(connect_end)
+    return config
+
+
+class AsyncWitAI(_WitAIBase):
+    def __init__(self, token: str, api_version: str = "20240304",
+                 base_url: str = "https://api.wit.ai",
+                 pool_size: int = 0, pool_maxsize: int = 100,
+                 timeout: Timeout = DEFAULT_TIMEOUT,
+                 session: Optional[aiohttp.ClientSession] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 cache: Optional[CacheBackend] = None, coalesce: bool = False,
+                 audio_cache: Optional[AudioCache] = None,
+                 hooks: Iterable[Hook] = (), serializer: Optional[Serializer] = None,
+                 intent_index: Optional[IntentIndex] = None,
+                 hedge: Optional[HedgePolicy] = None):
+        """Initialize the asyncio WitAI client with access token.
+
+        Calls share one ``aiohttp`` connection pool. ``pool_size`` caps the
+        total number of open connections (0 means unlimited) and
+        ``pool_maxsize`` caps connections per host; requests beyond the limit
+        wait for a free connection instead of failing. The session is created
+        lazily on first use so the client can be built outside an event loop.
+        ``rate_limiter`` can be shared with sync clients using the same token.
+        ``coalesce=True`` makes concurrent identical GETs share one upstream call.
+        ``audio_cache`` serves repeated ``synthesize_speech`` calls from disk.
+        ``hooks`` receive a ``RequestEvent`` after every call; DNS and connect
+        times are only measured if hooks are registered before the session
+        is created. ``serializer`` defaults to the fastest JSON library installed.
+        ``intent_index`` answers training phrases locally (see ``WitAI``).
+        ``timeout`` and ``hedge`` work as in ``WitAI``; the slower copy of a
+        hedged call is cancelled as soon as the other answers.
+        """
+        super().__init__(token, api_version, base_url, timeout, rate_limiter,
+                         retry_policy, cache, audio_cache, hooks, serializer, intent_index,
+                         hedge)
+        if coalesce:
+            self.single_flight = AsyncSingleFlight()
+        self.pool_size = pool_size
+        self.pool_maxsize = pool_maxsize
+        self._owns_session = session is None
+        self.session = session
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size,
+                                             limit_per_host=self.pool_maxsize)
+            trace_configs = [_trace_config()] if self.hooks else None
+            self.session = aiohttp.ClientSession(connector=connector,
+                                                 timeout=_client_timeout(self.timeout),
+                                                 trace_configs=trace_configs)
+            self._owns_session = True
+        return self.session
+
+    # Lifecycle
+    async def close(self) -> None:
+        """Close pooled connections (only if the session is owned by us)."""
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+
+    @staticmethod
+    async def _iter_pages(fetch: Callable[[int, int], Awaitable[List[Dict]]],
+                          page_size: int) -> AsyncIterator[Dict]:
+        """Walk a limit/offset endpoint until a short page, fetching the next
+        page concurrently while the caller consumes the current one."""
+        offset = 0
+        task = asyncio.ensure_future(fetch(page_size, offset))
+        try:
+            while task is not None:
+                page = await task
+                offset += page_size
+                task = (asyncio.ensure_future(fetch(page_size, offset))
+                        if len(page) == page_size else None)
+                for item in page:
+                    yield item
+        finally:
+            if task is not None:
+                task.cancel()
+
+    @staticmethod
+    async def _bulk(fn: Callable[[Any], Awaitable[Any]], groups: List[List[str]],
+                    concurrency: int) -> BulkResult:
+        """Run ``fn`` once per group of item names concurrently, collecting outcomes per item."""
+        result = BulkResult()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(group):
+            async with semaphore:
+                try:
+                    await fn(group)
+                    return None
+                except Exception as e:
+                    return e
+
+        errors = await asyncio.gather(*(run(group) for group in groups))
+        for group, error in zip(groups, errors):
+            if error is None:
+                result.succeeded.extend(group)
+            else:
+                result.failed.extend((name, error) for name in group)
+        return result
+
+    async def __aenter__(self) -> "AsyncWitAI":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    _transient_errors = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+    _connect_errors = (aiohttp.ClientConnectorError,)
+
+    async def _send(self, request: WitRequest) -> Any:
+        """Send a request, or answer it from the cache, and parse its response."""
+        event = self._start_event(request)
+        try:
+            key = self._request_key(request)
+            body = self._cached(request, key, event)
+            if body is None:
+                flight = self._flight_key(request)
+                if flight is not None:
+                    if event is not None:
+                        event.coalesced = True  # Until _transmit runs for this caller
+                    body = await self.single_flight.do(flight,
+                                                       lambda: self._fetch(request, event))
+                else:
+                    body = await self._fetch(request, event)
+                self._after_success(request, key, body)
+        except Exception as e:
+            if event is not None:
+                self._emit(event, e)
+            raise
+        if event is not None:
+            self._emit(event)
+        return self._parse(request, body)
+
+    async def _fetch(self, request: WitRequest, event: Optional[RequestEvent]) -> bytes:
+        """Transmit a request, hedging it if it is a /message or /language call."""
+        if self.hedge is None or not request.cacheable:
+            return await self._transmit(request, event)
+        start = time.perf_counter()
+        delay = self.hedge.start()
+        if delay is None:
+            body = await self._transmit(request, event)
+        else:
+            body = await self._race(request, event, delay)
+        self.hedge.record(time.perf_counter() - start)
+        return body
+
+    async def _race(self, request: WitRequest, event: Optional[RequestEvent],
+                    delay: float) -> bytes:
+        """Send a second copy if the first has not answered within ``delay``,
+        return whichever answers first and cancel the other."""
+        tasks = [asyncio.ensure_future(self._transmit(request, event))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or not self.hedge.allow():
+                return await tasks[0]
+            if event is not None:
+                event.hedged = True
+            second = self._hedge_event(event)
+            tasks.append(asyncio.ensure_future(self._transmit(request, second)))
+            pending, error = set(tasks), None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is tasks[1]:
+                            self._adopt(event, second)
+                            self.hedge.won()
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _transmit(self, request: WitRequest,
+                        event: Optional[RequestEvent] = None) -> bytes:
+        """Send a request through the pooled session, retrying transient failures."""
+        if event is not None:
+            event.coalesced = False
+        if self.retry_policy is not None:
+            self.retry_policy.start()
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(request.family)
+            timeout = _client_timeout(request.deadline, request.time_left())
+            if event is not None:
+                event.retries = attempt - 1
+                event.dns = event.connect = None
+                sent = time.perf_counter()
+            try:
+                async with self._get_session().request(request.method,
+                                                       f"{self.base_url}{request.path}",
+                                                       params=request.params,
+                                                       headers=request.headers,
+                                                       data=request.data, timeout=timeout,
+                                                       trace_request_ctx=event) as response:
+                    if event is not None:
+                        event.ttfb = time.perf_counter() - sent
+                    body = await response.read()
+                    status, headers = response.status, response.headers
+                    self._observe_status(request, status, headers)
+                    if event is not None:
+                        event.status = status
+                        event.request_bytes = _content_length(response.request_info.headers)
+                        event.response_bytes = len(body)
+                    if status >= 400:
+                        delay = self._retry_after_status(request, attempt, status, headers)
+                        if delay is None:
+                            response.raise_for_status()
+            except Exception as e:
+                if isinstance(e, aiohttp.ClientResponseError):
+                    raise
+                request.time_left()  # Raises DeadlineExceeded if that cut it short
+                delay = self._retry_after_error(request, attempt, e)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            if status < 400:
+                return body
+            await asyncio.sleep(delay)
+
+    # Message Endpoints
+    async def get_message_meaning(self, query: str, tag: Optional[str] = None,
+                                  context: Optional[Dict] = None, n: Optional[int] = None,
+                                  entities: Optional[Dict] = None, typed: bool = False,
+                                  timeout: Timeout = None) -> Union[Dict, MessageResult]:
+        """Return the meaning of a sentence (a ``MessageResult`` if ``typed``).
+
+        ``timeout`` overrides the client's for this call.
+        """
+        local = self._local_meaning(query, tag, context, n, entities, typed)
+        if local is not None:
+            return local
+        return await self._send(self._message_request(query, tag, context, n, entities,
+                                                      typed, timeout))
+
+    async def _batch_item(self, index: int, query: str, kwargs: Dict) -> BatchResult:
+        try:
+            return BatchResult(index, query, await self.get_message_meaning(query, **kwargs))
+        except Exception as e:
+            return BatchResult(index, query, error=e)
+
+    async def iter_message_meanings(self, queries: Iterable[str], concurrency: int = 100,
+                                    **kwargs) -> AsyncIterator[BatchResult]:
+        """Yield ``BatchResult``s in completion order with at most ``concurrency`` in flight.
+
+        ``queries`` is consumed lazily and failures are reported on the item
+        instead of raised. Keyword arguments are passed to
+        ``get_message_meaning`` for every query.
+        """
+        pending = set()
+        try:
+            for index, query in enumerate(queries):
+                if len(pending) >= concurrency:
+                    done, pending = await asyncio.wait(pending,
+                                                       return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield task.result()
+                pending.add(asyncio.ensure_future(self._batch_item(index, query, kwargs)))
+            while pending:
+                done, pending = await asyncio.wait(pending,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def get_message_meanings(self, queries: Iterable[str], concurrency: int = 100,
+                                   **kwargs) -> List[BatchResult]:
+        """Return the meaning of many sentences as ``BatchResult``s in input order."""
+        results = [item async for item in self.iter_message_meanings(queries, concurrency,
+                                                                     **kwargs)]
+        results.sort(key=lambda item: item.index)
+        return results
+
+    # Speech Endpoints
+    @contextmanager
+    def _audio_body(self, audio: AudioSource, content_type: str,
+                    preprocess: Optional[AudioPreprocessor]) -> Iterator[Tuple[Any, str]]:
+        with _open_audio(audio) as body:
+            if preprocess is not None:
+                yield preprocess.process_async(body, content_type), preprocess.content_type
+            elif isinstance(body, (bytes, bytearray, memoryview)) or hasattr(body, "read") \
+                    or hasattr(body, "__aiter__"):
+                yield body, content_type
+            else:
+                # aiohttp only streams async iterables with chunked encoding
+                yield _aiter_chunks(body), content_type
+
+    async def transcribe_audio(self, audio_file: AudioSource, content_type: str,
+                               preprocess: Optional[AudioPreprocessor] = None) -> Dict:
+        """Transcribe an audio wave.
+
+        ``audio_file`` may be a path, bytes-like object, binary file object or
+        a sync or async iterator of byte chunks; iterators are uploaded with
+        chunked transfer encoding as they are produced. Pass an
+        ``AudioPreprocessor`` as ``preprocess`` to shrink the audio on the way.
+        """
+        with self._audio_body(audio_file, content_type, preprocess) as (body, content_type):
+            return await self._send(self._speech_request(body, content_type))
+
+    async def get_speech_meaning(self, audio_file: AudioSource, content_type: str,
+                                 context: Optional[Dict] = None,
+                                 preprocess: Optional[AudioPreprocessor] = None) -> Dict:
+        """Retrieve the meaning of an audio wave (see ``transcribe_audio`` for sources)."""
+        with self._audio_body(audio_file, content_type, preprocess) as (body, content_type):
+            return await self._send(self._speech_request(body, content_type, context))
+
+    async def stream_speech(self, audio_file: AudioSource, content_type: str,
+                            context: Optional[Dict] = None,
+                            preprocess: Optional[AudioPreprocessor] = None
+                            ) -> AsyncIterator[Dict]:
+        """Yield /speech events (partial and final transcriptions, then the
+        understanding) as the response arrives.
+
+        Use ``streaming.is_final`` to tell final events apart. Streams are not
+        retried, cached or coalesced, but do go through the rate limiter.
+        """
+        with self._audio_body(audio_file, content_type, preprocess) as (body, content_type):
+            request = self._speech_request(body, content_type, context)
+            with self._observe(request) as event:
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire_async(request.family)
+                sent = time.perf_counter()
+                async with self._get_session().request(request.method,
+                                                       f"{self.base_url}{request.path}",
+                                                       params=request.params,
+                                                       headers=request.headers,
+                                                       data=request.data,
+                                                       trace_request_ctx=event) as response:
+                    self._observe_status(request, response.status, response.headers)
+                    if event is not None:
+                        event.status = response.status
+                        event.ttfb = time.perf_counter() - sent
+                        event.response_bytes = 0
+                    response.raise_for_status()
+                    parser = JSONStreamParser()
+                    async for chunk in response.content.iter_any():
+                        if event is not None:
+                            event.response_bytes += len(chunk)
+                        for update in parser.feed(chunk):
+                            yield update
+                    parser.close()
+
+    # Synthesize Endpoint
+    async def synthesize_speech(self, text: str, voice: str,
+                                style: Optional[str] = None, speed: Optional[int] = None,
+                                pitch: Optional[int] = None,
+                                accept_format: str = "audio/raw") -> AudioBuffer:
+        """Synthesize natural sounding speech.
+
+        With an ``audio_cache``, hits are returned as a read-only memory map.
+        """
+        key = self._audio_key(text, voice, style, speed, pitch, accept_format)
+        if key is not None:
+            audio = self.audio_cache.get(key)
+            if audio is not None:
+                return audio
+        audio = await self._send(self._synthesize_request(text, voice, style, speed,
+                                                          pitch, accept_format))
+        if key is not None:
+            self.audio_cache.set(key, audio)
+        return audio
+
+    async def stream_synthesized_speech(self, text: str, voice: str,
+                                        style: Optional[str] = None,
+                                        speed: Optional[int] = None,
+                                        pitch: Optional[int] = None,
+                                        accept_format: str = "audio/raw",
+                                        chunk_size: int = 4096,
+                                        stats: Optional[SynthesisStats] = None
+                                        ) -> AsyncIterator[bytes]:
+        """Yield synthesized audio chunks as they arrive instead of buffering the clip.
+
+        Pass a ``SynthesisStats`` to have it filled with the byte count,
+        time-to-first-byte and total time. With an ``audio_cache``, hits are
+        read from the memory-mapped clip and misses are written through.
+        """
+        stats = stats if stats is not None else SynthesisStats()
+        start = time.perf_counter()
+        key = self._audio_key(text, voice, style, speed, pitch, accept_format)
+        cached = self.audio_cache.get(key) if key is not None else None
+        if cached is not None:
+            for offset in range(0, len(cached), chunk_size):
+                if stats.ttfb is None:
+                    stats.ttfb = time.perf_counter() - start
+                chunk = cached[offset:offset + chunk_size]
+                stats.bytes += len(chunk)
+                yield chunk
+            stats.total = time.perf_counter() - start
+            return
+
+        request = self._synthesize_request(text, voice, style, speed, pitch, accept_format)
+        with self._observe(request) as event:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(request.family)
+            start = time.perf_counter()
+            async with self._get_session().request(request.method,
+                                                   f"{self.base_url}{request.path}",
+                                                   params=request.params,
+                                                   headers=request.headers,
+                                                   data=request.data,
+                                                   trace_request_ctx=event) as response:
+                self._observe_status(request, response.status, response.headers)
+                if event is not None:
+                    event.status = response.status
+                    event.ttfb = time.perf_counter() - start
+                    event.request_bytes = _content_length(response.request_info.headers)
+                response.raise_for_status()
+                with self._audio_writer(key) as cache_file:
+                    async for chunk in response.content.iter_chunked(chunk_size):
+                        if stats.ttfb is None:
+                            stats.ttfb = time.perf_counter() - start
+                        stats.bytes += len(chunk)
+                        if cache_file is not None:
+                            cache_file.write(chunk)
+                        yield chunk
+            stats.total = time.perf_counter() - start
+            if event is not None:
+                event.response_bytes = stats.bytes
+
+    async def synthesize_speech_to(self, sink: Any, text: str, voice: str,
+                                   style: Optional[str] = None, speed: Optional[int] = None,
+                                   pitch: Optional[int] = None,
+                                   accept_format: str = "audio/raw",
+                                   chunk_size: int = 4096) -> SynthesisStats:
+        """Stream synthesized audio into a file path, socket, file object or callable.
+
+        Coroutine sinks are awaited, and ``asyncio.StreamWriter`` sinks are
+        drained after every chunk.
+        """
+        stats = SynthesisStats()
+        drain = getattr(sink, "drain", None)
+        with open_sink(sink) as write:
+            async for chunk in self.stream_synthesized_speech(text, voice, style, speed,
+                                                              pitch, accept_format,
+                                                              chunk_size, stats):
+                result = write(chunk)
+                if inspect.isawaitable(result):
+                    await result
+                if drain is not None:
+                    await drain()
+        return stats
+
+    async def warm_audio_cache(self, prompts: Iterable[Union[str, Dict]], voice: str,
+                               concurrency: int = 4, **options) -> Dict[str, int]:
+        """Pre-synthesize prompts into the ``audio_cache`` with bounded concurrency.
+
+        Each prompt is a text or a dict of ``synthesize_speech`` arguments
+        overriding ``voice`` and ``options``. Returns counts of prompts that
+        were already cached, newly synthesized and failed.
+        """
+        if self.audio_cache is None:
+            raise ValueError("warm_audio_cache needs a client with an audio_cache")
+        summary = {"cached": 0, "synthesized": 0, "failed": 0}
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def warm(item: Dict) -> None:
+            if self._audio_key(**item) in self.audio_cache:
+                summary["cached"] += 1
+                return
+            async with semaphore:
+                try:
+                    await self.synthesize_speech(**item)
+                    summary["synthesized"] += 1
+                except Exception:
+                    summary["failed"] += 1
+
+        await asyncio.gather(*(warm(item)
+                               for item in self._warm_up_items(prompts, voice, options)))
+        return summary
+
+    # Language Detection
+    async def detect_language(self, text: str, n: Optional[int] = None,
+                              typed: bool = False,
+                              timeout: Timeout = None) -> Union[Dict, LanguageResult]:
+        """Retrieve the language of a text message (a ``LanguageResult`` if ``typed``)."""
+        return await self._send(self._language_request(text, n, typed, timeout))
+
+    # Intent Management
+    async def get_intents(self, typed: bool = False) -> List[Union[Dict, IntentInfo]]:
+        """Retrieve all intents (as ``IntentInfo``s if ``typed``)."""
+        return await self._send(self._build("GET", "/intents",
+                                            model=IntentList if typed else None))
+
+    async def create_intent(self, name: str) -> Dict:
+        """Create a new intent."""
+        return await self._send(self._build("POST", "/intents", json={"name": name}))
+
+    async def get_intent_info(self, intent: str,
+                              typed: bool = False) -> Union[Dict, IntentInfo]:
+        """Retrieve information about an intent (an ``IntentInfo`` if ``typed``)."""
+        return await self._send(self._build("GET", f"/intents/{intent}",
+                                            model=IntentInfo if typed else None))
+
+    async def delete_intent(self, intent: str) -> Dict:
+        """Delete an intent."""
+        result = await self._send(self._build("DELETE", f"/intents/{intent}"))
+        if self.intent_index is not None:
+            self.intent_index.remove_intent(intent)
+        return result
+
+    async def delete_intents(self, intents: List[str], concurrency: int = 4) -> BulkResult:
+        """Delete several intents concurrently (paced by the rate limiter)."""
+        return await self._bulk(lambda group: self.delete_intent(group[0]),
+                                [[intent] for intent in intents], concurrency)
+
+    async def delete_all_intents(self, concurrency: int = 4) -> BulkResult:
+        """Delete all intents in the app."""
+        intents = await self.get_intents()
+        return await self.delete_intents([intent['name'] for intent in intents], concurrency)
+
+    # Entity Management
+    async def get_entities(self) -> List[Dict]:
+        """Retrieve all entities."""
+        return await self._send(self._build("GET", "/entities"))
+
+    async def create_entity(self, name: str, roles: List[str] = [],
+                            lookups: Optional[List[str]] = None,
+                            keywords: Optional[List[Dict]] = None) -> Dict:
+        """Create a new entity."""
+        data = self._entity_body(name, roles, lookups, keywords)
+        return await self._send(self._build("POST", "/entities", json=data))
+
+    async def get_entity_info(self, entity: str) -> Dict:
+        """Retrieve information about an entity."""
+        return await self._send(self._build("GET", f"/entities/{entity}"))
+
+    async def update_entity(self, entity: str, name: str, roles: List[str],
+                            lookups: Optional[List[str]] = None,
+                            keywords: Optional[List[Dict]] = None) -> Dict:
+        """Update an entity."""
+        data = self._entity_body(name, roles, lookups, keywords)
+        return await self._send(self._build("PUT", f"/entities/{entity}", json=data))
+
+    async def delete_entity(self, entity: str) -> Dict:
+        """Delete an entity."""
+        return await self._send(self._build("DELETE", f"/entities/{entity}"))
+
+    async def delete_entities(self, entities: List[str], concurrency: int = 4) -> BulkResult:
+        """Delete several entities concurrently (paced by the rate limiter)."""
+        return await self._bulk(lambda group: self.delete_entity(group[0]),
+                                [[entity] for entity in entities], concurrency)
+
+    # Keyword Management
+    async def add_keyword(self, entity: str, keyword: str,
+                          synonyms: List[str]) -> Dict:
+        """Add new values to a keywords entity."""
+        return await self._send(self._build("POST", f"/entities/{entity}/keywords",
+                                            json={"keyword": keyword, "synonyms": synonyms}))
+
+    async def delete_keyword(self, entity: str, keyword: str) -> Dict:
+        """Remove a keyword from an entity."""
+        return await self._send(self._build("DELETE",
+                                            f"/entities/{entity}/keywords/{keyword}"))
+
+    # App Management
+    async def get_apps(self, limit: int, offset: int = 0) -> List[Dict]:
+        """Get all apps."""
+        return await self._send(self._build("GET", "/apps",
+                                            {"limit": limit, "offset": offset}))
+
+    def iter_apps(self, page_size: int = 100) -> AsyncIterator[Dict]:
+        """Iterate over all apps, prefetching the next page concurrently."""
+        return self._iter_pages(self.get_apps, page_size)
+
+    async def create_app(self, name: str, lang: str, private: bool,
+                         timezone: Optional[str] = None) -> Dict:
+        """Create a new app."""
+        data = self._app_body(name, lang, private, timezone)
+        return await self._send(self._build("POST", "/apps", json=data))
+
+    async def get_app_info(self, app_id: str) -> Dict:
+        """Get information for a specific app."""
+        return await self._send(self._build("GET", f"/apps/{app_id}"))
+
+    async def update_app(self, app_id: str, name: Optional[str] = None,
+                         lang: Optional[str] = None, private: Optional[bool] = None,
+                         timezone: Optional[str] = None) -> Dict:
+        """Update an existing app."""
+        data = self._app_body(name, lang, private, timezone)
+        return await self._send(self._build("PUT", f"/apps/{app_id}", json=data))
+
+    async def delete_app(self, app_id: str) -> Dict:
+        """Delete an app."""
+        return await self._send(self._build("DELETE", f"/apps/{app_id}"))
+
+    # Training Endpoint
+    async def upload_utterances(self, utterances: List[Dict]) -> Dict:
+        """Upload multiple utterances for training."""
+        # Re-uploading the same utterances overwrites them, so retries are safe
+        result = await self._send(self._build("POST", "/utterances", json=utterances,
+                                              idempotent=True))
+        if self.intent_index is not None:
+            self.intent_index.add(utterances)
+        return result
+
+    async def get_utterances(self, limit: int = 100, offset: int = 0) -> List[Dict]:
+        """Retrieve utterances from the app."""
+        return await self._send(self._build("GET", "/utterances",
+                                            {"limit": limit, "offset": offset}))
+
+    def iter_utterances(self, page_size: int = 1000) -> AsyncIterator[Dict]:
+        """Iterate over every utterance in the app, prefetching the next page
+        concurrently. ``page_size`` may be up to 10000."""
+        return self._iter_pages(self.get_utterances, page_size)
+
+    async def delete_utterances(self, texts: List[str]) -> Dict:
+        """Delete the utterances with the given texts."""
+        result = await self._send(self._build("DELETE", "/utterances",
+                                              json=[{"text": text} for text in texts]))
+        if self.intent_index is not None:
+            self.intent_index.remove(texts)
+        return result
+
+    async def delete_utterances_bulk(self, texts: List[str],
+                                     batch_size: int = MAX_UTTERANCES_PER_REQUEST,
+                                     concurrency: int = 4) -> BulkResult:
+        """Delete utterances in API-sized batches sent concurrently."""
+        return await self._bulk(self.delete_utterances, _chunks(texts, batch_size),
+                                concurrency)
+
+    async def delete_all_utterances(self, concurrency: int = 4) -> BulkResult:
+        """Delete all utterances in the app."""
+        texts = [utterance["text"] async for utterance in self.iter_utterances()]
+        return await self.delete_utterances_bulk(texts, concurrency=concurrency)
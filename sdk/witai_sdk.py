@@ -2,345 +2,1203 @@
 import os
 
 import requests
-import json
-from typing import Dict, List, Optional, Union, Any
+import socket
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from typing import (Any, AsyncIterable, BinaryIO, Callable, Dict, Iterable, Iterator,
+                    List, Optional, Tuple, Union)
+from urllib.parse import urlencode
 
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 
+from .audio import AudioPreprocessor
+from .audio_cache import AudioBuffer, AudioCache, audio_cache_key
+from .cache import CacheBackend, response_cache_key
+from .deadline import DEFAULT_TIMEOUT, Deadline, DeadlineExceeded, Timeout, as_deadline
+from .hedging import HedgePolicy
+from .intent_index import IntentIndex
+from .metrics import Hook, RequestEvent, endpoint_name
+from .models import IntentInfo, IntentList, LanguageResult, MessageResult
+from .ratelimit import RateLimiter, parse_retry_after
+from .retry import IDEMPOTENT_METHODS, UNPROCESSED_STATUSES, RetryPolicy
+from .serializers import Serializer, default_serializer
+from .singleflight import SingleFlight
+from .streaming import JSONStreamParser, SynthesisStats, open_sink, parse_json_stream
 
-class WitAI:
-    def __init__(self, token: str, api_version: str = "20240304"):
-        """Initialize WitAI SDK with access token."""
-        self.base_url = "https://api.wit.ai"
+# Wit.ai accepts at most this many utterances per /utterances request.
+MAX_UTTERANCES_PER_REQUEST = 200
+
+# Audio can be a file path, an in-memory buffer, a binary file object, or an
+# (async) iterator of byte chunks streamed with chunked transfer encoding.
+AudioSource = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO,
+                    Iterable[bytes], AsyncIterable[bytes]]
+
+
+@contextmanager
+def _open_audio(audio: AudioSource) -> Iterator[Any]:
+    """Turn an ``AudioSource`` into a request body, opening paths for the call."""
+    if isinstance(audio, (str, os.PathLike)):
+        with open(audio, 'rb') as f:
+            yield f
+    elif isinstance(audio, memoryview):
+        yield audio.cast("B") if audio.ndim == 1 and audio.format != "B" else audio
+    else:
+        yield audio
+
+
+@dataclass
+class WitRequest:
+    """Transport-independent description of one Wit.ai API call."""
+    method: str
+    path: str
+    params: Dict[str, Any]
+    headers: Dict[str, str]
+    data: Any = None  # JSON bodies are encoded here by _build
+    raw: bool = False  # Return the body as bytes instead of decoded JSON
+    model: Any = None  # Typed result class (see models) to decode into
+    json_stream: bool = False  # Body is a sequence of JSON objects (/speech)
+    family: str = "management"  # Rate-limit bucket: message, speech or management
+    idempotent: Optional[bool] = None  # Safe to repeat; defaults from the method
+    cacheable: bool = False  # Response may be served from the response cache
+    invalidates: bool = False  # Changes the trained model, so clears the cache
+    deadline: Deadline = DEFAULT_TIMEOUT
+
+    def __post_init__(self):
+        if self.idempotent is None:
+            self.idempotent = self.method in IDEMPOTENT_METHODS
+        self.expires = self.deadline.expires()
+        seekable = getattr(self.data, "seekable", None)
+        self._data_offset = self.data.tell() if seekable and seekable() else None
+
+    def rewind(self) -> bool:
+        """Prepare the body for another attempt; False if it cannot be replayed."""
+        if self.data is None or isinstance(self.data, (bytes, bytearray, memoryview, str)):
+            return True
+        if self._data_offset is not None:
+            self.data.seek(self._data_offset)
+            return True
+        return False
+
+    def time_left(self) -> Optional[float]:
+        """Seconds left of the total deadline (None if unbounded); raises
+        ``DeadlineExceeded`` once it has passed."""
+        if self.expires is None:
+            return None
+        left = self.expires - time.monotonic()
+        if left <= 0:
+            raise DeadlineExceeded(f"{self.method} {self.path} did not finish within "
+                                   f"{self.deadline.total}s")
+        return left
+
+
+def _endpoint_family(path: str) -> str:
+    if path.startswith(("/message", "/language")):
+        return "message"
+    if path.startswith(("/speech", "/synthesize")):
+        return "speech"
+    return "management"
+
+
+def _changes_model(method: str, path: str) -> bool:
+    return method != "GET" and path.startswith(("/utterances", "/intents", "/entities"))
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one query in a batch call, tagged with its input position."""
+    index: int
+    query: str
+    result: Optional[Dict] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BulkResult:
+    """Summary of a bulk operation: the items that succeeded and those that failed."""
+    succeeded: List[str] = field(default_factory=list)
+    failed: List[Tuple[str, BaseException]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+def _chunks(items: List, size: int) -> List[List]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _content_length(headers) -> Optional[int]:
+    value = headers.get("Content-Length")
+    return int(value) if value is not None else None
+
+
+class _WitAIBase:
+    """Request building and response parsing shared by the sync and async clients.
+
+    Each ``_*_request`` method describes an endpoint call as a ``WitRequest``;
+    subclasses only implement ``_send`` for their transport.
+    """
+
+    def __init__(self, token: str, api_version: str = "20240304",
+                 base_url: str = "https://api.wit.ai", timeout: Timeout = DEFAULT_TIMEOUT,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 cache: Optional[CacheBackend] = None,
+                 audio_cache: Optional[AudioCache] = None,
+                 hooks: Iterable[Hook] = (), serializer: Optional[Serializer] = None,
+                 intent_index: Optional[IntentIndex] = None,
+                 hedge: Optional[HedgePolicy] = None):
+        self.base_url = base_url.rstrip("/")
         self.token = token
         self.api_version = api_version
+        self.timeout = as_deadline(timeout)
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.cache = cache
+        self.audio_cache = audio_cache
+        self.single_flight = None  # Set by subclasses when coalescing is enabled
+        self.hooks: List[Hook] = list(hooks)
+        self.serializer = serializer if serializer is not None else default_serializer()
+        self.intent_index = intent_index
+        self.hedge = hedge
+        self.schema = None  # Set by a SchemaCache created for this client
         self.headers = {
             "Authorization": f"Bearer {self.token}",
             "Content-Type": "application/json"
         }
 
+    def _build(self, method: str, path: str, params: Optional[Dict] = None,
+               headers: Optional[Dict] = None, json: Any = None, timeout: Timeout = None,
+               **kwargs) -> WitRequest:
+        request_params = {"v": self.api_version}
+        if params: request_params.update(params)
+        request_headers = self.headers.copy()
+        if headers: request_headers.update(headers)
+        if json is not None: kwargs["data"] = self.serializer.dumps(json)
+        return WitRequest(method, path, request_params, request_headers,
+                          family=_endpoint_family(path),
+                          invalidates=_changes_model(method, path),
+                          deadline=self.timeout if timeout is None else as_deadline(timeout),
+                          **kwargs)
+
+    def add_hook(self, hook: Hook) -> None:
+        """Register a callable that receives a ``RequestEvent`` after every call."""
+        self.hooks.append(hook)
+
+    def _start_event(self, request: WitRequest) -> Optional[RequestEvent]:
+        """Start timing a call, or return None (and do nothing) without hooks."""
+        if not self.hooks:
+            return None
+        return RequestEvent(request.method, endpoint_name(request.path), request.family)
+
+    def _emit(self, event: RequestEvent, error: Optional[BaseException] = None) -> None:
+        event.total = time.perf_counter() - event.started
+        event.error = error
+        for hook in self.hooks:
+            hook(event)
+
+    @staticmethod
+    def _hedge_event(event: Optional[RequestEvent]) -> Optional[RequestEvent]:
+        """A separate event for a hedge's second copy, so the copy that loses
+        never writes to the event handed to the hooks."""
+        return replace(event) if event is not None else None
+
+    @staticmethod
+    def _adopt(event: Optional[RequestEvent], second: Optional[RequestEvent]) -> None:
+        """Report the response of a winning second copy on the call's event."""
+        if event is not None and second is not None:
+            for name in ("status", "dns", "connect", "ttfb", "request_bytes",
+                         "response_bytes"):
+                setattr(event, name, getattr(second, name))
+
+    @contextmanager
+    def _observe(self, request: WitRequest) -> Iterator[Optional[RequestEvent]]:
+        """Report a call made outside ``_send`` (streaming) to the hooks."""
+        event = self._start_event(request)
+        if event is None:
+            yield None
+            return
+        error = None
+        try:
+            yield event
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._emit(event, error)
+
+    def _request_key(self, request: WitRequest) -> Optional[str]:
+        """Cache key of a read-only request."""
+        if request.method != "GET" or self.cache is None:
+            return None
+        return response_cache_key(self.base_url, self.token, request.path, request.params)
+
+    def _flight_key(self, request: WitRequest) -> Optional[str]:
+        """Coalescing key of a read-only request. Unlike the cache key the
+        query is not normalised, so only identical requests share a response."""
+        if request.method != "GET" or self.single_flight is None:
+            return None
+        return f"{request.path}?{urlencode(sorted(request.params.items()))}"
+
+    def _cached(self, request: WitRequest, key: Optional[str],
+                event: Optional[RequestEvent] = None) -> Optional[bytes]:
+        if self.cache is None or key is None or not request.cacheable:
+            return None
+        body = self.cache.get(key)
+        if body is not None and request.path == "/message":
+            body = self._fit_cached_meaning(body, request.params["q"])
+        if event is not None:
+            event.cache = "miss" if body is None else "hit"
+        return body
+
+    def _fit_cached_meaning(self, body: bytes, query: str) -> Optional[bytes]:
+        """Adapt a cached /message answer to a query sharing its normalised key.
+
+        The answer gets the query's own ``text``. One with entities is only
+        reused for the exact same text, since entity spans point at its
+        characters; otherwise None is returned and the query is sent.
+        """
+        data = self.serializer.loads(body)
+        if data.get("text", query) == query:
+            return body
+        if data.get("entities"):
+            return None
+        data["text"] = query
+        return self.serializer.dumps(data)
+
+    def _after_success(self, request: WitRequest, key: Optional[str], body: bytes) -> None:
+        """Store cacheable responses, drop cached ones once the model changes
+        and keep the schema cache up to date with intent and entity writes."""
+        if (self.schema is not None and request.invalidates
+                and not request.path.startswith("/utterances")):
+            self.schema.changed(request.method, request.path, self.serializer.loads(body))
+        if self.cache is None:
+            return
+        if key is not None and request.cacheable:
+            self.cache.set(key, body)
+        elif request.invalidates:
+            self.cache.clear()
+
+    def _observe_status(self, request: WitRequest, status: int, headers) -> None:
+        """Feed the response status back into the rate limiter."""
+        if self.rate_limiter is None:
+            return
+        if status == 429:
+            self.rate_limiter.on_throttle(request.family,
+                                          parse_retry_after(headers.get("Retry-After")))
+        elif status < 400:
+            self.rate_limiter.on_success(request.family)
+
+    # Transport errors worth retrying, and the subset raised before anything
+    # was sent (safe even for non-idempotent requests). Set by subclasses.
+    _transient_errors: Tuple[type, ...] = ()
+    _connect_errors: Tuple[type, ...] = ()
+
+    def _retry_after_status(self, request: WitRequest, attempt: int,
+                            status: int, headers) -> Optional[float]:
+        """Return the delay before retrying a failed status, or None to give up."""
+        policy = self.retry_policy
+        if policy is None or status not in policy.retry_statuses:
+            return None
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        if status == 429 and self.rate_limiter is not None:
+            retry_after = 0.0  # The limiter already holds callers back
+        retryable = ((request.idempotent or status in UNPROCESSED_STATUSES)
+                     and request.rewind())
+        return self._in_time(request, policy.delay(attempt, retryable, retry_after))
+
+    def _retry_after_error(self, request: WitRequest, attempt: int,
+                           error: BaseException) -> Optional[float]:
+        """Return the delay before retrying a transport error, or None to give up."""
+        policy = self.retry_policy
+        if policy is None:
+            return None
+        if not isinstance(error, policy.retry_exceptions or self._transient_errors):
+            return None
+        retryable = ((request.idempotent or isinstance(error, self._connect_errors))
+                     and request.rewind())
+        return self._in_time(request, policy.delay(attempt, retryable))
+
+    @staticmethod
+    def _in_time(request: WitRequest, delay: Optional[float]) -> Optional[float]:
+        """Drop a retry whose backoff alone would run past the total deadline."""
+        if delay is None or request.expires is None:
+            return delay
+        return delay if time.monotonic() + delay < request.expires else None
+
+    def _parse(self, request: WitRequest, body: bytes) -> Any:
+        """Decode a successful response body."""
+        if request.raw:
+            return body
+        if request.json_stream:
+            # Partial results come first; the last object is the final answer.
+            values = parse_json_stream(body)
+            return values[-1] if values else {}
+        if request.model is not None:
+            return self.serializer.decode(body, request.model)
+        return self.serializer.loads(body)
+
+    def _json_param(self, value: Any) -> str:
+        return self.serializer.dumps(value).decode("utf-8")
+
     # Message Endpoints
-    def get_message_meaning(self, query: str, tag: Optional[str] = None,
-                            context: Optional[Dict] = None, n: Optional[int] = None,
-                            entities: Optional[Dict] = None) -> Dict:
-        """Return the meaning of a sentence."""
-        params = {"v": self.api_version, "q": query}
+    def _message_request(self, query: str, tag: Optional[str] = None,
+                         context: Optional[Dict] = None, n: Optional[int] = None,
+                         entities: Optional[Dict] = None, typed: bool = False,
+                         timeout: Timeout = None) -> WitRequest:
+        params = {"q": query}
         if tag: params["tag"] = tag
         if n: params["n"] = n
-        if context: params["context"] = json.dumps(context)
-        if entities: params["entities"] = json.dumps(entities)
+        if context: params["context"] = self._json_param(context)
+        if entities: params["entities"] = self._json_param(entities)
+        return self._build("GET", "/message", params, cacheable=True,
+                           model=MessageResult if typed else None, timeout=timeout)
+
+    def _local_meaning(self, query: str, tag: Optional[str], context: Optional[Dict],
+                       n: Optional[int], entities: Optional[Dict],
+                       typed: bool) -> Union[None, Dict, MessageResult]:
+        """Answer from the intent index when it is confident enough, else None.
 
-        response = requests.get(f"{self.base_url}/message",
-                                headers=self.headers,
-                                params=params)
-        response.raise_for_status()
-        return response.json()
+        Calls with a ``tag`` (another app version), ``context``, dynamic
+        ``entities`` or ``n`` above 1 (the index returns one intent) always go
+        to the API.
+        """
+        if (self.intent_index is None or tag or context or entities
+                or (n is not None and n > 1)):
+            return None
+        result = self.intent_index.lookup(query)
+        if result is None:
+            return None
+        return MessageResult.from_json(result) if typed else result
 
     # Speech Endpoints
-    def transcribe_audio(self, audio_file: str, content_type: str) -> Dict:
-        """Transcribe an audio wave."""
-        headers = self.headers.copy()
-        headers["Content-Type"] = content_type
-
-        with open(audio_file, 'rb') as f:
-            response = requests.post(
-                f"{self.base_url}/speech?v={self.api_version}",
-                headers=headers,
-                data=f
-            )
-        response.raise_for_status()
-        return response.json()
-
-    def get_speech_meaning(self, audio_file: str, content_type: str,
-                           context: Optional[Dict] = None) -> Dict:
-        """Retrieve the meaning of an audio wave."""
-        headers = self.headers.copy()
-        headers["Content-Type"] = content_type
-
-        params = {"v": self.api_version}
-        if context: params["context"] = json.dumps(context)
-
-        with open(audio_file, 'rb') as f:
-            response = requests.post(
-                f"{self.base_url}/speech",
-                headers=headers,
-                params=params,
-                data=f
-            )
-        response.raise_for_status()
-        return response.json()
+    def _speech_request(self, audio: Any, content_type: str,
+                        context: Optional[Dict] = None) -> WitRequest:
+        params = {}
+        if context: params["context"] = self._json_param(context)
+        return self._build("POST", "/speech", params,
+                           headers={"Content-Type": content_type}, data=audio,
+                           json_stream=True)
 
     # Synthesize Endpoint
-    def synthesize_speech(self, text: str, voice: str,
-                          style: Optional[str] = None, speed: Optional[int] = None,
-                          pitch: Optional[int] = None,
-                          accept_format: str = "audio/raw") -> bytes:
-        """Synthesize natural sounding speech."""
-        headers = self.headers.copy()
-        headers["Accept"] = accept_format
-
+    def _synthesize_request(self, text: str, voice: str,
+                            style: Optional[str] = None, speed: Optional[int] = None,
+                            pitch: Optional[int] = None,
+                            accept_format: str = "audio/raw") -> WitRequest:
         data = {"q": text, "voice": voice}
         if style: data["style"] = style
         if speed: data["speed"] = speed
         if pitch: data["pitch"] = pitch
+        return self._build("POST", "/synthesize", headers={"Accept": accept_format},
+                           json=data, raw=True, idempotent=True)
+
+    @contextmanager
+    def _audio_writer(self, key: Optional[str]) -> Iterator[Optional[BinaryIO]]:
+        """Cache file to tee a streamed clip into, or None without a cache."""
+        if key is None:
+            yield None
+        else:
+            with self.audio_cache.writer(key) as f:
+                yield f
 
-        response = requests.post(
-            f"{self.base_url}/synthesize?v={self.api_version}",
-            headers=headers,
-            json=data
-        )
-        response.raise_for_status()
-        return response.content
+    def _audio_key(self, text: str, voice: str, style: Optional[str] = None,
+                   speed: Optional[int] = None, pitch: Optional[int] = None,
+                   accept_format: str = "audio/raw") -> Optional[str]:
+        if self.audio_cache is None:
+            return None
+        return audio_cache_key(text, voice, style, speed, pitch, accept_format,
+                               self.api_version)
+
+    @staticmethod
+    def _warm_up_items(prompts: Iterable[Union[str, Dict]], voice: str,
+                       options: Dict) -> Iterator[Dict]:
+        """Normalise warm-up prompts into unique ``synthesize_speech`` arguments."""
+        seen = set()
+        for prompt in prompts:
+            item = {"voice": voice, **options}
+            item.update(prompt if isinstance(prompt, dict) else {"text": prompt})
+            identity = tuple(sorted(item.items()))
+            if identity not in seen:
+                seen.add(identity)
+                yield item
 
     # Language Detection
-    def detect_language(self, text: str, n: Optional[int] = None) -> Dict:
-        """Retrieve the language of a text message."""
-        params = {"v": self.api_version, "q": text}
+    def _language_request(self, text: str, n: Optional[int] = None, typed: bool = False,
+                          timeout: Timeout = None) -> WitRequest:
+        params = {"q": text}
         if n: params["n"] = n
+        return self._build("GET", "/language", params, cacheable=True,
+                           model=LanguageResult if typed else None, timeout=timeout)
+
+    # Entity Management
+    @staticmethod
+    def _entity_body(name: str, roles: List[str],
+                     lookups: Optional[List[str]] = None,
+                     keywords: Optional[List[Dict]] = None) -> Dict:
+        data = {"name": name, "roles": roles}
+        if lookups: data["lookups"] = lookups
+        if keywords: data["keywords"] = keywords
+        return data
+
+    # App Management
+    @staticmethod
+    def _app_body(name: Optional[str] = None, lang: Optional[str] = None,
+                  private: Optional[bool] = None,
+                  timezone: Optional[str] = None) -> Dict:
+        data = {}
+        if name: data["name"] = name
+        if lang: data["lang"] = lang
+        if private is not None: data["private"] = private
+        if timezone: data["timezone"] = timezone
+        return data
+
+
+# Set by the pooled connections when the current thread opens a new one, so
+# the sync client can report connect (including DNS and TLS) time. ``abort``
+# is the current hedged copy's ``_Abort``, if any.
+_connections = threading.local()
+
+
+class _Aborted(Exception):
+    """A hedged copy was cut short because the other copy answered first."""
+
+
+class _Abort:
+    """Lets another thread cut short a request while it waits for its
+    response headers, by shutting down the connection's socket."""
+
+    def __init__(self):
+        self.aborted = False
+        self._connection: Optional[HTTPConnection] = None
+        self._lock = threading.Lock()
+
+    def waiting(self, connection: Optional[HTTPConnection]) -> None:
+        with self._lock:
+            self._connection = connection
+            if connection is not None and self.aborted:
+                self._shutdown()
+
+    def abort(self) -> None:
+        with self._lock:
+            self.aborted = True
+            if self._connection is not None:
+                self._shutdown()
+
+    def _shutdown(self) -> None:
+        try:
+            self._connection.sock.shutdown(socket.SHUT_RDWR)
+        except (AttributeError, OSError):
+            pass
+
+
+class _HedgedCall:
+    """State shared by a call's first copy (on the caller's thread) and its
+    second copy (on the hedge pool); see ``WitAI._race``."""
+
+    def __init__(self, event: Optional[RequestEvent]):
+        self.primary = _Abort()
+        self.second = _Abort()
+        self.event = _WitAIBase._hedge_event(event)
+        self.lock = threading.Lock()
+        self.primary_done = threading.Event()
+        self.second_done = threading.Event()
+        self.sent = False
+        self.body: Optional[bytes] = None
+
+
+class _TimedConnection:
+    def connect(self) -> None:
+        start = time.perf_counter()
+        super().connect()
+        _connections.connect_time = time.perf_counter() - start
+
+    def getresponse(self, *args, **kwargs):
+        # Only abortable until the headers arrive: after that the connection
+        # goes back to the pool and may be used by another request.
+        abort = getattr(_connections, "abort", None)
+        if abort is None:
+            return super().getresponse(*args, **kwargs)
+        abort.waiting(self)
+        try:
+            return super().getresponse(*args, **kwargs)
+        finally:
+            abort.waiting(None)
+
+
+class _TimedHTTPConnection(_TimedConnection, HTTPConnection):
+    pass
+
 
-        response = requests.get(
-            f"{self.base_url}/language",
-            headers=self.headers,
-            params=params
-        )
-        response.raise_for_status()
-        return response.json()
+class _TimedHTTPSConnection(_TimedConnection, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedAdapter(HTTPAdapter):
+    """``HTTPAdapter`` whose connections record how long they took to open."""
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _TimedHTTPConnectionPool,
+                                                   "https": _TimedHTTPSConnectionPool}
+
+
+class WitAI(_WitAIBase):
+    def __init__(self, token: str, api_version: str = "20240304",
+                 base_url: str = "https://api.wit.ai",
+                 pool_connections: int = 10, pool_maxsize: int = 10,
+                 pool_block: bool = False, timeout: Timeout = DEFAULT_TIMEOUT,
+                 session: Optional[requests.Session] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 cache: Optional[CacheBackend] = None, coalesce: bool = False,
+                 audio_cache: Optional[AudioCache] = None,
+                 hooks: Iterable[Hook] = (), serializer: Optional[Serializer] = None,
+                 intent_index: Optional[IntentIndex] = None,
+                 hedge: Optional[HedgePolicy] = None):
+        """Initialize WitAI SDK with access token.
+
+        All calls go through one pooled, keep-alive ``requests.Session`` so
+        repeated calls reuse TCP/TLS connections. ``pool_connections`` is the
+        number of per-host pools kept, ``pool_maxsize`` the connections kept
+        per host, and ``pool_block=True`` turns ``pool_maxsize`` into a hard
+        per-host limit. Pass ``session`` to supply your own session instead.
+
+        Pass ``rate_limiter=RateLimiter.for_token(token)`` to pace calls per
+        endpoint family; the limiter backs off on 429 and ``Retry-After``.
+        Pass a ``RetryPolicy`` to retry transient failures with backoff, and
+        a ``cache`` backend to answer repeated /message and /language queries
+        locally; it is cleared whenever utterances, intents or entities change.
+        ``coalesce=True`` makes concurrent identical GETs share one upstream
+        call; ``single_flight.stats`` counts how many were coalesced.
+        ``audio_cache`` serves repeated ``synthesize_speech`` calls from disk.
+        ``hooks`` (see ``metrics``) receive a ``RequestEvent`` after every call.
+        ``serializer`` (see ``serializers``) defaults to orjson or msgspec when
+        installed, falling back to the standard ``json`` module. With an
+        ``intent_index``, ``get_message_meaning`` answers training phrases
+        locally; the index follows uploads and deletes made through the client.
+
+        ``timeout`` is a ``Deadline`` (connect, read and total limits), a
+        float or a (connect, read) tuple, and applies to every call; /message
+        and /language calls can override it with their own ``timeout``. With
+        a ``hedge`` policy, slow /message and /language calls are sent twice
+        and the first answer wins. Each call is sent on the calling thread;
+        second copies are sent from a pool of ``2 * pool_maxsize`` threads.
+        The slower copy is cut short while it waits for its response, except
+        on a ``session`` you supplied.
+        """
+        super().__init__(token, api_version, base_url, timeout, rate_limiter,
+                         retry_policy, cache, audio_cache, hooks, serializer, intent_index,
+                         hedge)
+        if coalesce:
+            self.single_flight = SingleFlight()
+        self._hedge_pool = (ThreadPoolExecutor(max_workers=2 * pool_maxsize,
+                                               thread_name_prefix="witai-hedge")
+                            if hedge is not None else None)
+
+        self._owns_session = session is None
+        self.session = session if session is not None else requests.Session()
+        if self._owns_session:
+            adapter = _TimedAdapter(pool_connections=pool_connections,
+                                  pool_maxsize=pool_maxsize,
+                                  pool_block=pool_block)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+
+    # Lifecycle
+    def close(self) -> None:
+        """Close pooled connections (only if the session is owned by us)."""
+        if self._hedge_pool is not None:
+            self._hedge_pool.shutdown(wait=False)
+        if self._owns_session:
+            self.session.close()
+
+    @staticmethod
+    def _iter_pages(fetch: Callable[[int, int], List[Dict]],
+                    page_size: int) -> Iterator[Dict]:
+        """Walk a limit/offset endpoint until a short page, fetching the next
+        page in the background while the caller consumes the current one."""
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            offset = 0
+            future = pool.submit(fetch, page_size, offset)
+            while future is not None:
+                page = future.result()
+                offset += page_size
+                future = pool.submit(fetch, page_size, offset) if len(page) == page_size else None
+                yield from page
+
+    @staticmethod
+    def _bulk(fn: Callable[[Any], Any], groups: List[List[str]],
+              concurrency: int) -> BulkResult:
+        """Run ``fn`` once per group of item names concurrently, collecting outcomes per item."""
+        result = BulkResult()
+
+        def run(group):
+            try:
+                fn(group)
+                return None
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for group, error in zip(groups, pool.map(run, groups)):
+                if error is None:
+                    result.succeeded.extend(group)
+                else:
+                    result.failed.extend((name, error) for name in group)
+        return result
+
+    def __enter__(self) -> "WitAI":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    _transient_errors = (requests.ConnectionError, requests.Timeout)
+    _connect_errors = (requests.ConnectTimeout,)
+
+    def _send(self, request: WitRequest) -> Any:
+        """Send a request, or answer it from the cache, and parse its response."""
+        event = self._start_event(request)
+        try:
+            key = self._request_key(request)
+            body = self._cached(request, key, event)
+            if body is None:
+                flight = self._flight_key(request)
+                if flight is not None:
+                    if event is not None:
+                        event.coalesced = True  # Until _transmit runs for this caller
+                    body = self.single_flight.do(flight, lambda: self._fetch(request, event))
+                else:
+                    body = self._fetch(request, event)
+                self._after_success(request, key, body)
+        except Exception as e:
+            if event is not None:
+                self._emit(event, e)
+            raise
+        if event is not None:
+            self._emit(event)
+        return self._parse(request, body)
+
+    def _fetch(self, request: WitRequest, event: Optional[RequestEvent]) -> bytes:
+        """Transmit a request, hedging it if it is a /message or /language call."""
+        # Only those calls are cacheable: read-only and cheap to send twice.
+        if self.hedge is None or not request.cacheable:
+            return self._transmit(request, event)
+        start = time.perf_counter()
+        delay = self.hedge.start()
+        if delay is None:
+            body = self._transmit(request, event)
+        else:
+            body = self._race(request, event, delay)
+        self.hedge.record(time.perf_counter() - start)
+        return body
+
+    def _race(self, request: WitRequest, event: Optional[RequestEvent],
+              delay: float) -> bytes:
+        """Send the call on this thread and, if it has not answered within
+        ``delay``, a second copy from the hedge pool. The first answer wins
+        and the other copy is cut short."""
+        call = _HedgedCall(event)
+        self._hedge_pool.submit(self._send_second, request, event, call, delay)
+        try:
+            body = self._transmit(request, event, call.primary)
+        except Exception:
+            with call.lock:
+                call.primary_done.set()
+                sent = call.sent
+            if not sent:
+                raise
+            call.second_done.wait()
+            if call.body is None:
+                raise
+            self._adopt(event, call.event)
+            self.hedge.won()
+            return call.body
+        with call.lock:
+            call.primary_done.set()
+        call.second.abort()
+        return body
+
+    def _send_second(self, request: WitRequest, event: Optional[RequestEvent],
+                     call: _HedgedCall, delay: float) -> None:
+        """Hedge pool task: send the second copy of a call still unanswered after ``delay``."""
+        try:
+            if call.primary_done.wait(delay) or not self.hedge.allow():
+                return
+            with call.lock:
+                if call.primary_done.is_set():
+                    return
+                call.sent = True
+                if event is not None:
+                    event.hedged = True
+            call.body = self._transmit(request, call.event, call.second)
+            call.primary.abort()
+        except Exception:
+            pass  # The first copy's outcome is used
+        finally:
+            call.second_done.set()
+
+    def _transmit(self, request: WitRequest, event: Optional[RequestEvent] = None,
+                  abort: Optional[_Abort] = None) -> bytes:
+        """Send a request through the pooled session, retrying transient failures.
+
+        ``abort`` lets another thread cut the request short (see ``_race``).
+        """
+        if event is not None:
+            event.coalesced = False
+        if self.retry_policy is not None:
+            self.retry_policy.start()
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(request.family)
+            timeout = request.deadline.attempt(request.time_left())
+            if event is not None:
+                event.retries = attempt - 1
+                _connections.connect_time = None
+            if abort is not None:
+                if abort.aborted:
+                    raise _Aborted()
+                _connections.abort = abort
+            try:
+                response = self.session.request(request.method,
+                                                f"{self.base_url}{request.path}",
+                                                params=request.params,
+                                                headers=request.headers,
+                                                data=request.data,
+                                                timeout=timeout)
+            except Exception as e:
+                if abort is not None and abort.aborted:
+                    raise _Aborted() from e
+                request.time_left()  # Raises DeadlineExceeded if that cut it short
+                delay = self._retry_after_error(request, attempt, e)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            finally:
+                _connections.abort = None
+            self._observe_status(request, response.status_code, response.headers)
+            if event is not None:
+                event.status = response.status_code
+                event.ttfb = response.elapsed.total_seconds()
+                event.connect = _connections.connect_time
+                event.request_bytes = _content_length(response.request.headers)
+                event.response_bytes = len(response.content)
+            if response.status_code >= 400:
+                delay = self._retry_after_status(request, attempt, response.status_code,
+                                                 response.headers)
+                if delay is not None:
+                    response.close()
+                    time.sleep(delay)
+                    continue
+            response.raise_for_status()
+            return response.content
+
+    # Message Endpoints
+    def get_message_meaning(self, query: str, tag: Optional[str] = None,
+                            context: Optional[Dict] = None, n: Optional[int] = None,
+                            entities: Optional[Dict] = None, typed: bool = False,
+                            timeout: Timeout = None) -> Union[Dict, MessageResult]:
+        """Return the meaning of a sentence (a ``MessageResult`` if ``typed``).
+
+        ``timeout`` overrides the client's for this call.
+        """
+        local = self._local_meaning(query, tag, context, n, entities, typed)
+        if local is not None:
+            return local
+        return self._send(self._message_request(query, tag, context, n, entities,
+                                                typed, timeout))
+
+    def _batch_item(self, index: int, query: str, kwargs: Dict) -> BatchResult:
+        try:
+            return BatchResult(index, query, self.get_message_meaning(query, **kwargs))
+        except Exception as e:
+            return BatchResult(index, query, error=e)
+
+    def iter_message_meanings(self, queries: Iterable[str], concurrency: int = 8,
+                              **kwargs) -> Iterator[BatchResult]:
+        """Yield ``BatchResult``s in completion order with at most ``concurrency`` in flight.
+
+        ``queries`` is consumed lazily, so it can be a generator over a large
+        backlog. Failures are reported on the item instead of raised. Keyword
+        arguments are passed to ``get_message_meaning`` for every query; keep
+        ``concurrency`` at or below ``pool_maxsize`` to reuse connections.
+        """
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            pending = set()
+            try:
+                for index, query in enumerate(queries):
+                    if len(pending) >= concurrency:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield future.result()
+                    pending.add(pool.submit(self._batch_item, index, query, kwargs))
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def get_message_meanings(self, queries: Iterable[str], concurrency: int = 8,
+                             **kwargs) -> List[BatchResult]:
+        """Return the meaning of many sentences as ``BatchResult``s in input order."""
+        results = list(self.iter_message_meanings(queries, concurrency, **kwargs))
+        results.sort(key=lambda item: item.index)
+        return results
+
+    # Speech Endpoints
+    @contextmanager
+    def _audio_body(self, audio: AudioSource, content_type: str,
+                    preprocess: Optional[AudioPreprocessor]) -> Iterator[Tuple[Any, str]]:
+        if hasattr(audio, "__aiter__"):
+            raise TypeError("async audio iterators need AsyncWitAI")
+        with _open_audio(audio) as body:
+            if preprocess is not None:
+                yield preprocess.process(body, content_type), preprocess.content_type
+            else:
+                yield body, content_type
+
+    def transcribe_audio(self, audio_file: AudioSource, content_type: str,
+                         preprocess: Optional[AudioPreprocessor] = None) -> Dict:
+        """Transcribe an audio wave.
+
+        ``audio_file`` may be a path, bytes-like object, binary file object or
+        an iterator of byte chunks; iterators are uploaded with chunked
+        transfer encoding as they are produced, without buffering the clip.
+        Pass an ``AudioPreprocessor`` as ``preprocess`` to downmix, resample
+        and trim WAV or raw PCM on the way, uploading it as 16-bit raw audio.
+        """
+        with self._audio_body(audio_file, content_type, preprocess) as (body, content_type):
+            return self._send(self._speech_request(body, content_type))
+
+    def get_speech_meaning(self, audio_file: AudioSource, content_type: str,
+                           context: Optional[Dict] = None,
+                           preprocess: Optional[AudioPreprocessor] = None) -> Dict:
+        """Retrieve the meaning of an audio wave (see ``transcribe_audio`` for sources)."""
+        with self._audio_body(audio_file, content_type, preprocess) as (body, content_type):
+            return self._send(self._speech_request(body, content_type, context))
+
+    def stream_speech(self, audio_file: AudioSource, content_type: str,
+                      context: Optional[Dict] = None,
+                      chunk_size: Optional[int] = None,
+                      preprocess: Optional[AudioPreprocessor] = None) -> Iterator[Dict]:
+        """Yield /speech events (partial and final transcriptions, then the
+        understanding) as the response arrives.
+
+        Use ``streaming.is_final`` to tell final events apart. Streams are not
+        retried, cached or coalesced, but do go through the rate limiter.
+        """
+        with self._audio_body(audio_file, content_type, preprocess) as (body, content_type):
+            request = self._speech_request(body, content_type, context)
+            with self._observe(request) as event:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire(request.family)
+                with self.session.request(request.method, f"{self.base_url}{request.path}",
+                                          params=request.params, headers=request.headers,
+                                          data=request.data, timeout=request.deadline.attempt(),
+                                          stream=True) as response:
+                    self._observe_status(request, response.status_code, response.headers)
+                    if event is not None:
+                        event.status = response.status_code
+                        event.ttfb = response.elapsed.total_seconds()
+                        event.response_bytes = 0
+                    response.raise_for_status()
+                    parser = JSONStreamParser()
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        if event is not None:
+                            event.response_bytes += len(chunk)
+                        yield from parser.feed(chunk)
+                    parser.close()
+
+    # Synthesize Endpoint
+    def synthesize_speech(self, text: str, voice: str,
+                          style: Optional[str] = None, speed: Optional[int] = None,
+                          pitch: Optional[int] = None,
+                          accept_format: str = "audio/raw") -> AudioBuffer:
+        """Synthesize natural sounding speech.
+
+        With an ``audio_cache``, hits are returned as a read-only memory map.
+        """
+        key = self._audio_key(text, voice, style, speed, pitch, accept_format)
+        if key is not None:
+            audio = self.audio_cache.get(key)
+            if audio is not None:
+                return audio
+        audio = self._send(self._synthesize_request(text, voice, style, speed,
+                                                    pitch, accept_format))
+        if key is not None:
+            self.audio_cache.set(key, audio)
+        return audio
+
+    def stream_synthesized_speech(self, text: str, voice: str,
+                                  style: Optional[str] = None, speed: Optional[int] = None,
+                                  pitch: Optional[int] = None,
+                                  accept_format: str = "audio/raw",
+                                  chunk_size: int = 4096,
+                                  stats: Optional[SynthesisStats] = None) -> Iterator[bytes]:
+        """Yield synthesized audio chunks as they arrive instead of buffering the clip.
+
+        Pass a ``SynthesisStats`` to have it filled with the byte count,
+        time-to-first-byte and total time. With an ``audio_cache``, hits are
+        read from the memory-mapped clip and misses are written through.
+        """
+        stats = stats if stats is not None else SynthesisStats()
+        start = time.perf_counter()
+        key = self._audio_key(text, voice, style, speed, pitch, accept_format)
+        cached = self.audio_cache.get(key) if key is not None else None
+        if cached is not None:
+            for offset in range(0, len(cached), chunk_size):
+                if stats.ttfb is None:
+                    stats.ttfb = time.perf_counter() - start
+                chunk = cached[offset:offset + chunk_size]
+                stats.bytes += len(chunk)
+                yield chunk
+            stats.total = time.perf_counter() - start
+            return
+
+        request = self._synthesize_request(text, voice, style, speed, pitch, accept_format)
+        with self._observe(request) as event:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(request.family)
+            start = time.perf_counter()
+            with self.session.request(request.method, f"{self.base_url}{request.path}",
+                                      params=request.params, headers=request.headers,
+                                      data=request.data, timeout=request.deadline.attempt(),
+                                      stream=True) as response:
+                self._observe_status(request, response.status_code, response.headers)
+                if event is not None:
+                    event.status = response.status_code
+                    event.ttfb = response.elapsed.total_seconds()
+                    event.request_bytes = _content_length(response.request.headers)
+                response.raise_for_status()
+                with self._audio_writer(key) as cache_file:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        if stats.ttfb is None:
+                            stats.ttfb = time.perf_counter() - start
+                        stats.bytes += len(chunk)
+                        if cache_file is not None:
+                            cache_file.write(chunk)
+                        yield chunk
+            stats.total = time.perf_counter() - start
+            if event is not None:
+                event.response_bytes = stats.bytes
+
+    def synthesize_speech_to(self, sink: Any, text: str, voice: str,
+                             style: Optional[str] = None, speed: Optional[int] = None,
+                             pitch: Optional[int] = None,
+                             accept_format: str = "audio/raw",
+                             chunk_size: int = 4096) -> SynthesisStats:
+        """Stream synthesized audio into a file path, socket, file object or callable."""
+        stats = SynthesisStats()
+        with open_sink(sink) as write:
+            for chunk in self.stream_synthesized_speech(text, voice, style, speed, pitch,
+                                                        accept_format, chunk_size, stats):
+                write(chunk)
+        return stats
+
+    def warm_audio_cache(self, prompts: Iterable[Union[str, Dict]], voice: str,
+                         concurrency: int = 4, **options) -> Dict[str, int]:
+        """Pre-synthesize prompts into the ``audio_cache`` in parallel.
+
+        Each prompt is a text or a dict of ``synthesize_speech`` arguments
+        overriding ``voice`` and ``options``. Returns counts of prompts that
+        were already cached, newly synthesized and failed.
+        """
+        if self.audio_cache is None:
+            raise ValueError("warm_audio_cache needs a client with an audio_cache")
+        summary = {"cached": 0, "synthesized": 0, "failed": 0}
+
+        def warm(item: Dict) -> str:
+            if self._audio_key(**item) in self.audio_cache:
+                return "cached"
+            try:
+                self.synthesize_speech(**item)
+                return "synthesized"
+            except Exception:
+                return "failed"
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for outcome in pool.map(warm, self._warm_up_items(prompts, voice, options)):
+                summary[outcome] += 1
+        return summary
+
+    # Language Detection
+    def detect_language(self, text: str, n: Optional[int] = None, typed: bool = False,
+                        timeout: Timeout = None) -> Union[Dict, LanguageResult]:
+        """Retrieve the language of a text message (a ``LanguageResult`` if ``typed``)."""
+        return self._send(self._language_request(text, n, typed, timeout))
 
     # Intent Management
-    def get_intents(self) -> List[Dict]:
-        """Retrieve all intents."""
-        response = requests.get(
-            f"{self.base_url}/intents?v={self.api_version}",
-            headers=self.headers
-        )
-        response.raise_for_status()
-        return response.json()
+    def get_intents(self, typed: bool = False) -> List[Union[Dict, IntentInfo]]:
+        """Retrieve all intents (as ``IntentInfo``s if ``typed``)."""
+        return self._send(self._build("GET", "/intents",
+                                      model=IntentList if typed else None))
 
     def create_intent(self, name: str) -> Dict:
         """Create a new intent."""
-        response = requests.post(
-            f"{self.base_url}/intents?v={self.api_version}",
-            headers=self.headers,
-            json={"name": name}
-        )
-        response.raise_for_status()
-        return response.json()
-
-    def get_intent_info(self, intent: str) -> Dict:
-        """Retrieve information about an intent."""
-        response = requests.get(
-            f"{self.base_url}/intents/{intent}?v={self.api_version}",
-            headers=self.headers
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._send(self._build("POST", "/intents", json={"name": name}))
+
+    def get_intent_info(self, intent: str,
+                        typed: bool = False) -> Union[Dict, IntentInfo]:
+        """Retrieve information about an intent (an ``IntentInfo`` if ``typed``)."""
+        return self._send(self._build("GET", f"/intents/{intent}",
+                                      model=IntentInfo if typed else None))
 
     def delete_intent(self, intent: str) -> Dict:
         """Delete an intent."""
-        response = requests.delete(
-            f"{self.base_url}/intents/{intent}?v={self.api_version}",
-            headers=self.headers
-        )
-        response.raise_for_status()
-        return response.json()
-
-    def delete_all_intents(self) -> None:
+        result = self._send(self._build("DELETE", f"/intents/{intent}"))
+        if self.intent_index is not None:
+            self.intent_index.remove_intent(intent)
+        return result
+
+    def delete_intents(self, intents: List[str], concurrency: int = 4) -> BulkResult:
+        """Delete several intents concurrently (paced by the rate limiter)."""
+        return self._bulk(lambda group: self.delete_intent(group[0]),
+                          [[intent] for intent in intents], concurrency)
+
+    def delete_all_intents(self, concurrency: int = 4) -> BulkResult:
         """Delete all intents in the app."""
-        intents = self.get_intents()
-        for intent in intents:
-            self.delete_intent(intent['name'])
+        return self.delete_intents([intent['name'] for intent in self.get_intents()],
+                                   concurrency)
 
     # Entity Management
     def get_entities(self) -> List[Dict]:
         """Retrieve all entities."""
-        response = requests.get(
-            f"{self.base_url}/entities?v={self.api_version}",
-            headers=self.headers
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._send(self._build("GET", "/entities"))
 
     def create_entity(self, name: str, roles: List[str] = [],
                       lookups: Optional[List[str]] = None,
                       keywords: Optional[List[Dict]] = None) -> Dict:
         """Create a new entity."""
-        data = {"name": name, "roles": roles}
-        if lookups: data["lookups"] = lookups
-        if keywords: data["keywords"] = keywords
-
-        response = requests.post(
-            f"{self.base_url}/entities?v={self.api_version}",
-            headers=self.headers,
-            json=data
-        )
-        response.raise_for_status()
-        return response.json()
+        data = self._entity_body(name, roles, lookups, keywords)
+        return self._send(self._build("POST", "/entities", json=data))
 
     def get_entity_info(self, entity: str) -> Dict:
         """Retrieve information about an entity."""
-        response = requests.get(
-            f"{self.base_url}/entities/{entity}?v={self.api_version}",
-            headers=self.headers
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._send(self._build("GET", f"/entities/{entity}"))
 
     def update_entity(self, entity: str, name: str, roles: List[str],
                       lookups: Optional[List[str]] = None,
                       keywords: Optional[List[Dict]] = None) -> Dict:
         """Update an entity."""
-        data = {"name": name, "roles": roles}
-        if lookups: data["lookups"] = lookups
-        if keywords: data["keywords"] = keywords
-
-        response = requests.put(
-            f"{self.base_url}/entities/{entity}?v={self.api_version}",
-            headers=self.headers,
-            json=data
-        )
-        response.raise_for_status()
-        return response.json()
+        data = self._entity_body(name, roles, lookups, keywords)
+        return self._send(self._build("PUT", f"/entities/{entity}", json=data))
 
     def delete_entity(self, entity: str) -> Dict:
         """Delete an entity."""
-        response = requests.delete(
-            f"{self.base_url}/entities/{entity}?v={self.api_version}",
-            headers=self.headers
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._send(self._build("DELETE", f"/entities/{entity}"))
+
+    def delete_entities(self, entities: List[str], concurrency: int = 4) -> BulkResult:
+        """Delete several entities concurrently (paced by the rate limiter)."""
+        return self._bulk(lambda group: self.delete_entity(group[0]),
+                          [[entity] for entity in entities], concurrency)
 
     # Keyword Management
     def add_keyword(self, entity: str, keyword: str,
                     synonyms: List[str]) -> Dict:
         """Add new values to a keywords entity."""
-        response = requests.post(
-            f"{self.base_url}/entities/{entity}/keywords?v={self.api_version}",
-            headers=self.headers,
-            json={"keyword": keyword, "synonyms": synonyms}
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._send(self._build("POST", f"/entities/{entity}/keywords",
+                                      json={"keyword": keyword, "synonyms": synonyms}))
 
     def delete_keyword(self, entity: str, keyword: str) -> Dict:
         """Remove a keyword from an entity."""
-        response = requests.delete(
-            f"{self.base_url}/entities/{entity}/keywords/{keyword}?v={self.api_version}",
-            headers=self.headers
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._send(self._build("DELETE", f"/entities/{entity}/keywords/{keyword}"))
 
     # App Management
     def get_apps(self, limit: int, offset: int = 0) -> List[Dict]:
         """Get all apps."""
-        params = {"v": self.api_version, "limit": limit, "offset": offset}
-        response = requests.get(
-            f"{self.base_url}/apps",
-            headers=self.headers,
-            params=params
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._send(self._build("GET", "/apps",
+                                      {"limit": limit, "offset": offset}))
+
+    def iter_apps(self, page_size: int = 100) -> Iterator[Dict]:
+        """Iterate over all apps, prefetching the next page in the background."""
+        return self._iter_pages(self.get_apps, page_size)
 
     def create_app(self, name: str, lang: str, private: bool,
                    timezone: Optional[str] = None) -> Dict:
         """Create a new app."""
-        data = {"name": name, "lang": lang, "private": private}
-        if timezone: data["timezone"] = timezone
-
-        response = requests.post(
-            f"{self.base_url}/apps?v={self.api_version}",
-            headers=self.headers,
-            json=data
-        )
-        response.raise_for_status()
-        return response.json()
+        data = self._app_body(name, lang, private, timezone)
+        return self._send(self._build("POST", "/apps", json=data))
 
     def get_app_info(self, app_id: str) -> Dict:
         """Get information for a specific app."""
-        response = requests.get(
-            f"{self.base_url}/apps/{app_id}?v={self.api_version}",
-            headers=self.headers
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._send(self._build("GET", f"/apps/{app_id}"))
 
     def update_app(self, app_id: str, name: Optional[str] = None,
                    lang: Optional[str] = None, private: Optional[bool] = None,
                    timezone: Optional[str] = None) -> Dict:
         """Update an existing app."""
-        data = {}
-        if name: data["name"] = name
-        if lang: data["lang"] = lang
-        if private is not None: data["private"] = private
-        if timezone: data["timezone"] = timezone
-
-        response = requests.put(
-            f"{self.base_url}/apps/{app_id}?v={self.api_version}",
-            headers=self.headers,
-            json=data
-        )
-        response.raise_for_status()
-        return response.json()
+        data = self._app_body(name, lang, private, timezone)
+        return self._send(self._build("PUT", f"/apps/{app_id}", json=data))
 
     def delete_app(self, app_id: str) -> Dict:
         """Delete an app."""
-        response = requests.delete(
-            f"{self.base_url}/apps/{app_id}?v={self.api_version}",
-            headers=self.headers
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._send(self._build("DELETE", f"/apps/{app_id}"))
 
     # Training Endpoint
     def upload_utterances(self, utterances: List[Dict]) -> Dict:
         """Upload multiple utterances for training."""
-        response = requests.post(
-            f"{self.base_url}/utterances?v={self.api_version}",
-            headers=self.headers,
-            json=utterances
-        )
-        response.raise_for_status()
-        return response.json()
+        # Re-uploading the same utterances overwrites them, so retries are safe
+        result = self._send(self._build("POST", "/utterances", json=utterances,
+                                        idempotent=True))
+        if self.intent_index is not None:
+            self.intent_index.add(utterances)
+        return result
 
     def get_utterances(self, limit: int = 100, offset: int = 0) -> List[Dict]:
         """Retrieve utterances from the app."""
-        params = {"v": self.api_version, "limit": limit, "offset": offset}
-        response = requests.get(
-            f"{self.base_url}/utterances",
-            headers=self.headers,
-            params=params
-        )
-        response.raise_for_status()
-        return response.json()
-
-    def delete_all_utterances(self) -> Dict:
+        return self._send(self._build("GET", "/utterances",
+                                      {"limit": limit, "offset": offset}))
+
+    def iter_utterances(self, page_size: int = 1000) -> Iterator[Dict]:
+        """Iterate over every utterance in the app, prefetching the next page
+        in the background. ``page_size`` may be up to 10000."""
+        return self._iter_pages(self.get_utterances, page_size)
+
+    def delete_utterances(self, texts: List[str]) -> Dict:
+        """Delete the utterances with the given texts."""
+        result = self._send(self._build("DELETE", "/utterances",
+                                        json=[{"text": text} for text in texts]))
+        if self.intent_index is not None:
+            self.intent_index.remove(texts)
+        return result
+
+    def delete_utterances_bulk(self, texts: List[str],
+                               batch_size: int = MAX_UTTERANCES_PER_REQUEST,
+                               concurrency: int = 4) -> BulkResult:
+        """Delete utterances in API-sized batches sent concurrently."""
+        return self._bulk(self.delete_utterances, _chunks(texts, batch_size), concurrency)
+
+    def delete_all_utterances(self, concurrency: int = 4) -> BulkResult:
         """Delete all utterances in the app."""
-        # First get all utterances
-        utterances = self.get_utterances(limit=10000)  # Max limit per API docs
-        print("Utterances retrieved:", utterances)  # Debug output
-
-        # Extract just the text fields for deletion
-        utterances_to_delete = [{"text": u["text"]} for u in utterances]
-        print("Utterances to delete:", utterances_to_delete)  # Debug output
-
-        if not utterances_to_delete:
-            return {"sent": True, "n": 0}
-
-        # Delete in batches if needed (API has rate limits)
-        response = requests.delete(
-            f"{self.base_url}/utterances?v={self.api_version}",  # Fixed typo here
-            headers=self.headers,
-            json=utterances_to_delete
-        )
-        print("Request headers:", self.headers)  # Debug output
-        print("Response status:", response.status_code)  # Debug output
-        print("Response text:", response.text)  # Debug output
-        response.raise_for_status()
-        return response.json()
+        texts = [utterance["text"] for utterance in self.iter_utterances()]
+        return self.delete_utterances_bulk(texts, concurrency=concurrency)
 
 # Example usage:
+# Run from the project root with ``python -m sdk.witai_sdk``; the package-relative
+# imports above fail when this file is run as a script.
 if __name__ == "__main__":
     # Load environment variables from .env file
     load_dotenv()
@@ -348,12 +1206,11 @@ if __name__ == "__main__":
     # Replace with your actual server access token from environment variable
     TOKEN = os.getenv("WITAI_ACCESS_TOKEN")
 
-    # Initialize WitAI client
-    wit = WitAI(TOKEN)
-
-    # Example: Get intents
-    intents = wit.get_intents()
-    print(intents)
-    # Example: Test message meaning
-    meaning = wit.get_message_meaning("hello world")
-    print(meaning)
\ No newline at end of file
+    # Initialize WitAI client; the context manager closes pooled connections
+    with WitAI(TOKEN) as wit:
+        # Example: Get intents
+        intents = wit.get_intents()
+        print(intents)
+        # Example: Test message meaning
+        meaning = wit.get_message_meaning("hello world")
+        print(meaning)
\ No newline at end of file
@@ -0,0 +1,72 @@
+# test_cache.py
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from benchmarks.stub_server import start_stub_server
+from sdk.cache import CacheBackend, LRUCache, SQLiteCache
+from sdk.witai_sdk import WitAI
+
+
+class RecordingCache(LRUCache):
+    def __init__(self):
+        super().__init__()
+        self.keys = []
+
+    def set(self, key, value):
+        self.keys.append(key)
+        super().set(key, value)
+
+
+@pytest.fixture
+def stub():
+    server, base_url = start_stub_server()
+    yield server, base_url
+    server.shutdown()
+    server.server_close()
+
+
+def test_normalised_hit_gets_the_callers_text(stub):
+    server, base_url = stub
+    with WitAI("stub", base_url=base_url, cache=LRUCache()) as wit:
+        assert wit.get_message_meaning("hello")["text"] == "hello"
+        assert wit.get_message_meaning("Hello")["text"] == "Hello"
+        assert wit.get_message_meaning("  hello ")["text"] == "  hello "
+        assert wit.get_message_meaning("hello")["text"] == "hello"
+    assert server.stats["requests"] == 1
+
+
+def test_answer_with_entities_is_only_reused_for_the_same_text(stub):
+    server, base_url = stub
+    cache = RecordingCache()
+    with WitAI("stub", base_url=base_url, cache=cache) as wit:
+        wit.get_message_meaning("Paris  is nice")
+        span = {"name": "city", "start": 0, "end": 5, "body": "Paris", "value": "Paris"}
+        cache.set(cache.keys[0], json.dumps({"text": "Paris  is nice", "intents": [],
+                                             "entities": {"city:city": [span]},
+                                             "traits": {}}).encode())
+        assert wit.get_message_meaning("Paris  is nice")["entities"]["city:city"] == [span]
+        assert server.stats["requests"] == 1
+        assert wit.get_message_meaning("paris is nice")["text"] == "paris is nice"
+    assert server.stats["requests"] == 2
+
+
+def test_cache_backend_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+
+def test_sqlite_stats_are_exact_under_threads(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"))
+
+    def work(worker):
+        for i in range(100):
+            cache.set(f"{worker}-{i}", b"body")
+            assert cache.get(f"{worker}-{i}") == b"body"
+            assert cache.get("missing") is None
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(work, range(8)))
+    assert cache.stats["hits"] == cache.stats["misses"] == 800
+    assert len(cache) == 800
@@ -0,0 +1,25 @@
+# test_dataset.py
+import io
+import json
+
+import pytest
+
+from sdk.dataset import iter_json_array
+
+
+def parse(text, chunk_size=64 * 1024):
+    return list(iter_json_array(io.StringIO(text), chunk_size=chunk_size))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64 * 1024])
+def test_reads_elements_across_chunk_boundaries(chunk_size):
+    data = [{"text": "a, b]", "n": 12.5e-3}, 123456789, True, None, [], "x"]
+    assert parse(json.dumps(data, indent=2), chunk_size) == data
+    assert parse(" [ ] ", chunk_size) == []
+
+
+@pytest.mark.parametrize("text", ["[1,]", "[1,,2]", "[,1]", "[,]", "[1 2]", "[1,", "{}"])
+@pytest.mark.parametrize("chunk_size", [1, 64 * 1024])
+def test_rejects_malformed_arrays(text, chunk_size):
+    with pytest.raises(ValueError):
+        parse(text, chunk_size)
@@ -0,0 +1,34 @@
+# test_intent_index.py
+from sdk.intent_index import IntentIndex
+
+
+def utterance(text, intent):
+    return {"text": text, "intent": intent, "entities": [], "traits": []}
+
+
+def test_exact_and_fuzzy_matches():
+    index = IntentIndex(threshold=0.8)
+    index.add([utterance("turn on the lights", "lights_on"),
+               utterance("play some music", "play_music")])
+    assert index.lookup("Turn on  the lights")["intents"][0]["name"] == "lights_on"
+    fuzzy = index.lookup("turn on the light")
+    assert fuzzy["intents"][0]["name"] == "lights_on"
+    assert 0.8 <= fuzzy["intents"][0]["confidence"] < 1.0
+    assert index.lookup("what is the weather") is None
+    assert index.stats == {"lookups": 3, "exact": 1, "fuzzy": 1, "misses": 1}
+
+
+def test_close_rival_intent_sends_the_query_to_the_api():
+    index = IntentIndex(threshold=0.7, margin=0.05)
+    index.add([utterance("turn on the lights", "lights_on"),
+               utterance("turn on the light", "other")])
+    assert index.lookup("turn on the ligh") is None
+
+
+def test_large_index_matches_like_a_full_scan():
+    index = IntentIndex(threshold=0.85)
+    index.add(utterance(f"the thing number {i} is there", f"intent_{i % 7}")
+              for i in range(5000))
+    match = index.lookup("the thing number 1234 is ther")
+    assert match["intents"][0]["name"] == "intent_2"
+    assert index.lookup("the the the the") is None
@@ -0,0 +1,43 @@
+# test_ratelimit.py
+import pytest
+
+from sdk.ratelimit import RateLimiter, TokenBucket
+
+
+def test_concurrent_throttles_back_off_once():
+    bucket = TokenBucket(4.0, 4)
+    for _ in range(8):  # Eight calls in flight...
+        bucket.reserve()
+    for _ in range(8):  # ...all answered with 429 and Retry-After: 1
+        bucket.on_throttle(1.0)
+    assert bucket.throttled == 8
+    assert bucket.rate == 2.0
+    assert bucket.reserve() == pytest.approx(1.0, abs=0.05)
+    assert bucket.reserve() == pytest.approx(1.5, abs=0.05)
+
+
+def test_longer_retry_after_extends_the_pause():
+    bucket = TokenBucket(4.0, 4)
+    bucket.on_throttle(1.0)
+    bucket.on_throttle(3.0)
+    bucket.on_throttle(2.0)
+    assert bucket.pause_left() == pytest.approx(3.0, abs=0.05)
+    assert bucket.rate == 2.0
+
+
+def test_rate_recovers_on_success():
+    bucket = TokenBucket(4.0, 4)
+    bucket.on_throttle(0.0)
+    assert bucket.rate == 2.0
+    for _ in range(100):
+        bucket.on_success()
+    assert bucket.rate == 4.0
+
+
+def test_for_token_rejects_conflicting_limits():
+    limits = {"message": (2.0, 2)}
+    limiter = RateLimiter.for_token("test-conflict", limits)
+    assert RateLimiter.for_token("test-conflict") is limiter
+    assert RateLimiter.for_token("test-conflict", dict(limits)) is limiter
+    with pytest.raises(ValueError):
+        RateLimiter.for_token("test-conflict", {"message": (8.0, 8)})
@@ -0,0 +1,86 @@
+# test_retry.py
+import asyncio
+
+import pytest
+import requests
+
+from benchmarks.stub_server import WitStubHandler, start_stub_server
+from sdk.retry import RetryBudget, RetryPolicy
+from sdk.witai_async import AsyncWitAI
+from sdk.witai_sdk import WitAI
+
+
+def test_backoff_doubles_up_to_the_cap():
+    policy = RetryPolicy(max_attempts=10, backoff_base=0.5, backoff_max=3.0, jitter=False)
+    assert [policy.backoff(attempt) for attempt in range(1, 6)] == [0.5, 1.0, 2.0, 3.0, 3.0]
+    assert policy.backoff(1, retry_after=2.5) == 2.5
+    assert policy.backoff(1, retry_after=60.0) == 3.0
+
+
+def test_jitter_stays_within_the_backoff():
+    policy = RetryPolicy(backoff_base=1.0)
+    assert all(0.0 <= policy.backoff(3) <= 4.0 for _ in range(100))
+
+
+def test_delay_gives_up_after_max_attempts_or_when_not_retryable():
+    policy = RetryPolicy(max_attempts=3, jitter=False)
+    assert policy.delay(1, retryable=False) is None
+    assert policy.delay(1, retryable=True) == 0.5
+    assert policy.delay(2, retryable=True) == 1.0
+    assert policy.delay(3, retryable=True) is None
+    assert policy.stats == {"requests": 0, "retries": 2, "budget_exhausted": 0, "gave_up": 1}
+
+
+def test_budget_caps_retries_to_a_share_of_traffic():
+    budget = RetryBudget(ratio=0.25, min_per_second=0.0, max_tokens=2.0)
+    policy = RetryPolicy(max_attempts=10, jitter=False, budget=budget)
+    assert policy.delay(1, retryable=True) is not None
+    assert policy.delay(1, retryable=True) is not None
+    assert policy.delay(1, retryable=True) is None  # The initial tokens are spent
+    assert policy.stats["budget_exhausted"] == 1
+    for _ in range(4):
+        policy.start()  # Four first attempts earn one retry
+    assert policy.delay(1, retryable=True) is not None
+    assert policy.delay(1, retryable=True) is None
+
+
+@pytest.fixture
+def flaky_stub(monkeypatch):
+    """A stub answering every other POST with 502."""
+    dispatch, posts = WitStubHandler._dispatch, []
+
+    def flaky(handler, method):
+        if method == "POST":
+            posts.append(handler.path)
+            if len(posts) % 2:
+                handler.close_connection = True
+                return handler._send_json(502, {"error": "bad gateway"})
+        return dispatch(handler, method)
+
+    monkeypatch.setattr(WitStubHandler, "_dispatch", flaky)
+    server, base_url = start_stub_server()
+    yield base_url
+    server.shutdown()
+    server.server_close()
+
+
+UTTERANCES = [{"text": "hi", "intent": "greet", "entities": [], "traits": []}]
+
+
+def test_sync_client_retries_only_idempotent_posts(flaky_stub):
+    with WitAI("stub", base_url=flaky_stub,
+               retry_policy=RetryPolicy(backoff_base=0.001)) as wit:
+        assert wit.upload_utterances(UTTERANCES)["sent"]
+        assert wit.retry_policy.stats["retries"] == 1
+        with pytest.raises(requests.HTTPError):
+            wit.create_intent("greet")  # A 502 may have been processed
+
+
+def test_async_client_retries_utterance_uploads(flaky_stub):
+    async def main():
+        async with AsyncWitAI("stub", base_url=flaky_stub,
+                              retry_policy=RetryPolicy(backoff_base=0.001)) as wit:
+            assert (await wit.upload_utterances(UTTERANCES))["sent"]
+            assert wit.retry_policy.stats["retries"] == 1
+
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+# test_singleflight.py
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from benchmarks.stub_server import StubConfig, start_stub_server
+from sdk.singleflight import AsyncSingleFlight, SingleFlight
+from sdk.witai_sdk import WitAI
+
+
+def test_concurrent_calls_share_one_result():
+    flight = SingleFlight()
+    calls, release = [], threading.Event()
+
+    def fn():
+        calls.append(1)
+        release.wait()
+        return "result"
+
+    with ThreadPoolExecutor(8) as pool:
+        futures = [pool.submit(flight.do, "key", fn) for _ in range(8)]
+        while flight.stats["calls"] < 8:
+            time.sleep(0.001)
+        release.set()
+        assert [f.result() for f in futures] == ["result"] * 8
+    assert len(calls) == 1
+    assert flight.stats == {"calls": 8, "coalesced": 7}
+
+
+def test_errors_are_raised_and_not_remembered():
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flight.do("key", fail)
+    assert flight.do("key", lambda: "again") == "again"
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+    assert flight.stats["coalesced"] == 0
+
+
+def test_async_waiter_cancellation_does_not_cancel_the_call():
+    async def main():
+        flight, calls = AsyncSingleFlight(), []
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "result"
+
+        first = asyncio.ensure_future(flight.do("key", fn))
+        second = asyncio.ensure_future(flight.do("key", fn))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == "result"
+        assert len(calls) == 1
+
+    asyncio.run(main())
+
+
+@pytest.fixture
+def slow_stub():
+    server, base_url = start_stub_server(config=StubConfig(latency=0.2))
+    yield server, base_url
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_coalesces_only_identical_queries(slow_stub):
+    server, base_url = slow_stub
+    queries = ["Paris  is nice", "paris is nice", "paris is nice"]
+    with WitAI("stub", base_url=base_url, coalesce=True) as wit:
+        with ThreadPoolExecutor(len(queries)) as pool:
+            results = list(pool.map(wit.get_message_meaning, queries))
+        assert [r["text"] for r in results] == queries
+        assert wit.single_flight.stats == {"calls": 3, "coalesced": 1}
+    assert server.stats["requests"] == 2
@@ -0,0 +1,66 @@
+# test_streaming.py
+import json
+
+import pytest
+
+from sdk.streaming import JSONStreamParser, iter_json_stream, parse_json_stream
+
+EVENTS = [
+    {"text": "turn on", "is_final": False},
+    {"text": 'say "hi" {not} [a brace]', "is_final": True},
+    {"text": "back\\slash \\\" and \\", "intents": [{"name": "x", "confidence": 0.9}]},
+    {"text": "café — \U0001F600", "entities": {"a:b": [{"body": "}"}]}},
+    [1, {"nested": ["]", "{"]}],
+]
+BODY = "\r\n".join(json.dumps(event, ensure_ascii=False) for event in EVENTS).encode("utf-8")
+
+
+def feed_in_chunks(body, size):
+    parser = JSONStreamParser()
+    values = []
+    for offset in range(0, len(body), size):
+        values.extend(parser.feed(body[offset:offset + size]))
+    parser.close()
+    return values
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, len(BODY)])
+def test_values_split_across_chunks(size):
+    assert feed_in_chunks(BODY, size) == EVENTS
+
+
+def test_values_are_returned_as_soon_as_they_close():
+    parser = JSONStreamParser()
+    first = json.dumps(EVENTS[0]).encode()
+    assert parser.feed(first[:-1]) == []
+    assert parser.feed(first[-1:] + b'\n{"te') == [EVENTS[0]]
+    assert parser.feed(b'xt": "}"}') == [{"text": "}"}]
+    parser.close()
+
+
+def test_escape_split_across_chunks():
+    # The backslash ends one chunk; the escaped quote starts the next.
+    assert feed_in_chunks(b'{"a": "x\\"}"}', 7) == [{"a": 'x"}'}]
+    assert list(iter_json_stream([b'{"a": "x\\', b'\\"}'])) == [{"a": "x\\"}]
+
+
+def test_consumed_bytes_are_dropped():
+    parser = JSONStreamParser()
+    for _ in range(1000):
+        parser.feed(b'{"text": "partial transcription"}\n')
+    parser.feed(b'{"text": "unfin')
+    assert len(parser._buffer) == len(b'{"text": "unfin')
+
+
+@pytest.mark.parametrize("body", [b'{"text": "cut off', b'{"a": {"b": 1}', b'[1, 2',
+                                  b'{"a": 1} trailing', b'{"a": 1}]', b'"top"'])
+def test_truncated_or_malformed_stream_raises(body):
+    with pytest.raises(ValueError):
+        parse_json_stream(body)
+    with pytest.raises(ValueError):
+        feed_in_chunks(body, 3)
+
+
+def test_empty_stream():
+    assert parse_json_stream(b"") == []
+    assert parse_json_stream(b" \r\n") == []
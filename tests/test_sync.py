@@ -0,0 +1,51 @@
+# test_sync.py
+import pytest
+
+from benchmarks.stub_server import start_stub_server
+from sdk.sync import AppState, sync_app
+from sdk.witai_sdk import WitAI
+
+
+@pytest.fixture
+def wit():
+    server, base_url = start_stub_server()
+    with WitAI("stub", base_url=base_url) as client:
+        yield client
+    server.shutdown()
+    server.server_close()
+
+
+UTTERANCES = [{"text": "turn on the lights", "intent": "lights_on",
+               "entities": [], "traits": []}]
+
+
+def test_sync_keeps_entities_missing_from_the_training_set(wit):
+    wit.create_entity("city", ["city"])
+    wit.create_entity("wit$location", ["location"])
+    plan, report = sync_app(wit, AppState.from_utterances(UTTERANCES), out=None)
+    assert plan.delete_entities == []
+    assert report.ok
+    assert {e["name"] for e in wit.get_entities()} == {"city", "wit$location"}
+
+
+def test_prune_entities_deletes_unlisted_entities_but_not_builtins(wit):
+    wit.create_entity("city", ["city"])
+    wit.create_entity("wit$location", ["location"])
+    plan, report = sync_app(wit, AppState.from_utterances(UTTERANCES), prune_entities=True,
+                            out=None)
+    assert plan.delete_entities == ["city"]
+    assert report.ok
+    assert {e["name"] for e in wit.get_entities()} == {"wit$location"}
+
+
+def test_entity_update_keeps_fields_it_does_not_set(wit):
+    wit.create_entity("food", ["food", "drink"], ["keywords"])
+    keywords = [{"keyword": "pizza", "synonyms": ["pie"]}]
+    desired = AppState.from_utterances(UTTERANCES, [{"name": "food", "keywords": keywords}])
+    plan, report = sync_app(wit, desired, out=None)
+    assert [e["name"] for e in plan.update_entities] == ["food"]
+    assert report.ok
+    food = wit.get_entity_info("food")
+    assert sorted(r["name"] for r in food["roles"]) == ["drink", "food"]
+    assert food["lookups"] == ["keywords"]
+    assert food["keywords"] == keywords